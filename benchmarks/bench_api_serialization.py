@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import Depends, FastAPI
+from loguru import logger
+
+from pts.api.models import PredictionRequest, PredictionResponse
+from pts.api.routes import get_test_selector, run_prediction
+from pts.api.server import app as orjson_app
+from pts.core.predictor import PredictiveTestSelector
+from pts.utils.logger import setup_logging
+
+logger = logger.bind(name="bench_api_serialization")
+
+REQUEST_BODY = {
+    "commit_hash": "a1b2c3d4e5f67890",
+    "repository_url": "https://github.com/Amir032-cyber/AI-Optimized-Massive-Scale-CI-CD",
+    "changed_files": ["src/pts/core/predictor.py"],
+}
+
+
+class StaticSelector(PredictiveTestSelector):
+    """
+    Sélecteur factice renvoyant une liste fixe de tests.
+
+    Permet de faire varier la taille de la réponse sans dépendre du modèle.
+    """
+
+    def __init__(self, n_tests: int) -> None:
+        super().__init__(model=object(), threshold=0.5)
+        self.tests = [f"tests/unit/test_module_{i}.py::test_case_{i}" for i in range(n_tests)]
+
+    def run_prediction_pipeline(self, features_df: Any) -> List[str]:
+        return self.tests
+
+
+def build_pydantic_app() -> FastAPI:
+    """
+    Construit l'application de référence (A): validation et encodeur JSON par défaut.
+    """
+    app = FastAPI()
+
+    @app.post("/api/v1/predict", response_model=PredictionResponse)
+    async def predict_tests(
+        request: PredictionRequest,
+        selector: PredictiveTestSelector = Depends(get_test_selector),
+    ) -> PredictionResponse:
+        return PredictionResponse(**run_prediction(request, selector))
+
+    return app
+
+
+async def measure_rps(app: FastAPI, n_requests: int, concurrency: int) -> float:
+    """
+    Envoie `n_requests` requêtes /predict avec `concurrency` clients simultanés.
+
+    Returns:
+        Nombre de requêtes par seconde.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(n_requests))
+
+        async def worker() -> None:
+            for _ in remaining:
+                response = await client.post("/api/v1/predict", json=REQUEST_BODY)
+                response.raise_for_status()
+
+        # Échauffement
+        await client.post("/api/v1/predict", json=REQUEST_BODY)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return n_requests / elapsed
+
+
+def run_benchmark(n_requests: int, concurrency: int, payload_tests: int) -> Dict[str, float]:
+    """
+    Exécute le benchmark A/B (Pydantic vs orjson) à concurrence identique.
+    """
+    variants = {"pydantic": build_pydantic_app(), "orjson": orjson_app}
+    results: Dict[str, float] = {}
+
+    for name, app in variants.items():
+        if payload_tests > 0:
+            app.dependency_overrides[get_test_selector] = lambda: StaticSelector(payload_tests)
+        try:
+            results[name] = asyncio.run(measure_rps(app, n_requests, concurrency))
+        finally:
+            app.dependency_overrides.pop(get_test_selector, None)
+        logger.info(f"{name}: {results[name]:.1f} req/s")
+
+    return results
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark de sérialisation de l'API."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark A/B du chemin de réponse de /predict (Pydantic vs orjson)."
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Nombre total de requêtes.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients simultanés.")
+    parser.add_argument(
+        "--payload-tests",
+        type=int,
+        default=500,
+        help="Nombre de tests renvoyés par réponse (0 pour le sélecteur réel).",
+    )
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    results = run_benchmark(args.requests, args.concurrency, args.payload_tests)
+
+    speedup = results["orjson"] / results["pydantic"]
+    print(f"concurrence={args.concurrency} requêtes={args.requests} tests/réponse={args.payload_tests}")
+    for name, rps in results.items():
+        print(f"  {name:<10} {rps:10.1f} req/s")
+    print(f"  accélération: x{speedup:.2f}")
+
+
+if __name__ == "__main__":
+    main()
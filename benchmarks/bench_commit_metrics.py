@@ -0,0 +1,61 @@
+import argparse
+import time
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from pts.core.commit_metrics import commit_metrics, group_by_commit, summarize_commit_metrics
+from pts.utils.logger import setup_logging
+
+
+def make_rows(rows: int, commits: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Exécutions synthétiques (commit, probabilité, échec) avec ~1% d'échecs."""
+    rng = np.random.default_rng(seed)
+    commit_ids = np.char.add("c", rng.integers(0, commits, rows).astype(str))
+    failed = rng.random(rows) < 0.01
+    probabilities = np.clip(0.3 * failed + 0.7 * rng.random(rows), 0.0, 1.0)
+    return commit_ids, probabilities, failed
+
+
+def pandas_baseline(commit_ids: np.ndarray, probabilities: np.ndarray, failed: np.ndarray, threshold: float) -> pd.DataFrame:
+    """Référence groupby: mêmes métriques (sans APFD) calculées avec pandas."""
+    df = pd.DataFrame({"commit": commit_ids, "p": probabilities, "failed": failed})
+    df["selected"] = df["p"] >= threshold
+    df["detected"] = df["selected"] & df["failed"]
+    df["rank"] = df.groupby("commit")["p"].rank(ascending=False, method="first")
+    df["failed_rank"] = df["rank"].where(df["failed"], 0)
+    return df.groupby("commit").agg(
+        n_tests=("p", "size"), n_failed=("failed", "sum"), n_selected=("selected", "sum"),
+        n_detected=("detected", "sum"), failed_rank_sum=("failed_rank", "sum"),
+    )
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark des métriques par commit."""
+    parser = argparse.ArgumentParser(description="Mesure la durée des métriques par commit (noyaux NumPy vs pandas).")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--commits", type=int, default=100_000)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--skip-pandas", action="store_true", help="Ne pas mesurer la référence pandas.")
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    print(f"{'lignes':>10} {'noyaux (s)':>11} {'pandas (s)':>11}")
+    for rows in args.rows:
+        commit_ids, probabilities, failed = make_rows(rows, args.commits)
+        start = time.perf_counter()
+        groups = group_by_commit(commit_ids, probabilities, failed)
+        summarize_commit_metrics(commit_metrics(groups, args.threshold))
+        kernels = time.perf_counter() - start
+
+        baseline = float("nan")
+        if not args.skip_pandas:
+            start = time.perf_counter()
+            pandas_baseline(commit_ids, probabilities, failed, args.threshold)
+            baseline = time.perf_counter() - start
+        print(f"{rows:>10} {kernels:>11.2f} {baseline:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
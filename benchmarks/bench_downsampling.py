@@ -0,0 +1,70 @@
+import argparse
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from pts.core.evaluator import ModelEvaluator
+from pts.core.predictor import PredictiveTestSelector
+from pts.core.trainer import ModelTrainer
+from pts.utils.logger import setup_logging
+
+
+def make_dataset(rows: int, n_tests: int, failure_rate: float, seed: int = 0) -> pd.DataFrame:
+    """Exécutions synthétiques: quelques caractéristiques informatives, échecs rares."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((rows, 8)), columns=[f"feature_{j}" for j in range(8)])
+    df.insert(0, "test_id", rng.integers(0, n_tests, rows).astype(str))
+    score = 3.0 * df["feature_0"] + 2.0 * df["feature_1"] * df["feature_2"] + rng.normal(0, 0.5, rows)
+    df["test_failed"] = (score > np.quantile(score, 1.0 - failure_rate)).astype(int)
+    return df
+
+
+def bench(train_df: pd.DataFrame, eval_df: pd.DataFrame, rate: float, threshold: float) -> Dict[str, float]:
+    """Durée d'entraînement et métriques PTS (sur données non échantillonnées) pour un taux donné."""
+    trainer = ModelTrainer(config={
+        "model_params": {"n_estimators": 100, "max_depth": 6, "tree_method": "hist"},
+        "split": {"strategy": "random", "test_size": 0.01},
+        "sampling": {"negative_rate": rate, "group_by": "test_id"},
+    })
+    start = time.perf_counter()
+    model = trainer.train(train_df)
+    seconds = time.perf_counter() - start
+
+    selector = PredictiveTestSelector(model=model, threshold=threshold)
+    predictions = selector.predict(eval_df.drop(columns=["test_failed"]))
+    metrics = ModelEvaluator().calculate_pts_metrics(
+        predictions, eval_df[["test_id", "test_failed"]], selection_threshold=threshold
+    )
+    return {"seconds": seconds, **metrics}
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark de sous-échantillonnage des négatifs."""
+    parser = argparse.ArgumentParser(
+        description="Compare durée d'entraînement, TRR et DDR selon le taux de négatifs conservés."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Exécutions d'entraînement.")
+    parser.add_argument("--failure-rate", type=float, default=0.005, help="Proportion d'échecs.")
+    parser.add_argument("--rates", type=float, nargs="+", default=[1.0, 0.2, 0.1, 0.05])
+    parser.add_argument("--threshold", type=float, default=0.05, help="Seuil de sélection (probabilités corrigées).")
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    train_df = make_dataset(args.rows, 2000, args.failure_rate, seed=0)
+    # Identifiants uniques: calculate_pts_metrics fusionne sur test_id
+    eval_df = make_dataset(200_000, 2000, args.failure_rate, seed=1)
+    eval_df["test_id"] = [f"run_{i}" for i in range(len(eval_df))]
+
+    print(f"{'taux':>6} {'durée (s)':>10} {'accélération':>13} {'TRR':>7} {'DDR':>7}")
+    reference = None
+    for rate in args.rates:
+        result = bench(train_df, eval_df, rate, args.threshold)
+        reference = reference or result["seconds"]
+        print(f"{rate:>6g} {result['seconds']:>10.1f} {reference / result['seconds']:>12.1f}x "
+              f"{result['test_reduction_rate']:>7.3f} {result['defect_detection_rate']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
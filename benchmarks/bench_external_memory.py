@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from pts.core.external_memory import ExternalMemoryTrainer, parquet_files
+from pts.utils.logger import setup_logging
+
+MODES = ("in_memory", "quantile", "external")
+
+# Lignes par fichier Parquet (une partition hebdomadaire, par exemple)
+ROWS_PER_FILE = 250_000
+
+
+def write_dataset(directory: str, rows: int, n_features: int, seed: int = 0) -> None:
+    """Écrit un jeu de données synthétique de `rows` lignes en partitions Parquet."""
+    rng = np.random.default_rng(seed)
+    for part, start in enumerate(range(0, rows, ROWS_PER_FILE)):
+        n = min(ROWS_PER_FILE, rows - start)
+        df = pd.DataFrame(rng.random((n, n_features)), columns=[f"feature_{j}" for j in range(n_features)])
+        df["test_failed"] = (df["feature_0"] + 0.3 * rng.random(n) > 0.95).astype(np.int8)
+        df.to_parquet(os.path.join(directory, f"part-{part:04d}.parquet"), index=False)
+
+
+def run_worker(mode: str, directory: str, rounds: int) -> None:
+    """Entraîne dans un processus dédié et affiche durée et mémoire maximale (JSON)."""
+    start = time.perf_counter()
+    config = {"model_params": {"n_estimators": rounds, "max_depth": 6},
+              "external_memory": {"mode": mode, "cache_dir": os.path.join(directory, "cache")}}
+    if mode == "in_memory":
+        # Référence: lecture complète en DataFrame, comme ModelTrainer.train
+        from xgboost import XGBClassifier
+
+        df = pd.concat([pd.read_parquet(path) for path in parquet_files(directory)], ignore_index=True)
+        model = XGBClassifier(tree_method="hist", n_estimators=rounds, max_depth=6)
+        model.fit(df.drop(columns=["test_failed"]), df["test_failed"])
+    else:
+        ExternalMemoryTrainer(config).train(parquet_files(directory))
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": time.perf_counter() - start, "peak_mb": peak_kb / 1024}))
+
+
+def measure(mode: str, directory: str, rounds: int) -> Dict[str, float]:
+    """Lance `run_worker` dans un nouveau processus (mémoire maximale isolée)."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, "--directory", directory, "--rounds", str(rounds)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark d'entraînement en mémoire externe."""
+    parser = argparse.ArgumentParser(
+        description="Mesure la durée et la mémoire maximale de l'entraînement selon la taille des données."
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 1_000_000, 2_000_000],
+                        help="Tailles de jeux de données (lignes).")
+    parser.add_argument("--features", type=int, default=20, help="Nombre de caractéristiques.")
+    parser.add_argument("--rounds", type=int, default=50, help="Nombre d'arbres.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.directory, args.rounds)
+        return
+
+    setup_logging(level="WARNING")
+    print(f"{'lignes':>10} {'mode':<10} {'durée (s)':>10} {'pic RSS (Mo)':>13}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, rows, args.features)
+            for mode in args.modes:
+                result = measure(mode, directory, args.rounds)
+                print(f"{rows:>10} {mode:<10} {result['seconds']:>10.1f} {result['peak_mb']:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
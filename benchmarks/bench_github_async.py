@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List
+
+from pts.integrations.github import GitHubIntegration
+from pts.integrations.http import HttpClient
+from pts.utils.logger import setup_logging
+
+
+def start_mock_api(latency: float) -> ThreadingHTTPServer:
+    """
+    Démarre une API GitHub simulée (`GET /repos/o/r/commits/{sha}`) avec une
+    latence artificielle par requête.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            sha = self.path.rsplit("/", 1)[-1]
+            payload = json.dumps({
+                "sha": sha,
+                "commit": {"author": {"name": "Dev", "date": "2024-01-01T00:00:00Z"}, "message": "bench"},
+                "files": [{"filename": f"src/module_{i}.py"} for i in range(5)],
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_sequential(integration: GitHubIntegration, shas: List[str]) -> float:
+    """Débit (commits/s) de la boucle bloquante historique."""
+    start = time.perf_counter()
+    for sha in shas:
+        integration.get_commit_details(sha)
+    return len(shas) / (time.perf_counter() - start)
+
+
+def bench_async(integration: GitHubIntegration, shas: List[str], concurrency: int) -> float:
+    """Débit (commits/s) de `aget_many` avec la concurrence donnée."""
+    start = time.perf_counter()
+    results = asyncio.run(integration.aget_many(shas, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    assert all(r is not None for r in results)
+    return len(shas) / elapsed
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark de collecte des détails de commits."""
+    parser = argparse.ArgumentParser(
+        description="Mesure le débit de récupération des détails de commits (séquentiel vs asynchrone)."
+    )
+    parser.add_argument("--commits", type=int, default=500, help="Nombre de SHA à récupérer.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence simulée par requête (s).")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 64], help="Niveaux de concurrence.")
+    parser.add_argument("--sequential-commits", type=int, default=50,
+                        help="Nombre de SHA pour la référence séquentielle (plus lente).")
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    server = start_mock_api(args.latency)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    integration = GitHubIntegration(
+        token="bench", repo_owner="o", repo_name="r", api_url=api_url, client=HttpClient()
+    )
+    shas = [f"{i:040x}" for i in range(args.commits)]
+
+    try:
+        print(f"{'mode':<24} {'commits/s':>10}")
+        rate = bench_sequential(integration, shas[: args.sequential_commits])
+        print(f"{'séquentiel':<24} {rate:>10.1f}")
+        for concurrency in args.concurrency:
+            rate = bench_async(integration, shas, concurrency)
+            print(f"{f'aget_many (x{concurrency})':<24} {rate:>10.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import timeit
+from typing import Dict
+
+from pts.utils.logger import setup_logging
+from pts.utils.metrics import set_instrumentation_enabled, time_stage, timed_stage
+from pts.utils.profiling import configure_profiling, profiled_stage
+
+
+def baseline() -> None:
+    pass
+
+
+@timed_stage("bench_decorator")
+def decorated() -> None:
+    pass
+
+
+@profiled_stage("bench_profiled")
+def profiled() -> None:
+    pass
+
+
+def context_manager() -> None:
+    with time_stage("bench_context"):
+        pass
+
+
+def measure(number: int, repeat: int) -> Dict[str, float]:
+    """
+    Mesure le coût par appel (en nanosecondes) de chaque forme d'instrumentation.
+    """
+    results: Dict[str, float] = {}
+    candidates = {"baseline": baseline, "context_manager": context_manager, "decorator": decorated}
+
+    for enabled in (True, False):
+        set_instrumentation_enabled(enabled)
+        for name, func in candidates.items():
+            best = min(timeit.repeat(func, number=number, repeat=repeat))
+            results[f"{name}[{'on' if enabled else 'off'}]"] = best / number * 1e9
+
+    # profiled_stage désactivé (configuration par défaut)
+    configure_profiling(mode="", stage_report=False)
+    best = min(timeit.repeat(profiled, number=number, repeat=repeat))
+    results["profiled_stage[off]"] = best / number * 1e9
+
+    set_instrumentation_enabled(True)
+    return results
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark du coût de l'instrumentation."""
+    parser = argparse.ArgumentParser(
+        description="Mesure le surcoût de time_stage/timed_stage, actif et désactivé, et de profiled_stage désactivé."
+    )
+    parser.add_argument("--number", type=int, default=200_000, help="Appels par mesure.")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de répétitions (meilleure retenue).")
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    results = measure(args.number, args.repeat)
+
+    baseline_ns = results["baseline[on]"]
+    for name, ns in results.items():
+        print(f"{name:<24} {ns:8.1f} ns/appel (surcoût: {ns - baseline_ns:7.1f} ns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+from loguru import logger
+
+from pts.api.models import PredictionRequest
+from pts.api.routes import run_prediction
+from pts.core.predictor import PredictiveTestSelector
+from pts.utils.logger import setup_logging
+
+REQUEST = PredictionRequest(
+    commit_hash="a1b2c3d4e5f67890",
+    repository_url="https://github.com/Amir032-cyber/AI-Optimized-Massive-Scale-CI-CD",
+)
+
+
+class ConstantModel:
+    """Modèle factice renvoyant une probabilité d'échec constante."""
+
+    def predict_proba(self, X) -> np.ndarray:
+        return np.tile([0.3, 0.7], (len(X), 1))
+
+
+def time_requests(selector: PredictiveTestSelector, n_requests: int) -> float:
+    """Retourne le temps moyen (µs) d'une prédiction complète, journaux compris."""
+    for _ in range(50):
+        run_prediction(REQUEST, selector)
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        run_prediction(REQUEST, selector)
+    return (time.perf_counter() - start) / n_requests * 1e6
+
+
+def run_benchmark(n_requests: int, sample_rate: float, log_dir: str) -> Dict[str, float]:
+    """
+    Compare le coût par requête sans journaux, en mode synchrone et en mode asynchrone.
+    """
+    selector = PredictiveTestSelector(model=ConstantModel(), threshold=0.5)
+    log_file = os.path.join(log_dir, "pts_bench.log")
+    results: Dict[str, float] = {}
+
+    setup_logging(level="INFO", async_mode=False, sample_rate=1.0)
+    logger.disable("pts")
+    results["désactivé"] = time_requests(selector, n_requests)
+
+    logger.enable("pts")
+    setup_logging(level="INFO", sink=log_file, async_mode=False, sample_rate=1.0)
+    results["synchrone"] = time_requests(selector, n_requests)
+
+    setup_logging(level="INFO", sink=log_file, async_mode=True, sample_rate=sample_rate)
+    results[f"asynchrone (échantillon {sample_rate:g})"] = time_requests(selector, n_requests)
+
+    setup_logging(level="INFO", sink=log_file, async_mode=True, sample_rate=1.0)
+    results["asynchrone (sans échantillon)"] = time_requests(selector, n_requests)
+
+    logger.remove()
+    return results
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark du coût de journalisation par requête."""
+    parser = argparse.ArgumentParser(
+        description="Mesure le surcoût de journalisation par requête de prédiction."
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="Nombre de requêtes par mode.")
+    parser.add_argument("--sample-rate", type=float, default=0.01, help="Taux d'échantillonnage du mode asynchrone.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        # La sortie d'erreur est redirigée vers un vrai fichier pour inclure le coût des E/S
+        stderr = sys.stderr
+        with open(os.path.join(log_dir, "stderr.log"), "w") as capture:
+            sys.stderr = capture
+            try:
+                results = run_benchmark(args.requests, args.sample_rate, log_dir)
+            finally:
+                sys.stderr = stderr
+
+    baseline = results["désactivé"]
+    for mode, us in results.items():
+        print(f"{mode:<32} {us:8.1f} µs/requête (surcoût journaux: {us - baseline:7.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
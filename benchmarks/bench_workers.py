@@ -0,0 +1,126 @@
+import argparse
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import requests
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger = logger.bind(name="bench_workers")
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+REQUEST_BODY = {
+    "commit_hash": "a1b2c3d4e5f67890",
+    "repository_url": "https://github.com/Amir032-cyber/AI-Optimized-Massive-Scale-CI-CD",
+}
+
+
+def read_memory_kb(pid: int) -> Dict[str, int]:
+    """
+    Lit la mémoire résidente (RSS) et proportionnelle (PSS) d'un processus.
+
+    La PSS répartit les pages partagées entre les processus qui les partagent:
+    c'est elle qui montre le gain du copy-on-write.
+    """
+    memory = {"rss_kb": 0, "pss_kb": 0}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Rss:"):
+                memory["rss_kb"] = int(line.split()[1])
+            elif line.startswith("Pss:"):
+                memory["pss_kb"] = int(line.split()[1])
+    return memory
+
+
+def list_workers(master_pid: int) -> List[int]:
+    """Retourne les PID des workers forkés par le maître gunicorn."""
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    """Attend que l'endpoint de santé réponde."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Le serveur n'a pas démarré: {url}")
+
+
+def load_client(args: tuple) -> int:
+    """Client de charge: envoie des requêtes /predict pendant `duration` secondes."""
+    url, duration = args
+    session = requests.Session()
+    count = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        session.post(url, json=REQUEST_BODY, timeout=10).raise_for_status()
+        count += 1
+    return count
+
+
+def bench_worker_count(workers: int, port: int, clients: int, duration: float) -> Dict[str, float]:
+    """Démarre le serveur avec `workers` workers et mesure mémoire et débit."""
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_ROOT, "scripts", "serve.py"),
+         "--workers", str(workers), "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+    try:
+        wait_until_ready(f"{base_url}/health")
+
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.map(load_client, [(f"{base_url}/predict", duration)] * clients)
+
+        worker_memory = [read_memory_kb(pid) for pid in list_workers(server.pid)]
+        master_memory = read_memory_kb(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    return {
+        "workers": workers,
+        "rps": sum(counts) / duration,
+        "master_rss_mb": master_memory["rss_kb"] / 1024,
+        "worker_rss_mb": sum(m["rss_kb"] for m in worker_memory) / len(worker_memory) / 1024,
+        "worker_pss_mb": sum(m["pss_kb"] for m in worker_memory) / len(worker_memory) / 1024,
+    }
+
+
+def main() -> None:
+    """Point d'entrée principal du benchmark multi-workers."""
+    parser = argparse.ArgumentParser(
+        description="Mesure la mémoire par worker et le débit en fonction du nombre de workers."
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Nombres de workers à tester.")
+    parser.add_argument("--clients", type=int, default=8, help="Processus clients de charge.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de charge (s) par configuration.")
+    parser.add_argument("--port", type=int, default=8099, help="Port d'écoute du serveur testé.")
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    print(f"{'workers':>8} {'req/s':>10} {'RSS maître':>12} {'RSS/worker':>12} {'PSS/worker':>12}")
+    for workers in args.workers:
+        result = bench_worker_count(workers, args.port, args.clients, args.duration)
+        print(
+            f"{result['workers']:>8} {result['rps']:>10.1f} {result['master_rss_mb']:>10.1f}Mo "
+            f"{result['worker_rss_mb']:>10.1f}Mo {result['worker_pss_mb']:>10.1f}Mo"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+# Codes de sortie: 0 = pas de régression, 1 = régression, 2 = rapports non comparables
+EXIT_REGRESSION = 1
+EXIT_INCOMPATIBLE = 2
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Charge un rapport JSON produit par benchmarks/pipeline_suite.py."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float, min_seconds: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare les médianes de chaque étape présente dans les deux rapports.
+
+    Une étape régresse si sa médiane dépasse celle de la référence de plus de
+    `tolerance` (ex: 0.1 = +10%). Les étapes plus courtes que `min_seconds`
+    dans les deux rapports sont trop bruitées pour conclure.
+
+    Returns:
+        Une ligne par étape: stage, baseline_s, current_s, ratio, status.
+    """
+    rows = []
+    for stage, reference in baseline["stages"].items():
+        if stage not in current["stages"]:
+            continue
+        before, after = reference["median_s"], current["stages"][stage]["median_s"]
+        ratio = after / before if before > 0 else float("inf")
+        if max(before, after) < min_seconds:
+            status = "bruit"
+        elif ratio > 1.0 + tolerance:
+            status = "RÉGRESSION"
+        elif ratio < 1.0 - tolerance:
+            status = "amélioration"
+        else:
+            status = "stable"
+        rows.append({"stage": stage, "baseline_s": before, "current_s": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def main() -> None:
+    """Point d'entrée principal de la comparaison de deux rapports de benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare deux rapports de benchmark et signale les régressions au-delà d'une tolérance."
+    )
+    parser.add_argument("baseline", help="Rapport JSON de référence.")
+    parser.add_argument("current", help="Rapport JSON à comparer.")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Hausse relative tolérée de la médiane (par défaut: 0.10).")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="Durée en dessous de laquelle une étape n'est pas jugée.")
+    args = parser.parse_args()
+
+    baseline, current = load_report(args.baseline), load_report(args.current)
+    if baseline["meta"]["scale"] != current["meta"]["scale"]:
+        print(f"Tailles différentes: {baseline['meta']['scale']} != {current['meta']['scale']}")
+        sys.exit(EXIT_INCOMPATIBLE)
+
+    rows = compare_reports(baseline, current, args.tolerance, args.min_seconds)
+    print(f"{baseline['meta']['revision']} -> {current['meta']['revision']} (tolérance {args.tolerance:.0%})")
+    print(f"{'étape':<14} {'référence (s)':>14} {'actuel (s)':>12} {'ratio':>7}  statut")
+    for row in rows:
+        print(f"{row['stage']:<14} {row['baseline_s']:>14.4f} {row['current_s']:>12.4f} "
+              f"{row['ratio']:>7.2f}  {row['status']}")
+
+    if any(row["status"] == "RÉGRESSION" for row in rows):
+        sys.exit(EXIT_REGRESSION)
+
+
+if __name__ == "__main__":
+    main()
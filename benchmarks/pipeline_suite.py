@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)  # scripts.miner (GitMiner)
+
+from pts.core.predictor import PredictiveTestSelector  # noqa: E402
+from pts.core.trainer import ModelTrainer  # noqa: E402
+from pts.data.processor import DataProcessor  # noqa: E402
+from pts.data.synthetic import SyntheticHistory, generate_history, write_git_repo  # noqa: E402
+from pts.features.engineer import FeatureEngineer  # noqa: E402
+from pts.features.extractor import FeatureExtractor  # noqa: E402
+from pts.features.selector import FeatureSelector  # noqa: E402
+from pts.utils.logger import setup_logging  # noqa: E402
+from scripts.miner import GitMiner  # noqa: E402
+
+# Tailles prédéfinies: commits, tests exécutés par commit, fichiers du dépôt
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"commits": 200, "tests": 200, "files": 500},
+    "medium": {"commits": 1000, "tests": 1000, "files": 5000},
+    "large": {"commits": 5000, "tests": 2000, "files": 50000},
+}
+
+STAGES = ("mine_history", "process", "extract", "engineer", "select", "train", "predict", "http_predict")
+
+MODEL_PARAMS = {"n_estimators": 50, "max_depth": 6}
+
+REQUEST_BODY = {
+    "commit_hash": "a1b2c3d4e5f67890",
+    "repository_url": "https://github.com/Amir032-cyber/AI-Optimized-Massive-Scale-CI-CD",
+    "changed_files": ["src/pts/core/predictor.py"],
+}
+
+
+def measure(
+    run: Callable[..., Any], setup: Optional[Callable[[], Tuple]] = None, repeat: int = 3
+) -> Tuple[Dict[str, float], Any]:
+    """
+    Chronomètre `run` `repeat` fois.
+
+    `setup` prépare les arguments de chaque exécution (copies des entrées que
+    les étapes modifient sur place) en dehors du chronométrage.
+
+    Returns:
+        (statistiques en secondes, résultat de la dernière exécution)
+    """
+    durations = []
+    result = None
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        result = run(*args)
+        durations.append(time.perf_counter() - start)
+    stats = {
+        "median_s": statistics.median(durations),
+        "min_s": min(durations),
+        "max_s": max(durations),
+        "repeat": repeat,
+    }
+    return stats, result
+
+
+def free_port() -> int:
+    """Port TCP libre sur l'interface locale."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def bench_http_predict(model_path: str, n_requests: int) -> Dict[str, float]:
+    """
+    Mesure la latence de /predict sur un vrai serveur uvicorn (requêtes HTTP séquentielles).
+
+    Les statistiques portent sur une requête; `rows` est le nombre de requêtes.
+    """
+    import uvicorn
+
+    from pts.api.server import app
+    from pts.api.state import load_model_state
+
+    load_model_state(model_path=model_path, threshold=0.5)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+    try:
+        deadline = time.monotonic() + 30
+        while not server.started:
+            if time.monotonic() > deadline:
+                raise TimeoutError("Le serveur uvicorn n'a pas démarré.")
+            time.sleep(0.05)
+
+        session = requests.Session()
+        for _ in range(10):  # Échauffement
+            session.post(f"{base_url}/predict", json=REQUEST_BODY).raise_for_status()
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            sent = time.perf_counter()
+            session.post(f"{base_url}/predict", json=REQUEST_BODY).raise_for_status()
+            latencies.append(time.perf_counter() - sent)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    return {
+        "median_s": statistics.median(latencies),
+        "min_s": min(latencies),
+        "max_s": max(latencies),
+        "p95_s": float(np.percentile(latencies, 95)),
+        "rps": n_requests / elapsed,
+        "repeat": n_requests,
+    }
+
+
+def train_api_model(history: SyntheticHistory, path: str) -> None:
+    """
+    Entraîne et sauvegarde un modèle sur les caractéristiques assemblées par /predict
+    (voir pts.api.routes.run_prediction).
+    """
+    rng = np.random.default_rng(0)
+    n = min(len(history.test_results), 100_000)
+    df = pd.DataFrame({
+        "test_id": history.test_results["test_id"].to_numpy()[:n],
+        "feature_churn": rng.integers(1, 100, n),
+        "feature_history": rng.random(n),
+        "feature_complexity": rng.random(n) * 10,
+    })
+    df["test_failed"] = history.test_results["test_failed"].to_numpy()[:n]
+    trainer = ModelTrainer({"model_params": MODEL_PARAMS})
+    trainer.train(df)
+    trainer.save_model(path)
+
+
+def run_suite(scale: Dict[str, int], repeat: int, n_requests: int, seed: int,
+              stages: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Exécute les étapes du pipeline sur un historique synthétique.
+
+    Returns:
+        Statistiques par étape (secondes), avec le nombre de lignes traitées.
+    """
+    history = generate_history(scale["commits"], scale["tests"], scale["files"], seed=seed)
+    raw = {"commit_history": history.commits, "test_results": history.test_results}
+    results: Dict[str, Dict[str, float]] = {}
+
+    def wanted(stage: str) -> bool:
+        return stages is None or stage in stages
+
+    with tempfile.TemporaryDirectory() as directory:
+        if wanted("mine_history"):
+            repo_path = os.path.join(directory, "repo")
+            write_git_repo(history, repo_path)
+            results["mine_history"], _ = measure(
+                lambda: GitMiner(repo_path=repo_path).mine_history(max_commits=scale["commits"]), repeat=1
+            )
+            results["mine_history"]["rows"] = scale["commits"]
+
+        # Les étapes suivantes dépendent les unes des autres: elles sont toujours exécutées
+        results["process"], processed = measure(
+            DataProcessor().run_processing_pipeline,
+            lambda: ({"commit_history": raw["commit_history"].copy(), "test_results": raw["test_results"]},),
+            repeat,
+        )
+        results["extract"], extracted = measure(
+            FeatureExtractor().run_extraction_pipeline, lambda: (processed.copy(),), repeat
+        )
+        results["engineer"], engineered = measure(
+            FeatureEngineer().run_engineering_pipeline, lambda: (extracted.copy(),), repeat
+        )
+        results["select"], selected = measure(
+            FeatureSelector({"k_best": 5}).run_selection_pipeline, lambda: (engineered,), repeat
+        )
+        for stage, df in (("process", processed), ("extract", extracted),
+                          ("engineer", engineered), ("select", selected)):
+            results[stage]["rows"] = len(df)
+
+        training_df = selected.drop(columns=["commit_id"])
+        if wanted("train"):
+            results["train"], model = measure(
+                lambda: ModelTrainer({"model_params": MODEL_PARAMS}).train(training_df), repeat=repeat
+            )
+            results["train"]["rows"] = len(training_df)
+        else:
+            model = ModelTrainer({"model_params": MODEL_PARAMS}).train(training_df)
+
+        if wanted("predict"):
+            selector = PredictiveTestSelector(model=model, threshold=0.5)
+            features_df = training_df.drop(columns=["test_failed"])
+            results["predict"], _ = measure(selector.predict, lambda: (features_df,), repeat)
+            results["predict"]["rows"] = len(features_df)
+
+        if wanted("http_predict"):
+            model_path = os.path.join(directory, "api_model.json")
+            train_api_model(history, model_path)
+            results["http_predict"] = bench_http_predict(model_path, n_requests)
+            results["http_predict"]["rows"] = n_requests
+
+    return {stage: values for stage, values in results.items() if wanted(stage)}
+
+
+def git_revision() -> str:
+    """Révision Git courante du projet (ou 'unknown')."""
+    try:
+        return subprocess.run(
+            ["git", "-C", PROJECT_ROOT, "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    """Point d'entrée principal de la suite de benchmarks du pipeline PTS."""
+    parser = argparse.ArgumentParser(
+        description="Chronomètre chaque étape du pipeline PTS sur un historique synthétique déterministe."
+    )
+    parser.add_argument("--scale", choices=list(SCALES), default="small", help="Taille prédéfinie.")
+    parser.add_argument("--commits", type=int, help="Nombre de commits (remplace --scale).")
+    parser.add_argument("--tests", type=int, help="Tests exécutés par commit (remplace --scale).")
+    parser.add_argument("--files", type=int, help="Fichiers du dépôt (remplace --scale).")
+    parser.add_argument("--repeat", type=int, default=3, help="Exécutions par étape (médiane retenue).")
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes /predict mesurées.")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES,
+                        help="Étapes à mesurer (par défaut: toutes; process à select sont toujours exécutées).")
+    parser.add_argument("--output", help="Fichier JSON de résultats (par défaut: benchmarks/results/).")
+    args = parser.parse_args()
+
+    setup_logging(level="WARNING")
+    scale = dict(SCALES[args.scale])
+    for key in ("commits", "tests", "files"):
+        if getattr(args, key):
+            scale[key] = getattr(args, key)
+
+    revision = git_revision()
+    stages = run_suite(scale, args.repeat, args.requests, args.seed, args.stages)
+    report = {
+        "meta": {
+            "revision": revision,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": scale,
+            "seed": args.seed,
+        },
+        "stages": stages,
+    }
+
+    output = args.output or os.path.join(
+        PROJECT_ROOT, "benchmarks", "results", f"{args.scale}-{revision}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'étape':<14} {'lignes':>10} {'médiane (s)':>12} {'min (s)':>10}")
+    for stage, values in stages.items():
+        print(f"{stage:<14} {values['rows']:>10} {values['median_s']:>12.4f} {values['min_s']:>10.4f}")
+    print(f"Résultats écrits dans {output}")
+
+
+if __name__ == "__main__":
+    main()
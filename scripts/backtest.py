@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+import pandas as pd
+from loguru import logger
+
+from pts.core.backtest import Backtester
+from pts.utils.logger import setup_logging
+from pts.utils.config import ConfigError, load_config
+
+logger.disable("pts")
+logger = logger.bind(name="backtest_script")
+
+
+def main() -> None:
+    """Point d'entrée principal pour le backtest temporel du modèle."""
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Backtest du modèle sur des fenêtres temporelles successives."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="configs/model_config.yaml",
+        help="Chemin vers le fichier de configuration du modèle.",
+    )
+    parser.add_argument(
+        "--data",
+        type=str,
+        default="data/processed/training_data.csv",
+        help="Chemin vers les données (caractéristiques, colonne cible et date du commit).",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="data/processed/backtest_metrics.csv",
+        help="Chemin du fichier de sortie des métriques par fenêtre.",
+    )
+    parser.add_argument(
+        "--expanding",
+        action="store_true",
+        help="Fenêtre d'entraînement croissante (remplace backtest.expanding).",
+    )
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config).to_dict()
+    except ConfigError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    if args.expanding:
+        config.setdefault("backtest", {})["expanding"] = True
+
+    try:
+        data_df = pd.read_csv(args.data)
+        logger.info(f"Données chargées depuis {args.data}. {len(data_df)} lignes.")
+    except FileNotFoundError:
+        logger.error(f"Fichier de données non trouvé: {args.data}")
+        sys.exit(1)
+
+    try:
+        results = Backtester(config).run(data_df)
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results.to_csv(args.output, index=False)
+        logger.success(f"Backtest terminé. Métriques par fenêtre sauvegardées dans {args.output}")
+    except Exception as e:
+        logger.error(f"Échec du backtest: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
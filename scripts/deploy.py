@@ -5,7 +5,6 @@ from loguru import logger
 
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="deploy_script")
 
@@ -51,6 +50,7 @@ def deploy_kubernetes(config_path: str) -> None:
 
 def main() -> None:
     """Point d'entrée principal pour le script de déploiement."""
+    setup_logging()
     parser = argparse.ArgumentParser(
         description="Script de déploiement de l'application PTS."
     )
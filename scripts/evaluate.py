@@ -5,18 +5,19 @@ import pandas as pd
 import yaml
 from loguru import logger
 
+from pts.core.bootstrap import interval_metrics
 from pts.core.evaluator import ModelEvaluator
 from pts.core.predictor import PredictiveTestSelector
 from pts.utils.logger import setup_logging
-from pts.utils.helpers import load_yaml_config
+from pts.utils.config import ConfigError, load_config
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="evaluate_script")
 
 
 def main() -> None:
     """Point d'entrée principal pour l'évaluation du modèle."""
+    setup_logging()
     parser = argparse.ArgumentParser(
         description="Script d'évaluation du modèle de sélection prédictive des tests."
     )
@@ -38,11 +39,38 @@ def main() -> None:
         default="data/processed/evaluation_metrics.yaml",
         help="Chemin du fichier de sortie pour les métriques d'évaluation.",
     )
+    parser.add_argument(
+        "--sweep",
+        type=str,
+        default=None,
+        help="Chemin CSV de la courbe TRR/DDR pour tous les seuils (balayage non effectué si absent).",
+    )
+    parser.add_argument(
+        "--target-ddr",
+        type=float,
+        default=None,
+        help="Taux de détection cible: ajoute aux métriques le seuil recommandé et ses TRR/DDR.",
+    )
+    parser.add_argument(
+        "--per-commit",
+        type=str,
+        default=None,
+        help="Chemin CSV des métriques par commit (APFD, échec détecté); nécessite la colonne commit_hash.",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=None,
+        help="Nombre d'échantillons bootstrap (commits) pour les intervalles de confiance "
+             "(remplace evaluation.bootstrap_resamples; 0 pour désactiver).",
+    )
     args = parser.parse_args()
 
     # 1. Charger la configuration
-    config = load_yaml_config(args.config)
-    if not config:
+    try:
+        config = load_config(args.config).to_dict()
+    except ConfigError as e:
+        logger.error(str(e))
         sys.exit(1)
 
     # 2. Charger les données
@@ -63,7 +91,10 @@ def main() -> None:
     # NOTE: Le modèle doit être chargé pour l'évaluation
     # Pour la démo, on utilise le chargement simulé du Predictor.
     selector = PredictiveTestSelector(threshold=selection_threshold, model_path=model_path)
-    evaluator = ModelEvaluator(target_column=config.get("target_column", "test_failed"))
+    evaluator = ModelEvaluator(
+        target_column=config.get("target_column", "test_failed"),
+        date_column=config.get("split", {}).get("date_column", "committed_date"),
+    )
 
     try:
         # 4. Évaluation classique (nécessite un modèle entraîné)
@@ -71,20 +102,75 @@ def main() -> None:
         # metrics = evaluator.evaluate(model, data_df)
         
         # Simulation des résultats de prédiction pour l'évaluation PTS
-        prediction_results = selector.predict(data_df.drop(columns=[evaluator.target_column], errors="ignore"))
-        actual_failures = data_df[["test_id", evaluator.target_column]].rename(columns={evaluator.target_column: "test_failed"})
+        # Colonnes d'identification du commit: ni caractéristiques du modèle, ni entrées du sélecteur
+        prediction_results = selector.predict(
+            data_df.drop(columns=[evaluator.target_column, "commit_hash", evaluator.date_column], errors="ignore")
+        )
+        id_columns = [c for c in ("test_id", "commit_hash") if c in data_df.columns]
+        actual_failures = data_df[[*id_columns, evaluator.target_column]].rename(
+            columns={evaluator.target_column: "test_failed"})
+        if "commit_hash" in data_df.columns:
+            # Un même test_id revient à chaque commit: les jointures se font sur (test_id, commit_hash)
+            prediction_results = prediction_results.assign(commit_hash=data_df["commit_hash"].to_numpy())
         
         # 5. Évaluation PTS
         pts_metrics = evaluator.calculate_pts_metrics(
             prediction_results, actual_failures, selection_threshold=selection_threshold
         )
         
-        # 6. Sauvegarder les métriques
+        # 6. Balayage des seuils et seuil recommandé
+        if args.sweep or args.target_ddr is not None:
+            curve = evaluator.sweep_thresholds(prediction_results, actual_failures)
+            if args.sweep:
+                sweep_dir = os.path.dirname(args.sweep)
+                if sweep_dir:
+                    os.makedirs(sweep_dir, exist_ok=True)
+                curve.to_csv(args.sweep, index=False)
+                logger.info(f"Courbe TRR/DDR ({len(curve)} seuils) sauvegardée dans {args.sweep}")
+            if args.target_ddr is not None:
+                recommended = evaluator.recommend_threshold(curve, args.target_ddr)
+                if recommended is None:
+                    logger.warning("Aucun seuil disponible: données d'évaluation vides.")
+                else:
+                    pts_metrics["recommended_threshold"] = recommended["threshold"]
+                    pts_metrics["recommended_test_reduction_rate"] = recommended["test_reduction_rate"]
+                    pts_metrics["recommended_defect_detection_rate"] = recommended["defect_detection_rate"]
+
+        # 7. Métriques par commit
+        if args.per_commit:
+            if "commit_hash" not in data_df.columns:
+                logger.warning("Colonne 'commit_hash' absente: métriques par commit ignorées.")
+            else:
+                per_commit, summary = evaluator.calculate_commit_metrics(
+                    prediction_results, actual_failures, selection_threshold=selection_threshold
+                )
+                per_commit_dir = os.path.dirname(args.per_commit)
+                if per_commit_dir:
+                    os.makedirs(per_commit_dir, exist_ok=True)
+                per_commit.to_csv(args.per_commit, index=False)
+                pts_metrics.update({f"commit_{k}": v for k, v in summary.items()})
+
+        # 8. Intervalles de confiance bootstrap
+        evaluation_config = config.get("evaluation", {})
+        n_resamples = args.bootstrap if args.bootstrap is not None else evaluation_config.get("bootstrap_resamples", 0)
+        if n_resamples:
+            intervals = evaluator.bootstrap_intervals(
+                prediction_results,
+                actual_failures,
+                selection_threshold=selection_threshold,
+                n_resamples=n_resamples,
+                confidence=evaluation_config.get("confidence", 0.95),
+                seed=evaluation_config.get("seed", 42),
+            )
+            pts_metrics.update(interval_metrics(intervals))
+
+        # 9. Sauvegarder les métriques
         output_dir = os.path.dirname(args.output)
         os.makedirs(output_dir, exist_ok=True)
         
         with open(args.output, "w") as f:
-            yaml.dump(pts_metrics, f, default_flow_style=False)
+            # Types Python natifs: le fichier doit rester lisible par yaml.safe_load
+            yaml.safe_dump({k: float(v) for k, v in pts_metrics.items()}, f, default_flow_style=False)
             
         logger.success(f"Pipeline d'évaluation terminé. Métriques sauvegardées dans {args.output}")
         
@@ -0,0 +1,53 @@
+import argparse
+import sys
+
+from loguru import logger
+
+from pts.data.synthetic import FORMATS, SyntheticGenerator, write_history
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="generate_synthetic_script")
+
+
+def main() -> None:
+    """Point d'entrée principal pour la génération d'un historique synthétique."""
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Génère un historique synthétique de commits et de résultats de tests à grande échelle."
+    )
+    parser.add_argument("--output", type=str, default="data/synthetic", help="Répertoire de sortie.")
+    parser.add_argument("--commits", type=int, default=10_000, help="Nombre de commits.")
+    parser.add_argument("--tests", type=int, default=1_000, help="Nombre de tests de la suite.")
+    parser.add_argument("--tests-per-commit", type=int, help="Tests exécutés par commit (par défaut: tous).")
+    parser.add_argument("--files", type=int, default=5_000, help="Nombre de fichiers du dépôt.")
+    parser.add_argument("--authors", type=int, default=100, help="Nombre d'auteurs.")
+    parser.add_argument("--flaky-rate", type=float, default=0.02, help="Proportion de tests instables.")
+    parser.add_argument("--seed", type=int, default=0, help="Graine.")
+    parser.add_argument("--formats", nargs="*", choices=FORMATS, default=["csv"],
+                        help="Formats de stockage écrits.")
+    parser.add_argument("--git", action="store_true", help="Matérialise aussi un dépôt Git (git fast-import).")
+    args = parser.parse_args()
+
+    generator = SyntheticGenerator(
+        n_commits=args.commits,
+        n_tests=args.tests,
+        n_files=args.files,
+        n_authors=args.authors,
+        tests_per_commit=args.tests_per_commit,
+        flaky_rate=args.flaky_rate,
+        seed=args.seed,
+    )
+    try:
+        counts = write_history(generator, args.output, formats=args.formats, git=args.git)
+        logger.success(
+            f"Historique synthétique écrit dans {args.output}: "
+            f"{counts['commits']} commits, {counts['test_results']} résultats de tests."
+        )
+    except Exception as e:
+        logger.error(f"Échec de la génération: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,6 @@ from git import Repo, Commit, GitCommandError
 from pts.utils.logger import setup_logging
 
 # Configuration de la journalisation
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="git_miner")
 
@@ -91,6 +90,7 @@ def main() -> None:
     """
     Point d'entrée principal pour le script de minage.
     """
+    setup_logging()
     parser = argparse.ArgumentParser(
         description="Outil d'extraction de données à partir d'un dépôt Git."
     )
@@ -7,15 +7,15 @@ from loguru import logger
 
 from pts.core.predictor import PredictiveTestSelector
 from pts.utils.logger import setup_logging
-from pts.utils.helpers import load_yaml_config
+from pts.utils.config import ConfigError, load_config
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="predict_script")
 
 
 def main() -> None:
     """Point d'entrée principal pour la prédiction des tests."""
+    setup_logging()
     parser = argparse.ArgumentParser(
         description="Script de prédiction des tests pertinents à exécuter."
     )
@@ -40,8 +40,10 @@ def main() -> None:
     args = parser.parse_args()
 
     # 1. Charger la configuration
-    config = load_yaml_config(args.config)
-    if not config:
+    try:
+        config = load_config(args.config).to_dict()
+    except ConfigError as e:
+        logger.error(str(e))
         sys.exit(1)
 
     # 2. Charger les caractéristiques
@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import pandas as pd
+from loguru import logger
+
+from pts.core.replay import ReplaySimulator
+from pts.utils.logger import setup_logging
+from pts.utils.config import ConfigError, load_config
+
+logger.disable("pts")
+logger = logger.bind(name="replay_script")
+
+
+def main() -> None:
+    """Point d'entrée principal pour le rejeu hors ligne de l'historique CI."""
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Rejoue l'historique des commits et estime les minutes CI économisées et les échecs manqués."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="configs/model_config.yaml",
+        help="Chemin vers le fichier de configuration du modèle.",
+    )
+    parser.add_argument(
+        "--history",
+        type=str,
+        default="data/processed/training_data.csv",
+        help="Historique: commit_hash, committed_date, test_id, test_failed, duration et caractéristiques.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="data/processed/replay_commits.csv",
+        help="Chemin du fichier de sortie des métriques par commit.",
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="Publie le résultat dans les métriques Prometheus (taux de réduction, économies).",
+    )
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config).to_dict()
+    except ConfigError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    try:
+        history = pd.read_csv(args.history)
+        logger.info(f"Historique chargé depuis {args.history}. {len(history)} lignes.")
+    except FileNotFoundError:
+        logger.error(f"Fichier d'historique non trouvé: {args.history}")
+        sys.exit(1)
+
+    try:
+        simulator = ReplaySimulator(config)
+        result = simulator.run(history)
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        result.per_commit.to_csv(args.output, index=False)
+        for key, value in result.summary.items():
+            logger.info(f"{key}: {value:.4f}")
+        if args.publish:
+            simulator.publish(result.summary)
+        logger.success(f"Rejeu terminé. Métriques par commit sauvegardées dans {args.output}")
+    except Exception as e:
+        logger.error(f"Échec du rejeu: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
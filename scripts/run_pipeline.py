@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import time
+
+from loguru import logger
+
+from pts.pipeline import default_pipeline
+from pts.utils.config import ConfigError, load_config
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="run_pipeline_script")
+
+
+def main() -> None:
+    """Point d'entrée principal du pipeline complet, de la collecte au modèle."""
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Exécute le pipeline PTS en ne recalculant que les étapes dont les entrées ont changé."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="configs/model_config.yaml",
+        help="Chemin vers le fichier de configuration du modèle.",
+    )
+    parser.add_argument("--targets", nargs="+", help="Étapes demandées (par défaut: model).")
+    parser.add_argument("--force", nargs="+", default=[], help="Étapes à recalculer malgré le cache.")
+    parser.add_argument("--model-output", type=str, help="Chemin du modèle (par défaut: model_save_path).")
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config).to_dict()
+    except ConfigError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        pipeline = default_pipeline(config)
+        result = pipeline.run(targets=args.targets, force=args.force)
+    except Exception as e:
+        logger.error(f"Échec du pipeline: {e}")
+        sys.exit(1)
+
+    for name, status in result.status.items():
+        duration = f" en {result.seconds[name]:.2f} s" if name in result.seconds else ""
+        logger.info(f"{name:<14} {status}{duration} ({result.fingerprints[name]})")
+    logger.success(f"Pipeline terminé en {time.perf_counter() - start:.2f} s.")
+
+    if "model" in result.outputs:
+        from pts.core.trainer import ModelTrainer
+
+        model_path = args.model_output or config.get("model_save_path", "models/latest_model.json")
+        os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+        trainer = ModelTrainer(config)
+        trainer.model = result.outputs["model"]
+        trainer.save_model(model_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="serve_script")
+
+
+def on_starting(server: Any) -> None:
+    """Hook gunicorn: exécuté une fois dans le maître, avant le fork des workers."""
+    logger.info(f"Démarrage du maître PTS avec {server.cfg.workers} workers.")
+
+
+def on_reload(server: Any) -> None:
+    """
+    Hook gunicorn (SIGHUP): recharge le modèle dans le maître.
+
+    Les nouveaux workers sont forkés après ce hook et partagent donc le modèle
+    rechargé; les anciens terminent leurs requêtes en cours avant de s'arrêter.
+    """
+    from pts.api.state import freeze_for_fork, load_model_state
+
+    logger.info("Rechargement gracieux: rechargement du modèle dans le maître.")
+    load_model_state()
+    freeze_for_fork()
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Hook gunicorn: nettoie les fichiers de métriques d'un worker terminé."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+class PTSServer(BaseApplication):
+    """
+    Serveur de production: précharge le modèle dans le maître puis forke N workers.
+
+    Les workers (uvicorn) héritent du modèle et de ses index en copy-on-write.
+    """
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def load(self) -> Any:
+        from pts.api.server import app
+        from pts.api.state import freeze_for_fork, load_model_state
+
+        load_model_state()
+        freeze_for_fork()
+        return app
+
+
+def prepare_multiprocess_metrics(metrics_dir: str) -> None:
+    """
+    Active le mode multi-processus de prometheus_client.
+
+    Doit être appelé avant le premier import de prometheus_client: le type de
+    stockage des valeurs est choisi à l'import.
+    """
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+def main() -> None:
+    """Point d'entrée principal du serveur API multi-workers."""
+    setup_logging(level=os.getenv("LOG_LEVEL", "INFO"))
+    parser = argparse.ArgumentParser(
+        description="Serveur de production de l'API PTS (gunicorn + workers uvicorn)."
+    )
+    parser.add_argument("--host", type=str, default="0.0.0.0", help="Adresse d'écoute.")
+    parser.add_argument("--port", type=int, default=8000, help="Port d'écoute.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("PTS_WORKERS", multiprocessing.cpu_count())),
+        help="Nombre de workers (par défaut: $PTS_WORKERS ou nombre de CPU).",
+    )
+    parser.add_argument(
+        "--model-path",
+        type=str,
+        default=None,
+        help="Chemin du modèle à précharger (par défaut: $PTS_MODEL_PATH).",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        type=str,
+        default=os.getenv("PROMETHEUS_MULTIPROC_DIR", "/tmp/pts_prometheus"),
+        help="Répertoire partagé des métriques Prometheus multi-processus.",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=30,
+        help="Délai (s) laissé aux workers pour terminer leurs requêtes.",
+    )
+    args = parser.parse_args()
+
+    if args.model_path:
+        os.environ["PTS_MODEL_PATH"] = args.model_path
+    prepare_multiprocess_metrics(args.metrics_dir)
+
+    options = {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "graceful_timeout": args.graceful_timeout,
+        "on_starting": on_starting,
+        "on_reload": on_reload,
+        "child_exit": child_exit,
+    }
+    logger.info(f"Serveur PTS sur {options['bind']} ({args.workers} workers).")
+    PTSServer(options).run()
+
+
+if __name__ == "__main__":
+    main()
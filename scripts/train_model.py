@@ -1,33 +1,18 @@
 import argparse
 import os
 import sys
-import yaml
 import pandas as pd
 from loguru import logger
 
+from pts.core.external_memory import parquet_files
 from pts.core.trainer import ModelTrainer
+from pts.utils.config import ConfigError, load_config
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="train_script")
 
 
-def load_config(config_path: str) -> dict:
-    """Charge le fichier de configuration YAML."""
-    try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
-        logger.info(f"Configuration chargée depuis: {config_path}")
-        return config
-    except FileNotFoundError:
-        logger.error(f"Fichier de configuration non trouvé: {config_path}")
-        sys.exit(1)
-    except yaml.YAMLError as e:
-        logger.error(f"Erreur de parsing YAML: {e}")
-        sys.exit(1)
-
-
 def load_data(data_path: str) -> pd.DataFrame:
     """Charge les données d'entraînement."""
     try:
@@ -44,6 +29,7 @@ def load_data(data_path: str) -> pd.DataFrame:
 
 def main() -> None:
     """Point d'entrée principal pour l'entraînement du modèle."""
+    setup_logging()
     parser = argparse.ArgumentParser(
         description="Script d'entraînement du modèle de sélection prédictive des tests."
     )
@@ -65,10 +51,60 @@ def main() -> None:
         default="models/latest_model.json",
         help="Chemin pour sauvegarder le modèle entraîné.",
     )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Recherche les hyperparamètres (section 'search' de la configuration) au lieu d'utiliser model_params.",
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=None,
+        help="Nombre d'essais de la recherche (remplace search.n_trials).",
+    )
+    parser.add_argument(
+        "--sampler",
+        choices=["random", "tpe"],
+        default=None,
+        help="Stratégie d'échantillonnage de la recherche (remplace search.sampler).",
+    )
+    parser.add_argument(
+        "--parquet",
+        type=str,
+        default=None,
+        help="Répertoire ou motif de fichiers Parquet: entraînement en mémoire externe (section 'external_memory').",
+    )
+    parser.add_argument(
+        "--init-model",
+        type=str,
+        default=None,
+        help="Modèle à poursuivre (avec --parquet), ex: models/latest_model.json.",
+    )
+    parser.add_argument(
+        "--newest",
+        type=int,
+        default=None,
+        help="Avec --parquet: n'utiliser que les N dernières partitions (poursuite sur les données récentes).",
+    )
     args = parser.parse_args()
 
     # 1. Charger la configuration
-    config = load_config(args.config)
+    try:
+        config = load_config(args.config).to_dict()
+    except ConfigError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    if args.parquet:
+        trainer = ModelTrainer(config=config)
+        try:
+            trainer.train_external(parquet_files(args.parquet, newest=args.newest), init_model=args.init_model)
+            trainer.save_model(args.output)
+            logger.success(f"Pipeline d'entraînement terminé. Modèle sauvegardé dans {args.output}")
+        except Exception as e:
+            logger.error(f"Échec de l'entraînement en mémoire externe: {e}")
+            sys.exit(1)
+        return
 
     # 2. Charger les données (Simulation: Création de données factices si le fichier n'existe pas)
     try:
@@ -86,7 +122,11 @@ def main() -> None:
     # 3. Entraîner le modèle
     trainer = ModelTrainer(config=config)
     try:
-        trainer.train(data_df)
+        if args.search:
+            overrides = {"n_trials": args.trials, "sampler": args.sampler}
+            trainer.search(data_df, {k: v for k, v in overrides.items() if v is not None})
+        else:
+            trainer.train(data_df)
         # 4. Sauvegarder le modèle
         os.makedirs(os.path.dirname(args.output), exist_ok=True)
         trainer.save_model(args.output)
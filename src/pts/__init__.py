@@ -5,7 +5,12 @@ Enterprise-Grade CI/CD Optimization with Machine Learning
 
 __version__ = "0.1.0"
 
-from . import api, core, data, features, integrations, utils
+from typing import TYPE_CHECKING
+
+from .utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from . import api, core, data, features, integrations, pipeline, utils
 
 __all__ = [
     "api",
@@ -13,5 +18,9 @@ __all__ = [
     "data",
     "features",
     "integrations",
+    "pipeline",
     "utils",
 ]
+
+# Les sous-packages sont importés au premier accès (PEP 562)
+__getattr__, __dir__ = lazy_exports(__name__, {name: "" for name in __all__})
@@ -1,3 +1,10 @@
-from .server import app
+from typing import TYPE_CHECKING
+
+from pts.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .server import app
 
 __all__ = ["app"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {"app": ".server"})
@@ -0,0 +1,242 @@
+import hashlib
+import hmac
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from loguru import logger
+
+from pts.api.models import IngestionStatus, WebhookAck
+from pts.data.events import (
+    GITHUB_PUSH,
+    GITLAB_PUSH,
+    JENKINS_BUILD,
+    EventProcessor,
+    IngestionWorker,
+    jenkins_from_env,
+)
+from pts.data.queue import DurableQueue
+from pts.data.store import DataStore
+
+logger.disable("pts")
+logger = logger.bind(name="api_ingestion")
+
+router = APIRouter()
+
+# Phases de la notification Jenkins après lesquelles le rapport de tests est disponible
+JENKINS_DONE_PHASES = ("COMPLETED", "FINALIZED")
+
+# Secret ou jeton partagé de chaque webhook: sans lui, le webhook refuse toute requête
+WEBHOOK_SECRETS = {
+    "github": "PTS_GITHUB_WEBHOOK_SECRET",
+    "gitlab": "PTS_GITLAB_WEBHOOK_TOKEN",
+    "jenkins": "PTS_JENKINS_WEBHOOK_TOKEN",
+}
+
+_QUEUE: Optional[DurableQueue] = None
+_STORE: Optional[DataStore] = None
+_WORKERS: List[IngestionWorker] = []
+_LOCK = threading.Lock()
+
+
+def ingestion_dir() -> str:
+    """Répertoire de la file et du stockage d'ingestion ($PTS_INGESTION_DIR)."""
+    return os.getenv("PTS_INGESTION_DIR", "data/ingestion")
+
+
+def get_ingestion_queue() -> DurableQueue:
+    """Fournit la file d'ingestion du processus (ouverte au premier appel)."""
+    global _QUEUE
+    if _QUEUE is None:
+        with _LOCK:
+            if _QUEUE is None:
+                _QUEUE = DurableQueue(os.path.join(ingestion_dir(), "queue.sqlite"))
+    return _QUEUE
+
+
+def get_data_store() -> DataStore:
+    """Fournit le stockage alimenté par l'ingestion (ouvert au premier appel)."""
+    global _STORE
+    if _STORE is None:
+        with _LOCK:
+            if _STORE is None:
+                _STORE = DataStore(os.path.join(ingestion_dir(), "store.sqlite"))
+    return _STORE
+
+
+def start_ingestion_workers(count: Optional[int] = None) -> List[IngestionWorker]:
+    """
+    Démarre les workers d'ingestion de ce processus.
+
+    Doit être appelé après le fork (événement de démarrage de l'application):
+    les threads ne survivent pas à un fork.
+
+    Args:
+        count: Nombre de threads (par défaut: $PTS_INGESTION_WORKERS ou 1).
+
+    Returns:
+        Les workers démarrés.
+    """
+    if count is None:
+        count = int(os.getenv("PTS_INGESTION_WORKERS", "1"))
+    missing = unconfigured_webhooks()
+    if missing:
+        logger.warning(
+            f"Webhooks désactivés faute de secret ({', '.join(missing)}): "
+            f"définir {', '.join(WEBHOOK_SECRETS[name] for name in missing)}."
+        )
+    processor = EventProcessor(get_data_store(), jenkins=jenkins_from_env())
+    with _LOCK:
+        for _ in range(count):
+            worker = IngestionWorker(get_ingestion_queue(), processor)
+            worker.start()
+            _WORKERS.append(worker)
+    logger.info(f"{count} worker(s) d'ingestion démarré(s).")
+    return list(_WORKERS)
+
+
+def stop_ingestion_workers() -> None:
+    """Arrête les workers d'ingestion de ce processus."""
+    with _LOCK:
+        workers = list(_WORKERS)
+        _WORKERS.clear()
+    for worker in workers:
+        worker.stop()
+
+
+def unconfigured_webhooks() -> List[str]:
+    """Webhooks dont le secret n'est pas défini (ils rejettent toutes les requêtes)."""
+    return [name for name, variable in WEBHOOK_SECRETS.items() if not os.getenv(variable)]
+
+
+def webhook_secret(name: str) -> str:
+    """
+    Secret partagé d'un webhook.
+
+    Raises:
+        HTTPException: 503 si le secret n'est pas défini: un webhook non configuré
+            n'accepte aucune écriture non authentifiée.
+    """
+    secret = os.getenv(WEBHOOK_SECRETS[name])
+    if not secret:
+        raise HTTPException(status_code=503, detail=f"Webhook non configuré: {WEBHOOK_SECRETS[name]} non défini.")
+    return secret
+
+
+def verify_github_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Vérifie l'en-tête `X-Hub-Signature-256` d'un webhook GitHub.
+
+    Args:
+        body: Corps brut de la requête.
+        signature: Valeur de l'en-tête ("sha256=<hex>").
+        secret: Secret partagé du webhook.
+    """
+    if not signature:
+        return False
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def verify_token(value: Optional[str], expected: str) -> bool:
+    """Vérifie un jeton partagé (GitLab, Jenkins)."""
+    return value is not None and hmac.compare_digest(value, expected)
+
+
+def parse_payload(body: bytes) -> Dict[str, Any]:
+    """Décode le corps JSON d'un webhook."""
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Corps JSON invalide.")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Objet JSON attendu.")
+    return payload
+
+
+async def enqueue(queue: DurableQueue, kind: str, payload: Dict[str, Any]) -> ORJSONResponse:
+    """Place l'événement en file et l'acquitte aussitôt (202)."""
+    job_id = await run_in_threadpool(queue.put, kind, payload)
+    logger.debug("Événement {} placé en file (tâche {})", kind, job_id)
+    return ORJSONResponse({"status": "queued", "job_id": job_id}, status_code=202)
+
+
+def ignored() -> ORJSONResponse:
+    """Acquitte un événement qui ne concerne pas l'ingestion."""
+    return ORJSONResponse({"status": "ignored", "job_id": None}, status_code=202)
+
+
+@router.post("/webhooks/github", response_model=WebhookAck, status_code=202, response_class=ORJSONResponse)
+async def github_webhook(
+    request: Request,
+    x_github_event: str = Header(""),
+    x_hub_signature_256: Optional[str] = Header(None),
+    queue: DurableQueue = Depends(get_ingestion_queue),
+) -> ORJSONResponse:
+    """
+    Reçoit les webhooks GitHub (événement `push`).
+
+    La signature est vérifiée avec $PTS_GITHUB_WEBHOOK_SECRET (503 s'il n'est pas défini).
+    """
+    secret = webhook_secret("github")
+    body = await request.body()
+    if not verify_github_signature(body, x_hub_signature_256, secret):
+        raise HTTPException(status_code=401, detail="Signature invalide.")
+    if x_github_event == "ping":
+        return ORJSONResponse({"status": "ok", "job_id": None}, status_code=200)
+    if x_github_event != "push":
+        return ignored()
+    return await enqueue(queue, GITHUB_PUSH, parse_payload(body))
+
+
+@router.post("/webhooks/gitlab", response_model=WebhookAck, status_code=202, response_class=ORJSONResponse)
+async def gitlab_webhook(
+    request: Request,
+    x_gitlab_event: str = Header(""),
+    x_gitlab_token: Optional[str] = Header(None),
+    queue: DurableQueue = Depends(get_ingestion_queue),
+) -> ORJSONResponse:
+    """
+    Reçoit les webhooks GitLab (événement `Push Hook`).
+
+    Le jeton est vérifié avec $PTS_GITLAB_WEBHOOK_TOKEN (503 s'il n'est pas défini).
+    """
+    if not verify_token(x_gitlab_token, webhook_secret("gitlab")):
+        raise HTTPException(status_code=401, detail="Jeton invalide.")
+    if x_gitlab_event != "Push Hook":
+        return ignored()
+    return await enqueue(queue, GITLAB_PUSH, parse_payload(await request.body()))
+
+
+@router.post("/webhooks/jenkins", response_model=WebhookAck, status_code=202, response_class=ORJSONResponse)
+async def jenkins_webhook(
+    request: Request,
+    x_pts_token: Optional[str] = Header(None),
+    queue: DurableQueue = Depends(get_ingestion_queue),
+) -> ORJSONResponse:
+    """
+    Reçoit les notifications de fin de construction Jenkins (plugin Notification).
+
+    Le jeton `X-PTS-Token` est vérifié avec $PTS_JENKINS_WEBHOOK_TOKEN (503 s'il n'est pas défini).
+    """
+    if not verify_token(x_pts_token, webhook_secret("jenkins")):
+        raise HTTPException(status_code=401, detail="Jeton invalide.")
+    payload = parse_payload(await request.body())
+    build = payload.get("build") or {}
+    if build.get("phase") not in JENKINS_DONE_PHASES:
+        return ignored()
+    if not payload.get("name") or "number" not in build:
+        raise HTTPException(status_code=400, detail="Champs 'name' et 'build.number' requis.")
+    return await enqueue(queue, JENKINS_BUILD, payload)
+
+
+@router.get("/ingestion/status", response_model=IngestionStatus, response_class=ORJSONResponse)
+def ingestion_status(queue: DurableQueue = Depends(get_ingestion_queue)) -> ORJSONResponse:
+    """
+    Retourne l'état de la file d'ingestion.
+    """
+    return ORJSONResponse({**queue.counts(), "workers": len(_WORKERS)})
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PredictionRequest(BaseModel):
@@ -27,7 +27,12 @@ class PredictionRequest(BaseModel):
 class PredictionResponse(BaseModel):
     """
     Modèle de réponse pour la prédiction de tests.
+
+    Utilisé pour le schéma OpenAPI; les routes renvoient directement le
+    contenu sérialisé par orjson sans instancier ce modèle.
     """
+    model_config = ConfigDict(protected_namespaces=())
+
     selected_tests: List[str] = Field(
         ...,
         description="Liste des identifiants des tests recommandés pour l'exécution.",
@@ -49,6 +54,26 @@ class HealthCheckResponse(BaseModel):
     """
     Modèle de réponse pour le statut de santé de l'API.
     """
+    model_config = ConfigDict(protected_namespaces=())
+
     status: str = Field(..., example="ok")
     version: str = Field(..., example="0.1.0")
     model_status: str = Field(..., example="loaded")
+
+
+class WebhookAck(BaseModel):
+    """
+    Accusé de réception d'un webhook (l'événement est traité en arrière-plan).
+    """
+    status: str = Field(..., description="queued, ignored ou ok (ping).", example="queued")
+    job_id: Optional[int] = Field(None, description="Identifiant de la tâche d'ingestion.", example=42)
+
+
+class IngestionStatus(BaseModel):
+    """
+    État de la file d'ingestion.
+    """
+    pending: int = Field(..., example=0)
+    processing: int = Field(..., example=1)
+    dead: int = Field(..., example=0)
+    workers: int = Field(..., example=1)
@@ -1,53 +1,82 @@
 import time
-from typing import List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
-from pts.api.models import PredictionRequest, PredictionResponse
+from pts.api.models import (
+    HealthCheckResponse,
+    PredictionRequest,
+    PredictionResponse,
+)
+from pts.api.state import get_model_state
 from pts.core.predictor import PredictiveTestSelector
 from pts.utils import (
-    setup_logging,
     get_prometheus_metrics,
     observe_prediction_latency,
+    profiling,
+    time_stage,
 )
+from pts.utils.logger import sampled
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="api_routes")
 
 router = APIRouter()
 
-# Dépendance pour le sélecteur de tests (simulé)
+# Réponse de santé statique: sérialisée une seule fois au chargement du module
+HEALTH_PAYLOAD: Dict[str, Any] = {
+    "status": "ok",
+    "version": "0.1.0",
+    "model_status": "loaded",
+}
+
+# Dépendance pour le sélecteur de tests
 def get_test_selector() -> PredictiveTestSelector:
-    """Fournit une instance du sélecteur de tests."""
-    # Dans un cas réel, le modèle serait chargé ici
-    return PredictiveTestSelector(threshold=0.6)
+    """Fournit le sélecteur de tests partagé (chargé une fois par processus)."""
+    return get_model_state()
 
 
-@router.post("/predict", response_model=PredictionResponse)
-async def predict_tests(
-    request: PredictionRequest, selector: PredictiveTestSelector = Depends(get_test_selector)
-) -> PredictionResponse:
+def run_prediction(
+    request: PredictionRequest, selector: PredictiveTestSelector
+) -> Dict[str, Any]:
     """
-    Endpoint pour prédire les tests pertinents à exécuter.
+    Exécute la prédiction et construit le contenu brut de la réponse.
+
+    Le contenu respecte le schéma de `PredictionResponse` mais n'est pas
+    revalidé par Pydantic: seules les entrées de l'API sont validées.
+
+    Args:
+        request: Requête de prédiction validée.
+        selector: Sélecteur de tests à utiliser.
+
+    Returns:
+        Dictionnaire prêt à être sérialisé en JSON.
     """
     start_time = time.time()
-    logger.info(f"Requête de prédiction reçue pour le commit: {request.commit_hash}")
+    log_request = sampled("api.predict")
+    if log_request:
+        logger.info(
+            "Requête de prédiction reçue pour le commit: {}", request.commit_hash
+        )
 
     # 1. Extraction des caractéristiques (simulée)
     # Dans un cas réel, on utiliserait les données de la requête (commit_hash, changed_files)
     # pour extraire les caractéristiques pertinentes (churn, historique d'échec, etc.)
     try:
-        # Création d'un DataFrame de caractéristiques factices pour la démonstration
-        features_data = {
-            "test_id": [f"test_{i}" for i in range(10)],
-            "feature_churn": [10, 50, 20, 100, 5, 15, 30, 60, 25, 40],
-            "feature_history": [0.1, 0.5, 0.2, 0.9, 0.05, 0.15, 0.3, 0.6, 0.25, 0.4],
-            "feature_complexity": [2, 5, 1, 8, 1, 3, 2, 6, 4, 3],
-        }
-        features_df = pd.DataFrame(features_data)
+        with time_stage("feature_assembly"):
+            # DataFrame de caractéristiques factices pour la démonstration
+            features_data = {
+                "test_id": [f"test_{i}" for i in range(10)],
+                "feature_churn": [10, 50, 20, 100, 5, 15, 30, 60, 25, 40],
+                "feature_history": [
+                    0.1, 0.5, 0.2, 0.9, 0.05, 0.15, 0.3, 0.6, 0.25, 0.4
+                ],
+                "feature_complexity": [2, 5, 1, 8, 1, 3, 2, 6, 4, 3],
+            }
+            features_df = pd.DataFrame(features_data)
     except Exception as e:
         logger.error(f"Erreur lors de l'extraction des caractéristiques: {e}")
         raise HTTPException(status_code=500, detail="Erreur interne lors de la préparation des données.")
@@ -59,16 +88,50 @@ async def predict_tests(
     prediction_time_ms = (end_time - start_time) * 1000
     observe_prediction_latency(end_time - start_time)
 
-    logger.info(f"Prédiction terminée en {prediction_time_ms:.2f} ms. {len(selected_tests)} tests sélectionnés.")
+    if log_request:
+        logger.info(
+            "Prédiction terminée en {:.2f} ms. {} tests sélectionnés.",
+            prediction_time_ms,
+            len(selected_tests),
+        )
 
-    return PredictionResponse(
-        selected_tests=selected_tests,
-        prediction_time_ms=prediction_time_ms,
-        model_version="xgboost-v1.0",  # Version du modèle à récupérer dynamiquement
-    )
+    return {
+        "selected_tests": selected_tests,
+        "prediction_time_ms": prediction_time_ms,
+        "model_version": "xgboost-v1.0",  # À lire dans le modèle chargé
+    }
 
 
-from fastapi import Response
+@router.post(
+    "/predict", response_model=PredictionResponse, response_class=ORJSONResponse
+)
+async def predict_tests(
+    request: PredictionRequest,
+    selector: PredictiveTestSelector = Depends(get_test_selector),
+    profile: Optional[str] = Query(None, include_in_schema=False),
+) -> ORJSONResponse:
+    """
+    Endpoint pour prédire les tests pertinents à exécuter.
+
+    `response_model` ne sert qu'au schéma OpenAPI: la réponse est renvoyée
+    directement via orjson, sans revalidation ni `jsonable_encoder`.
+
+    Avec PTS_PROFILE_QUERY=1, `?profile=cprofile|sample` profile cette requête;
+    le répertoire du profil est renvoyé dans l'en-tête `X-PTS-Profile`.
+    """
+    if profile and profiling.PROFILE_QUERY_ENABLED:
+        if profile not in profiling.PROFILE_MODES:
+            raise HTTPException(
+                status_code=400, detail=f"Mode de profilage inconnu: {profile}"
+            )
+        with profiling.profile_run("predict", profile) as directory:
+            content = run_prediction(request, selector)
+        return ORJSONResponse(content=content, headers={"X-PTS-Profile": directory})
+
+    content = run_prediction(request, selector)
+    with time_stage("serialization"):
+        return ORJSONResponse(content=content)
+
 
 @router.get("/metrics")
 async def get_metrics():
@@ -77,9 +140,11 @@ async def get_metrics():
     """
     return Response(content=get_prometheus_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
     
-@router.get("/health")
-async def health_check() -> dict:
+@router.get(
+    "/health", response_model=HealthCheckResponse, response_class=ORJSONResponse
+)
+async def health_check() -> ORJSONResponse:
     """
     Endpoint de vérification de l'état de santé de l'API.
     """
-    return {"status": "ok", "version": "0.1.0", "model_status": "loaded"}
+    return ORJSONResponse(content=HEALTH_PAYLOAD)
@@ -1,11 +1,17 @@
+import os
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
+from pts.api.ingestion import router as ingestion_router
+from pts.api.ingestion import start_ingestion_workers, stop_ingestion_workers
 from pts.api.routes import router as api_router
+from pts.api.state import get_model_state
 from pts.utils.logger import setup_logging
 
-# Configuration de la journalisation
-setup_logging(level="INFO")
+# Configuration de la journalisation (point d'entrée du worker API)
+setup_logging(level=os.getenv("LOG_LEVEL", "INFO"))
 logger.disable("pts")
 logger = logger.bind(name="api_server")
 
@@ -14,10 +20,12 @@ app = FastAPI(
     title="Predictive Test Selection API",
     description="API pour la sélection prédictive des tests basée sur le Machine Learning.",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Inclusion des routes
 app.include_router(api_router, prefix="/api/v1", tags=["prediction"])
+app.include_router(ingestion_router, prefix="/api/v1", tags=["ingestion"])
 
 
 @app.on_event("startup")
@@ -26,8 +34,13 @@ async def startup_event() -> None:
     Événement de démarrage de l'application.
     """
     logger.info("Démarrage de l'API PTS...")
-    # Ici, on pourrait charger le modèle ML en mémoire
-    # load_model_to_memory()
+    # Déjà chargé dans le processus maître en mode multi-workers (scripts/serve.py)
+    get_model_state()
+    # Ingestion des webhooks (PTS_INGESTION_ENABLED=1, désactivée par défaut): les
+    # threads démarrent dans chaque worker, après le fork, et utilisent $PTS_INGESTION_DIR.
+    # Sans workers, les webhooks reçus restent dans la file jusqu'à leur activation.
+    if os.getenv("PTS_INGESTION_ENABLED", "0") != "0":
+        start_ingestion_workers()
     logger.info("API PTS prête à servir les requêtes.")
 
 
@@ -36,6 +49,7 @@ def shutdown_event() -> None:
     """
     Événement d'arrêt de l'application.
     """
+    stop_ingestion_workers()
     logger.info("Arrêt de l'API PTS.")
 
 
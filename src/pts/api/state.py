@@ -0,0 +1,117 @@
+import gc
+import os
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+
+from pts.core.predictor import PredictiveTestSelector
+from pts.utils.config import DEFAULT_CONFIG_PATH, ConfigError, PTSConfig, load_config
+
+logger.disable("pts")
+logger = logger.bind(name="api_state")
+
+# Sélecteur partagé par toutes les requêtes d'un processus. Lorsqu'il est
+# préchargé dans le processus maître, les workers forkés le partagent en
+# copy-on-write au lieu de charger chacun leur propre copie du modèle.
+_SELECTOR: Optional[PredictiveTestSelector] = None
+
+# Configuration suivie: lorsque le modèle et le seuil en proviennent, une
+# modification de model_save_path ou de selection_threshold (fichier vérifié au
+# plus toutes les CONFIG_CHECK_INTERVAL secondes) recharge le sélecteur. Une configuration invalide est refusée au
+# démarrage, et ignorée (version précédente conservée) lors d'un rechargement.
+CONFIG_PATH = os.getenv("PTS_CONFIG", DEFAULT_CONFIG_PATH)
+CONFIG_CHECK_INTERVAL = float(os.getenv("PTS_CONFIG_CHECK_INTERVAL", "5"))
+_CONFIG: Optional[PTSConfig] = None
+_NEXT_CHECK = 0.0
+_RELOAD_LOCK = threading.Lock()
+
+
+def load_model_state(
+    model_path: Optional[str] = None, threshold: Optional[float] = None
+) -> PredictiveTestSelector:
+    """
+    Charge (ou recharge) le modèle et ses index en mémoire.
+
+    Args:
+        model_path: Chemin du modèle (par défaut: $PTS_MODEL_PATH, puis model_save_path
+            de la configuration $PTS_CONFIG).
+        threshold: Seuil de sélection (par défaut: $PTS_SELECTION_THRESHOLD, puis
+            selection_threshold de la configuration).
+
+    Raises:
+        ConfigError: Configuration invalide.
+
+    Returns:
+        Le sélecteur de tests partagé.
+    """
+    global _SELECTOR, _CONFIG, _NEXT_CHECK
+
+    # Priorité: arguments, variables PTS_MODEL_PATH / PTS_SELECTION_THRESHOLD, configuration
+    model_path = model_path or os.getenv("PTS_MODEL_PATH")
+    if threshold is None and os.getenv("PTS_SELECTION_THRESHOLD"):
+        threshold = float(os.environ["PTS_SELECTION_THRESHOLD"])
+    config = None
+    if (model_path is None or threshold is None) and os.path.exists(CONFIG_PATH):
+        config = load_config(CONFIG_PATH)  # ConfigError: échec immédiat
+    model_path = model_path or (config.model_save_path if config else "models/latest_model.json")
+    if threshold is None:
+        threshold = config.selection_threshold if config else 0.6
+
+    _SELECTOR = PredictiveTestSelector(threshold=threshold, model_path=model_path)
+    _CONFIG = config
+    _NEXT_CHECK = time.monotonic() + CONFIG_CHECK_INTERVAL
+    logger.info(f"Modèle chargé en mémoire depuis {model_path} (seuil: {threshold}).")
+    return _SELECTOR
+
+
+def _reload_if_config_changed() -> None:
+    """Recharge le sélecteur si le modèle ou le seuil de sa configuration ont changé."""
+    global _NEXT_CHECK, _CONFIG
+
+    if not _RELOAD_LOCK.acquire(blocking=False):
+        return  # Vérification déjà en cours dans un autre thread
+    try:
+        _NEXT_CHECK = time.monotonic() + CONFIG_CHECK_INTERVAL
+        try:
+            config = load_config(CONFIG_PATH)
+        except ConfigError as e:
+            logger.error(f"Nouvelle configuration ignorée: {e}")
+            return
+        if config is _CONFIG:
+            return
+        # Les autres sections (entraînement, rejeu...) ne concernent pas le sélecteur
+        if (config.model_save_path, config.selection_threshold) == (
+            _CONFIG.model_save_path, _CONFIG.selection_threshold
+        ):
+            _CONFIG = config
+            return
+        logger.info(f"Configuration modifiée ({CONFIG_PATH}): rechargement du modèle.")
+        load_model_state()
+    finally:
+        _RELOAD_LOCK.release()
+
+
+def get_model_state() -> PredictiveTestSelector:
+    """
+    Retourne le sélecteur partagé, en le chargeant au premier appel si nécessaire
+    et en le rechargeant si sa configuration a changé.
+    """
+    if _SELECTOR is None:
+        return load_model_state()
+    if _CONFIG is not None and time.monotonic() >= _NEXT_CHECK:
+        _reload_if_config_changed()
+    return _SELECTOR
+
+
+def freeze_for_fork() -> None:
+    """
+    Prépare le processus maître avant le fork des workers.
+
+    Les objets survivants sont déplacés dans la génération permanente du
+    ramasse-miettes: les collectes des workers ne les parcourent plus, ce qui
+    évite de toucher (et donc de dupliquer) les pages mémoire partagées.
+    """
+    gc.collect()
+    gc.freeze()
@@ -1,5 +1,19 @@
-from .predictor import PredictiveTestSelector
-from .trainer import ModelTrainer
-from .evaluator import ModelEvaluator
+from typing import TYPE_CHECKING
+
+from pts.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .predictor import PredictiveTestSelector
+    from .trainer import ModelTrainer
+    from .evaluator import ModelEvaluator
 
 __all__ = ["PredictiveTestSelector", "ModelTrainer", "ModelEvaluator"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "PredictiveTestSelector": ".predictor",
+        "ModelTrainer": ".trainer",
+        "ModelEvaluator": ".evaluator",
+    },
+)
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from xgboost import XGBClassifier
+
+from pts.core.evaluator import ModelEvaluator
+from pts.core.tuning import partition_cores
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="backtest")
+
+# Colonnes qui identifient une ligne sans en être des caractéristiques
+ID_COLUMNS = ("test_id", "commit_hash", "commit_id")
+
+
+class Window(NamedTuple):
+    """Fenêtre de backtest: entraînement sur [train_start, test_start), test sur [test_start, test_end)."""
+
+    index: int
+    train_start: pd.Timestamp
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp
+
+
+def time_windows(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    train_period: str,
+    test_period: str,
+    step: Optional[str] = None,
+    expanding: bool = False,
+) -> List[Window]:
+    """
+    Découpe l'intervalle [start, end] en fenêtres d'entraînement et de test successives.
+
+    Args:
+        start: Date du premier commit.
+        end: Date du dernier commit.
+        train_period: Durée d'entraînement (ex: "28D"); durée minimale en mode expanding.
+        test_period: Durée de test (ex: "7D").
+        step: Décalage entre deux fenêtres (par défaut: test_period).
+        expanding: Si vrai, l'entraînement commence toujours à `start` (fenêtre croissante).
+
+    Returns:
+        Les fenêtres dont la période de test commence avant `end`.
+    """
+    train, test = pd.Timedelta(train_period), pd.Timedelta(test_period)
+    shift = pd.Timedelta(step) if step else test
+    windows = []
+    test_start = start + train
+    while test_start <= end:
+        train_start = start if expanding else test_start - train
+        windows.append(Window(len(windows), train_start, test_start, test_start + test))
+        test_start += shift
+    return windows
+
+
+class PartitionCache:
+    """
+    Matrices de caractéristiques partitionnées par période, stockées en `.npy`.
+
+    Chaque période n'est convertie qu'une fois (float32 pour X, int8 pour y);
+    les fenêtres qui la contiennent relisent la même partition par memory-map,
+    dans le processus principal comme dans les workers. Le répertoire est
+    indexé par l'empreinte des données: une nouvelle exécution sur les mêmes
+    données réutilise les partitions existantes.
+    """
+
+    def __init__(self, directory: str, origin: pd.Timestamp, period: pd.Timedelta) -> None:
+        """
+        Args:
+            directory: Répertoire des partitions de ce jeu de données.
+            origin: Début de la première partition.
+            period: Durée d'une partition.
+        """
+        self.directory = directory
+        self.origin = origin
+        self.period = period
+        self.manifest: Dict[str, Any] = {}
+
+    @staticmethod
+    def fingerprint(data_df: pd.DataFrame, date_column: str, period: pd.Timedelta) -> str:
+        """Empreinte du contenu des données et du découpage."""
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(data_df, index=False).values.tobytes())
+        digest.update(json.dumps([list(map(str, data_df.columns)), date_column, str(period)]).encode())
+        return digest.hexdigest()[:16]
+
+    def partition_of(self, timestamp: pd.Timestamp) -> int:
+        """Numéro de la partition contenant une date."""
+        return int((timestamp - self.origin) // self.period)
+
+    def partitions(self, start: pd.Timestamp, end: pd.Timestamp) -> List[int]:
+        """Partitions non vides couvrant [start, end)."""
+        first, last = self.partition_of(start), self.partition_of(end - pd.Timedelta(1, "ns"))
+        return [k for k in range(first, last + 1) if self.manifest["rows"].get(str(k), 0)]
+
+    def build(self, data_df: pd.DataFrame, dates: pd.Series, features: List[str], target: str) -> bool:
+        """
+        Écrit les partitions absentes du répertoire.
+
+        Returns:
+            True si les partitions ont été (re)construites, False si elles étaient déjà en cache.
+        """
+        manifest_path = os.path.join(self.directory, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        keys = ((dates - self.origin) // self.period).to_numpy()
+        X = data_df[features].to_numpy(dtype=np.float32)
+        y = data_df[target].to_numpy(dtype=np.int8)
+        rows = {}
+        for key in np.unique(keys):
+            mask = keys == key
+            np.save(os.path.join(self.directory, f"X-{key}.npy"), X[mask])
+            np.save(os.path.join(self.directory, f"y-{key}.npy"), y[mask])
+            rows[str(key)] = int(mask.sum())
+
+        self.manifest = {"features": features, "rows": rows}
+        # Le manifeste est écrit en dernier: un cache incomplet est reconstruit
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, manifest_path)
+        return True
+
+    @staticmethod
+    def load(directory: str, partitions: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Concatène les partitions demandées (X, y)."""
+        X = [np.load(os.path.join(directory, f"X-{k}.npy"), mmap_mode="r") for k in partitions]
+        y = [np.load(os.path.join(directory, f"y-{k}.npy"), mmap_mode="r") for k in partitions]
+        return np.concatenate(X), np.concatenate(y)
+
+
+def _run_window(
+    directory: str,
+    window: Window,
+    train_parts: List[int],
+    test_parts: List[int],
+    params: Dict[str, Any],
+    n_jobs: int,
+    threshold: float,
+) -> Dict[str, Any]:
+    """Entraîne le modèle d'une fenêtre et calcule ses métriques PTS sur la période de test."""
+    X_train, y_train = PartitionCache.load(directory, train_parts)
+    X_test, y_test = PartitionCache.load(directory, test_parts)
+
+    if len(np.unique(y_train)) < 2:
+        # Une seule classe observée: XGBoost refuse l'entraînement, on prédit le taux observé
+        probabilities = np.full(len(X_test), float(y_train.mean()))
+    else:
+        model = XGBClassifier(eval_metric="logloss", tree_method="hist", **{**params, "n_jobs": n_jobs})
+        model.fit(X_train, y_train)
+        probabilities = model.predict_proba(X_test)[:, 1]
+
+    rows = np.arange(len(X_test))
+    metrics = ModelEvaluator().calculate_pts_metrics(
+        pd.DataFrame({"test_id": rows, "failure_probability": probabilities}),
+        pd.DataFrame({"test_id": rows, "test_failed": y_test}),
+        selection_threshold=threshold,
+    )
+    return {
+        "window": window.index,
+        "train_start": window.train_start,
+        "test_start": window.test_start,
+        "test_end": window.test_end,
+        "n_train": len(X_train),
+        "n_test": len(X_test),
+        **{k: float(v) for k, v in metrics.items()},
+    }
+
+
+class Backtester:
+    """
+    Backtest temporel du modèle: pour chaque fenêtre, entraînement sur les
+    commits passés et mesure des métriques PTS (TRR, DDR) sur les commits suivants.
+
+    Les fenêtres sont entraînées en parallèle (processus), en répartissant les
+    cœurs entre fenêtres et threads XGBoost comme pour la recherche d'hyperparamètres.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        """
+        Args:
+            config: Configuration du modèle (model_params, target_column,
+                selection_threshold et section `backtest`).
+        """
+        section = config.get("backtest", {})
+        self.model_params = config.get("model_params", {})
+        self.target_column = config.get("target_column", "test_failed")
+        self.threshold = config.get("selection_threshold", 0.6)
+        self.date_column = section.get("date_column", "committed_date")
+        self.train_period = section.get("train_period", "28D")
+        self.test_period = section.get("test_period", "7D")
+        self.step = section.get("step") or self.test_period
+        self.expanding = bool(section.get("expanding", False))
+        self.cache_dir = section.get("cache_dir", "data/cache/backtest")
+        self.n_cores = section.get("n_cores")
+
+        # Les bornes des fenêtres doivent tomber sur des bornes de partitions
+        step = pd.Timedelta(self.step)
+        for name in ("train_period", "test_period"):
+            if pd.Timedelta(getattr(self, name)) % step:
+                raise ValueError(f"backtest.{name} doit être un multiple de backtest.step ({self.step})")
+
+    def features(self, data_df: pd.DataFrame) -> List[str]:
+        """Colonnes numériques utilisées comme caractéristiques."""
+        excluded = {self.target_column, self.date_column, *ID_COLUMNS}
+        return [c for c in data_df.select_dtypes(include=["number", "bool"]).columns if c not in excluded]
+
+    def run(self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Exécute le backtest.
+
+        Args:
+            data_df: Caractéristiques, colonne cible et date du commit de chaque ligne.
+
+        Returns:
+            Une ligne de métriques par fenêtre (dates, tailles, TRR, DDR, FPR...).
+        """
+        for column in (self.date_column, self.target_column):
+            if column not in data_df.columns:
+                raise ValueError(f"Colonne manquante pour le backtest: {column}")
+
+        dates = pd.to_datetime(data_df[self.date_column], utc=True)
+        start, end = dates.min(), dates.max()
+        windows = time_windows(start, end, self.train_period, self.test_period, self.step, self.expanding)
+        if not windows:
+            raise ValueError(
+                f"Historique trop court ({end - start}) pour une fenêtre d'entraînement de {self.train_period}."
+            )
+
+        step = pd.Timedelta(self.step)
+        directory = os.path.join(self.cache_dir, PartitionCache.fingerprint(data_df, self.date_column, step))
+        cache = PartitionCache(directory, start, step)
+        built = cache.build(data_df, dates, self.features(data_df), self.target_column)
+        logger.info(
+            f"Partitions {'construites' if built else 'réutilisées'}: {directory} "
+            f"({len(cache.manifest['rows'])} périodes de {self.step})."
+        )
+
+        jobs = []
+        for window in windows:
+            train_parts = cache.partitions(window.train_start, window.test_start)
+            test_parts = cache.partitions(window.test_start, window.test_end)
+            if not train_parts or not test_parts:
+                logger.warning(f"Fenêtre {window.index} ignorée: aucun commit d'entraînement ou de test.")
+                continue
+            jobs.append((window, train_parts, test_parts))
+
+        workers, threads = partition_cores(len(jobs), self.n_cores)
+        logger.info(f"Backtest: {len(jobs)} fenêtres, {workers} processus x {threads} threads XGBoost.")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_window, directory, window, train_parts, test_parts,
+                            self.model_params, threads, self.threshold)
+                for window, train_parts, test_parts in jobs
+            ]
+            results = pd.DataFrame([future.result() for future in futures])
+
+        if not results.empty:
+            logger.success(
+                f"Backtest terminé: TRR moyen {results['test_reduction_rate'].mean():.4f}, "
+                f"DDR moyen {results['defect_detection_rate'].mean():.4f}."
+            )
+        return results
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation sur des données simulées (90 jours de commits)
+    rng = np.random.default_rng(0)
+    n = 5000
+    sample_df = pd.DataFrame({
+        "test_id": [f"test_{i % 50}" for i in range(n)],
+        "committed_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.uniform(0, 90, n)), unit="D"),
+        "feature_churn": rng.random(n),
+        "feature_history": rng.random(n),
+    })
+    sample_df["test_failed"] = (sample_df["feature_churn"] + 0.3 * rng.random(n) > 0.9).astype(int)
+    backtester = Backtester({
+        "model_params": {"n_estimators": 50, "max_depth": 3},
+        "backtest": {"train_period": "28D", "test_period": "7D", "cache_dir": "/tmp/pts_backtest"},
+    })
+    print(backtester.run(sample_df))
@@ -0,0 +1,174 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="bootstrap")
+
+METRIC_NAMES = ("roc_auc", "recall", "test_reduction_rate", "defect_detection_rate")
+
+# Rééchantillonnages par tâche: le découpage (et donc les graines) ne dépend pas du nombre de processus
+CHUNK_SIZE = 50
+
+# Données partagées par les processus du bootstrap (voir _init_worker)
+_WORKER_DATA: Dict[str, Any] = {}
+
+
+def _prepare(codes: np.ndarray, probabilities: np.ndarray, failed: np.ndarray,
+             threshold: float, decision_threshold: float) -> Dict[str, Any]:
+    """
+    Pré-calcule les agrégats par commit et les rangs des positifs pour l'AUC.
+
+    Les métriques de comptage ne dépendent que des sommes par commit: un
+    rééchantillonnage se réduit à un produit (poids des commits) x (agrégats).
+    """
+    n_commits = int(codes.max()) + 1 if len(codes) else 0
+    selected = probabilities >= threshold
+    predicted = probabilities >= decision_threshold
+    counts = np.stack([
+        np.bincount(codes, minlength=n_commits),
+        np.bincount(codes, weights=selected, minlength=n_commits),
+        np.bincount(codes, weights=failed, minlength=n_commits),
+        np.bincount(codes, weights=selected & failed, minlength=n_commits),
+        np.bincount(codes, weights=predicted & failed, minlength=n_commits),
+    ], axis=1).astype(np.float64)
+
+    # AUC: pour chaque positif, nombre de négatifs de score inférieur et de score égal
+    # (ex aequo comptés pour moitié), repérés une fois pour toutes dans les négatifs triés
+    negative_order = np.argsort(np.where(failed, np.inf, probabilities), kind="stable")[: int((~failed).sum())]
+    negative_scores = probabilities[negative_order]
+    positive_scores = probabilities[failed]
+    return {
+        "counts": counts,
+        "negative_codes": codes[negative_order],
+        "positive_codes": codes[failed],
+        "below": np.searchsorted(negative_scores, positive_scores, side="left"),
+        "below_or_equal": np.searchsorted(negative_scores, positive_scores, side="right"),
+        "n_commits": n_commits,
+    }
+
+
+def _init_worker(data: Dict[str, Any]) -> None:
+    # Les tableaux sont transmis une seule fois par processus, pas à chaque tâche
+    _WORKER_DATA.update(data)
+
+
+def _weighted_auc(weights: np.ndarray, data: Dict[str, Any]) -> float:
+    """AUC ROC pondérée (poids par commit), par sommes cumulées des poids des négatifs triés."""
+    cumulative = np.concatenate(([0.0], np.cumsum(weights[data["negative_codes"]])))
+    positive = weights[data["positive_codes"]]
+    total_positive, total_negative = positive.sum(), cumulative[-1]
+    if total_positive == 0 or total_negative == 0:
+        return math.nan
+    negatives_below = 0.5 * (cumulative[data["below"]] + cumulative[data["below_or_equal"]])
+    return float(np.dot(positive, negatives_below) / (total_positive * total_negative))
+
+
+def _metrics_from_weights(weights: np.ndarray, data: Dict[str, Any]) -> np.ndarray:
+    """
+    Métriques (AUC, rappel, TRR, DDR) pour une matrice de poids de commits (B, C).
+
+    Returns:
+        Tableau (B, 4) dans l'ordre de METRIC_NAMES.
+    """
+    sums = weights @ data["counts"]
+    rows, selected, failed, detected, predicted_failed = sums.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        recall = np.where(failed > 0, predicted_failed / failed, np.nan)
+        trr = np.where(rows > 0, 1.0 - selected / rows, np.nan)
+        ddr = np.where(failed > 0, detected / failed, 1.0)
+    auc = np.array([_weighted_auc(w, data) for w in weights])
+    return np.column_stack([auc, recall, trr, ddr])
+
+
+def _run_chunk(seed: np.random.SeedSequence, n_resamples: int) -> np.ndarray:
+    """Tire `n_resamples` échantillons de commits avec remise et calcule leurs métriques."""
+    data = _WORKER_DATA
+    n_commits = data["n_commits"]
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_commits, size=(n_resamples, n_commits))
+    # Nombre de tirages de chaque commit, pour tous les échantillons en un seul bincount
+    offsets = (np.arange(n_resamples) * n_commits)[:, None]
+    weights = np.bincount((draws + offsets).ravel(), minlength=n_resamples * n_commits)
+    return _metrics_from_weights(weights.reshape(n_resamples, n_commits).astype(np.float64), data)
+
+
+def bootstrap_metrics(
+    commit_ids: Sequence,
+    probabilities: np.ndarray,
+    failed: np.ndarray,
+    threshold: float,
+    decision_threshold: float = 0.5,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 42,
+    n_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Intervalles de confiance bootstrap des métriques, en rééchantillonnant les commits.
+
+    Les exécutions d'un même commit sont corrélées: on tire des commits avec
+    remise (et toutes leurs exécutions), pas des lignes. Les résultats ne
+    dépendent que de `seed` et `n_resamples`, pas du nombre de processus.
+
+    Args:
+        commit_ids: Commit de chaque exécution.
+        probabilities: Probabilité d'échec prédite.
+        failed: Résultat réel (1 = échec).
+        threshold: Seuil de sélection (TRR, DDR).
+        decision_threshold: Seuil de classification (rappel).
+        n_resamples: Nombre d'échantillons bootstrap.
+        confidence: Niveau de confiance de l'intervalle (percentiles).
+        seed: Graine.
+        n_workers: Processus (par défaut: os.cpu_count()).
+
+    Returns:
+        DataFrame indexé par métrique: estimate, lower, upper, std.
+    """
+    codes = pd.factorize(np.asarray(commit_ids))[0]
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    failed = np.asarray(failed).astype(bool)
+    data = _prepare(codes, probabilities, failed, threshold, decision_threshold)
+
+    # Estimation ponctuelle: chaque commit une fois
+    estimate = _metrics_from_weights(np.ones((1, data["n_commits"])), data)[0]
+
+    sizes = [min(CHUNK_SIZE, n_resamples - start) for start in range(0, n_resamples, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    logger.info(f"Bootstrap: {n_resamples} échantillons de {data['n_commits']} commits ({len(sizes)} tâches).")
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(data,)) as pool:
+        results = np.concatenate(list(pool.map(_run_chunk, seeds, sizes)))
+
+    alpha = (1.0 - confidence) / 2.0
+    with np.errstate(invalid="ignore"):
+        lower, upper = np.nanquantile(results, [alpha, 1.0 - alpha], axis=0)
+        std = np.nanstd(results, axis=0)
+    return pd.DataFrame(
+        {"estimate": estimate, "lower": lower, "upper": upper, "std": std}, index=list(METRIC_NAMES)
+    )
+
+
+def interval_metrics(intervals: pd.DataFrame) -> Dict[str, float]:
+    """Aplatit les intervalles en clés `{métrique}_ci_lower` / `{métrique}_ci_upper`."""
+    flat: Dict[str, float] = {}
+    for metric, row in intervals.iterrows():
+        flat[f"{metric}_ci_lower"] = float(row["lower"])
+        flat[f"{metric}_ci_upper"] = float(row["upper"])
+    return flat
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: 200 000 exécutions sur 2 000 commits
+    rng = np.random.default_rng(0)
+    n = 200_000
+    commit_ids = rng.integers(0, 2000, n)
+    failed = rng.random(n) < 0.01
+    probabilities = np.clip(0.4 * failed + 0.6 * rng.random(n), 0, 1)
+    print(bootstrap_metrics(commit_ids, probabilities, failed, threshold=0.5, n_resamples=200))
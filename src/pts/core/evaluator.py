@@ -1,72 +1,164 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from loguru import logger
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    roc_auc_score,
-)
 from sklearn.base import BaseEstimator
 
+from pts.core.bootstrap import bootstrap_metrics
+from pts.core.commit_metrics import commit_metrics, group_by_commit, summarize_commit_metrics
+from pts.core.sampling import correct_probabilities, negative_rate_of
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="evaluator")
 
 
+def threshold_curve(probabilities: np.ndarray, failed: np.ndarray) -> pd.DataFrame:
+    """
+    Calcule les métriques PTS pour tous les seuils de sélection en un seul tri.
+
+    Pour chaque probabilité distincte t (décroissante), les tests sélectionnés
+    au seuil t sont ceux de probabilité >= t: leurs effectifs s'obtiennent par
+    sommes cumulées sur les probabilités triées, en O(n log n).
+
+    Args:
+        probabilities: Probabilités d'échec prédites.
+        failed: Résultat réel (1 = échec) de chaque test.
+
+    Returns:
+        DataFrame (threshold, total_selected, detected_failures, test_reduction_rate,
+        defect_detection_rate, false_positive_rate), seuils décroissants.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    failed = np.asarray(failed).astype(bool)
+    total_tests, total_failed = len(probabilities), int(failed.sum())
+
+    order = np.argsort(-probabilities, kind="stable")
+    sorted_probabilities = probabilities[order]
+    detected = np.cumsum(failed[order])
+    # Dernière position de chaque valeur distincte: les ex aequo sont sélectionnés ensemble
+    last = np.flatnonzero(np.diff(sorted_probabilities, append=-np.inf) != 0)
+
+    selected = last + 1
+    detected = detected[last]
+    return pd.DataFrame({
+        "threshold": sorted_probabilities[last],
+        "total_selected": selected,
+        "detected_failures": detected,
+        "test_reduction_rate": 1.0 - selected / total_tests,
+        "defect_detection_rate": detected / total_failed if total_failed > 0 else 1.0,
+        "false_positive_rate": (selected - detected) / selected,
+    })
+
+
+def classification_metrics(
+    probabilities: np.ndarray, y_true: np.ndarray, decision_threshold: float = 0.5
+) -> Dict[str, float]:
+    """
+    Calcule accuracy, precision, recall, F1 et AUC ROC à partir des seules probabilités.
+
+    Les étiquettes prédites sont dérivées des probabilités (>= seuil); la matrice
+    de confusion est obtenue par un unique `bincount`, et l'AUC par la règle des
+    trapèzes sur la courbe de `threshold_curve` (un seul tri, ex aequo compris).
+
+    Args:
+        probabilities: Probabilités d'échec prédites.
+        y_true: Résultat réel (1 = échec).
+        decision_threshold: Seuil de classification.
+
+    Returns:
+        Dictionnaire des métriques (mêmes définitions que sklearn; AUC NaN si une seule classe).
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_pred = np.asarray(probabilities) >= decision_threshold
+    tn, fp, fn, tp = np.bincount(2 * y_true + y_pred, minlength=4)[:4]
+    total = tn + fp + fn + tp
+
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
+
+    roc_auc = float("nan")
+    positives, negatives = tp + fn, tn + fp
+    if positives and negatives:
+        curve = threshold_curve(probabilities, y_true)
+        tpr = np.concatenate(([0.0], curve["detected_failures"].to_numpy() / positives))
+        fpr = np.concatenate(([0.0], (curve["total_selected"] - curve["detected_failures"]).to_numpy() / negatives))
+        roc_auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2.0))
+
+    return {
+        "accuracy": float((tp + tn) / total) if total else 0.0,
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1_score": float(f1),
+        "roc_auc": roc_auc,
+    }
+
+
 class ModelEvaluator:
     """
     Gère l'évaluation des performances du modèle de sélection prédictive des tests.
     """
 
-    def __init__(self, target_column: str = "test_failed") -> None:
+    def __init__(self, target_column: str = "test_failed", date_column: str = "committed_date") -> None:
         """
         Initialise l'évaluateur.
 
         Args:
             target_column: Nom de la colonne cible dans les données.
+            date_column: Colonne de date du commit (section `split`), exclue des caractéristiques.
         """
         self.target_column = target_column
+        self.date_column = date_column
 
+    @profiled_stage("evaluation")
     def evaluate(
-        self, model: BaseEstimator, data_df: pd.DataFrame
+        self,
+        model: BaseEstimator,
+        data_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        decision_threshold: float = 0.5,
     ) -> Dict[str, float]:
         """
         Évalue le modèle sur un jeu de données.
 
+        Une seule inférence (`predict_proba`) par ligne: les étiquettes sont dérivées
+        des probabilités. Les données peuvent être fournies par morceaux (ex:
+        `pd.read_csv(..., chunksize=...)`): seules les probabilités et les cibles
+        sont conservées entre deux morceaux. Les probabilités d'un modèle entraîné
+        sur des négatifs sous-échantillonnés sont corrigées comme à l'inférence.
+
         Args:
             model: Le modèle entraîné à évaluer.
-            data_df: DataFrame contenant les caractéristiques et la colonne cible.
+            data_df: DataFrame, ou itérable de DataFrames, contenant les caractéristiques
+                et la colonne cible.
+            decision_threshold: Seuil de classification des étiquettes prédites.
 
         Returns:
             Dictionnaire des métriques d'évaluation.
         """
-        logger.info(f"Démarrage de l'évaluation du modèle sur {len(data_df)} échantillons.")
-
-        if self.target_column not in data_df.columns:
-            logger.error(f"Colonne cible '{self.target_column}' non trouvée dans les données.")
-            return {}
-
-        X = data_df.drop(columns=[self.target_column, "test_id"], errors="ignore")
-        y_true = data_df[self.target_column]
+        chunks = [data_df] if isinstance(data_df, pd.DataFrame) else data_df
+        probabilities, targets = [], []
+        negative_rate = negative_rate_of(model)
+        excluded = [self.target_column, "test_id", "commit_hash", self.date_column]
 
         try:
-            # Prédictions
-            y_pred = model.predict(X)
-            y_proba = model.predict_proba(X)[:, 1]
-
-            # Calcul des métriques
-            metrics = {
-                "accuracy": accuracy_score(y_true, y_pred),
-                "precision": precision_score(y_true, y_pred),
-                "recall": recall_score(y_true, y_pred),
-                "f1_score": f1_score(y_true, y_pred),
-                "roc_auc": roc_auc_score(y_true, y_proba),
-            }
+            for chunk in chunks:
+                if self.target_column not in chunk.columns:
+                    logger.error(f"Colonne cible '{self.target_column}' non trouvée dans les données.")
+                    return {}
+                X = chunk.drop(columns=excluded, errors="ignore")
+                p = correct_probabilities(model.predict_proba(X)[:, 1], negative_rate)
+                probabilities.append(p.astype(np.float32, copy=False))
+                targets.append(chunk[self.target_column].to_numpy(dtype=np.int8))
+
+            if not probabilities:
+                logger.warning("Aucune donnée à évaluer.")
+                return {}
+            y_proba, y_true = np.concatenate(probabilities), np.concatenate(targets)
+            logger.info(f"Évaluation du modèle sur {len(y_true)} échantillons ({len(probabilities)} morceaux).")
+            metrics = classification_metrics(y_proba, y_true, decision_threshold)
 
             logger.info("Résultats de l'évaluation:")
             for metric, value in metrics.items():
@@ -83,6 +175,7 @@ class ModelEvaluator:
         prediction_results: pd.DataFrame,
         actual_failures: pd.DataFrame,
         selection_threshold: float,
+        commit_column: str = "commit_hash",
     ) -> Dict[str, float]:
         """
         Calcule les métriques spécifiques à la sélection prédictive des tests (PTS).
@@ -91,13 +184,16 @@ class ModelEvaluator:
             prediction_results: DataFrame avec 'test_id' et 'failure_probability'.
             actual_failures: DataFrame avec 'test_id' et 'test_failed' (vrai/faux).
             selection_threshold: Seuil de probabilité utilisé pour la sélection.
+            commit_column: Colonne de commit; présente dans les deux DataFrames, elle
+                complète la clé de jointure (un même test_id revient à chaque commit).
 
         Returns:
             Dictionnaire des métriques PTS.
         """
         # Fusionner les résultats de prédiction et les échecs réels
+        keys = [c for c in ("test_id", commit_column) if c in prediction_results and c in actual_failures]
         merged_df = pd.merge(
-            prediction_results, actual_failures, on="test_id", how="inner"
+            prediction_results, actual_failures, on=keys, how="inner"
         )
 
         # Identifier les tests sélectionnés
@@ -144,8 +240,143 @@ class ModelEvaluator:
 
         return pts_metrics
 
+    def sweep_thresholds(
+        self,
+        prediction_results: pd.DataFrame,
+        actual_failures: pd.DataFrame,
+        commit_column: str = "commit_hash",
+    ) -> pd.DataFrame:
+        """
+        Calcule la courbe réduction des tests / détection des défauts pour tous les seuils.
+
+        Args:
+            prediction_results: DataFrame avec 'test_id' et 'failure_probability'.
+            actual_failures: DataFrame avec 'test_id' et 'test_failed' (vrai/faux).
+            commit_column: Colonne de commit, ajoutée à la clé de jointure si les deux DataFrames l'ont.
+
+        Returns:
+            La courbe de `threshold_curve`, un seuil par probabilité distincte.
+        """
+        keys = [c for c in ("test_id", commit_column) if c in prediction_results and c in actual_failures]
+        merged_df = pd.merge(prediction_results, actual_failures, on=keys, how="inner")
+        curve = threshold_curve(merged_df["failure_probability"].to_numpy(), merged_df["test_failed"].to_numpy())
+        logger.info(f"Balayage de {len(curve)} seuils sur {len(merged_df)} tests.")
+        return curve
+
+    def calculate_commit_metrics(
+        self,
+        prediction_results: pd.DataFrame,
+        actual_failures: pd.DataFrame,
+        selection_threshold: float,
+        commit_column: str = "commit_hash",
+    ) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """
+        Calcule les métriques PTS commit par commit (détection d'au moins un échec, APFD).
+
+        Args:
+            prediction_results: DataFrame avec 'test_id' et 'failure_probability'
+                (et la colonne de commit si `actual_failures` ne l'a pas).
+            actual_failures: DataFrame avec 'test_id', 'test_failed' et la colonne de commit.
+            selection_threshold: Seuil de probabilité utilisé pour la sélection.
+            commit_column: Colonne identifiant le commit de chaque exécution.
+
+        Returns:
+            (métriques par commit, résumé: moyennes et percentiles).
+        """
+        keys = [c for c in ("test_id", commit_column) if c in prediction_results and c in actual_failures]
+        merged_df = pd.merge(prediction_results, actual_failures, on=keys, how="inner")
+        groups = group_by_commit(
+            merged_df[commit_column].to_numpy(),
+            merged_df["failure_probability"].to_numpy(),
+            merged_df["test_failed"].to_numpy(),
+        )
+        per_commit = commit_metrics(groups, selection_threshold)
+        summary = summarize_commit_metrics(per_commit)
+
+        logger.info("Métriques par commit calculées:")
+        logger.info(f"  Commits en échec détectés (au moins un échec): {summary['caught_any_rate']:.4f}")
+        if "apfd_mean" in summary:
+            logger.info(f"  APFD moyen: {summary['apfd_mean']:.4f} (médiane {summary['apfd_p50']:.4f})")
+        return per_commit, summary
+
+    def bootstrap_intervals(
+        self,
+        prediction_results: pd.DataFrame,
+        actual_failures: pd.DataFrame,
+        selection_threshold: float,
+        commit_column: str = "commit_hash",
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        seed: int = 42,
+        n_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Intervalles de confiance bootstrap (commits rééchantillonnés) de l'AUC ROC,
+        du rappel, du TRR et du DDR.
+
+        Args:
+            prediction_results: DataFrame avec 'test_id' et 'failure_probability'
+                (et la colonne de commit si `actual_failures` ne l'a pas).
+            actual_failures: DataFrame avec 'test_id', 'test_failed' et la colonne de commit.
+            selection_threshold: Seuil de probabilité utilisé pour la sélection.
+            commit_column: Colonne identifiant le commit; absente, chaque ligne est tirée seule.
+            n_resamples: Nombre d'échantillons bootstrap.
+            confidence: Niveau de confiance.
+            seed: Graine (résultats identiques quel que soit le nombre de processus).
+            n_workers: Processus utilisés.
+
+        Returns:
+            DataFrame indexé par métrique: estimate, lower, upper, std.
+        """
+        keys = [c for c in ("test_id", commit_column) if c in prediction_results and c in actual_failures]
+        merged_df = pd.merge(prediction_results, actual_failures, on=keys, how="inner")
+        if commit_column in merged_df.columns:
+            groups = merged_df[commit_column].to_numpy()
+        else:
+            logger.warning(f"Colonne '{commit_column}' absente: rééchantillonnage des lignes.")
+            groups = np.arange(len(merged_df))
+
+        intervals = bootstrap_metrics(
+            groups,
+            merged_df["failure_probability"].to_numpy(),
+            merged_df["test_failed"].to_numpy(),
+            threshold=selection_threshold,
+            n_resamples=n_resamples,
+            confidence=confidence,
+            seed=seed,
+            n_workers=n_workers,
+        )
+        logger.info(f"Intervalles de confiance à {confidence:.0%} ({n_resamples} échantillons):")
+        for metric, row in intervals.iterrows():
+            logger.info(f"  {metric}: {row['estimate']:.4f} [{row['lower']:.4f}, {row['upper']:.4f}]")
+        return intervals
+
+    @staticmethod
+    def recommend_threshold(curve: pd.DataFrame, target_ddr: float) -> Optional[Dict[str, float]]:
+        """
+        Recommande le seuil le plus élevé (réduction maximale) atteignant un taux de détection cible.
+
+        Args:
+            curve: Courbe de `sweep_thresholds`.
+            target_ddr: Taux de détection des défauts minimal (ex: 0.95).
+
+        Returns:
+            La ligne de la courbe correspondante, ou None si la courbe est vide.
+        """
+        reaching = curve[curve["defect_detection_rate"] >= target_ddr]
+        if reaching.empty:
+            return None
+        # Seuils décroissants: le premier atteignant la cible sélectionne le moins de tests
+        best = reaching.iloc[0]
+        logger.info(
+            f"Seuil recommandé pour DDR >= {target_ddr}: {best['threshold']:.4f} "
+            f"(TRR {best['test_reduction_rate']:.4f}, DDR {best['defect_detection_rate']:.4f})"
+        )
+        return {k: float(v) for k, v in best.items()}
+
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     # Création de données simulées
     data = {
@@ -183,3 +414,7 @@ if __name__ == "__main__":
     pts_metrics = evaluator.calculate_pts_metrics(
         prediction_results, actual_failures, selection_threshold=0.5
     )
+
+    # 3. Courbe TRR/DDR et seuil recommandé
+    curve = evaluator.sweep_thresholds(prediction_results, actual_failures)
+    evaluator.recommend_threshold(curve, target_ddr=0.9)
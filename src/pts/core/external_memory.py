@@ -0,0 +1,248 @@
+import glob
+import os
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import xgboost as xgb
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Dépendance optionnelle (extra "parquet")
+    pa = pq = None
+
+logger.disable("pts")
+logger = logger.bind(name="external_memory")
+
+# Colonnes qui ne sont jamais des caractéristiques
+NON_FEATURE_COLUMNS = ("test_id", "commit_hash", "commit_id", "committed_date")
+
+# Paramètres scikit-learn -> paramètres natifs de xgboost.train
+_NATIVE_PARAMS = {"random_state": "seed", "n_jobs": "nthread"}
+
+
+def parquet_files(path: str, newest: Optional[int] = None) -> List[str]:
+    """
+    Liste les partitions Parquet d'un jeu de données.
+
+    Args:
+        path: Fichier, répertoire (parcouru récursivement) ou motif glob.
+        newest: Ne garder que les `newest` dernières partitions (ordre des noms,
+            ex: `date=2024-01-08/part-0.parquet`), pour l'entraînement incrémental.
+
+    Returns:
+        Chemins triés des fichiers.
+    """
+    if os.path.isdir(path):
+        files = glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True)
+    else:
+        files = glob.glob(path)
+    files = sorted(files)
+    if not files:
+        raise FileNotFoundError(f"Aucun fichier Parquet trouvé: {path}")
+    return files[-newest:] if newest else files
+
+
+class ParquetBatchIter(xgb.DataIter):
+    """
+    Itérateur XGBoost qui lit des fichiers Parquet par lots de lignes.
+
+    Seul le lot courant est converti en mémoire (float32); XGBoost construit
+    ses pages (mode external) ou son index de quantiles (mode quantile) lot par lot.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        features: Sequence[str],
+        target: str,
+        batch_size: int = 65536,
+        cache_prefix: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            paths: Fichiers Parquet, lus dans l'ordre.
+            features: Colonnes des caractéristiques.
+            target: Colonne cible.
+            batch_size: Nombre de lignes par lot.
+            cache_prefix: Préfixe des pages sur disque (mémoire externe), None pour QuantileDMatrix.
+        """
+        if pq is None:
+            raise ImportError("pyarrow est requis pour l'entraînement en mémoire externe (pip install pyarrow).")
+        self.paths = list(paths)
+        self.features = list(features)
+        self.target = target
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batches: Optional[Iterator[Any]] = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def _iter_batches(self) -> Iterator[Any]:
+        for path in self.paths:
+            parquet_file = pq.ParquetFile(path)
+            yield from parquet_file.iter_batches(batch_size=self.batch_size, columns=self.features + [self.target])
+
+    def next(self, input_data: Callable[..., None]) -> int:
+        if self._batches is None:
+            self._batches = self._iter_batches()
+        batch = next(self._batches, None)
+        if batch is None:
+            return 0
+        X = np.empty((batch.num_rows, len(self.features)), dtype=np.float32)
+        for j, name in enumerate(self.features):
+            X[:, j] = batch.column(name).to_numpy(zero_copy_only=False)
+        y = batch.column(self.target).to_numpy(zero_copy_only=False).astype(np.float32)
+        self.rows += batch.num_rows
+        input_data(data=X, label=y)
+        return 1
+
+    def reset(self) -> None:
+        self._batches = None
+        self.rows = 0
+
+
+class ExternalMemoryTrainer:
+    """
+    Entraîne le modèle XGBoost sur des partitions Parquet sans charger la table en mémoire.
+
+    Deux modes (section `external_memory` de la configuration):
+    - "external": DMatrix en mémoire externe, les pages sont écrites dans un
+      répertoire propre à l'exécution sous `cache_dir`, supprimé après l'entraînement;
+    - "quantile": QuantileDMatrix construite lot par lot, seul l'index compressé
+      des histogrammes (~1 octet par valeur) reste en mémoire.
+    Un modèle précédent peut être poursuivi sur les seules données récentes (`init_model`).
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        """
+        Args:
+            config: Configuration du modèle (model_params, target_column, section `external_memory`).
+        """
+        section = config.get("external_memory", {})
+        self.model_params = config.get("model_params", {})
+        self.target_column = config.get("target_column", "test_failed")
+        self.features: Optional[List[str]] = section.get("features")
+        self.mode = section.get("mode", "external")
+        self.batch_size = int(section.get("batch_size", 65536))
+        self.cache_dir = section.get("cache_dir", "data/cache/xgboost")
+        self.update_rounds = int(section.get("update_rounds", 50))
+        if self.mode not in ("external", "quantile"):
+            raise ValueError(f"Mode de mémoire externe inconnu: {self.mode} (external ou quantile)")
+
+    def feature_columns(self, paths: Sequence[str]) -> List[str]:
+        """Caractéristiques: colonnes numériques du schéma Parquet hors cible et identifiants."""
+        if self.features:
+            return list(self.features)
+        if pq is None:
+            raise ImportError("pyarrow est requis pour l'entraînement en mémoire externe (pip install pyarrow).")
+        schema = pq.read_schema(paths[0])
+        excluded = {self.target_column, *NON_FEATURE_COLUMNS}
+        numeric = (pa.types.is_integer, pa.types.is_floating, pa.types.is_boolean)
+        return [
+            field.name for field in schema
+            if field.name not in excluded and any(is_type(field.type) for is_type in numeric)
+        ]
+
+    def dataset(self, paths: Sequence[str], max_bin: int = 256, page_dir: Optional[str] = None) -> xgb.DMatrix:
+        """
+        Construit la matrice XGBoost à partir des fichiers Parquet.
+
+        Args:
+            paths: Fichiers Parquet.
+            max_bin: Nombre de classes des histogrammes (mode "quantile").
+            page_dir: Répertoire des pages du mode "external" (par défaut: un nouveau
+                répertoire dans `cache_dir`, à supprimer par l'appelant).
+        """
+        features = self.feature_columns(paths)
+        if self.mode == "external":
+            page_dir = page_dir or self.page_dir()
+            iterator = ParquetBatchIter(paths, features, self.target_column, self.batch_size,
+                                        cache_prefix=os.path.join(page_dir, "pages"))
+            dmatrix = xgb.DMatrix(iterator, missing=np.nan)
+        else:
+            iterator = ParquetBatchIter(paths, features, self.target_column, self.batch_size)
+            dmatrix = xgb.QuantileDMatrix(iterator, missing=np.nan, max_bin=max_bin)
+        dmatrix.feature_names = features
+        logger.info(f"Matrice {self.mode}: {dmatrix.num_row()} lignes, {len(features)} caractéristiques "
+                    f"({len(paths)} fichiers).")
+        return dmatrix
+
+    def page_dir(self) -> str:
+        """
+        Crée un répertoire de pages propre à une exécution dans `cache_dir`: deux
+        entraînements partageant `cache_dir` (ex: backtest et entraînement en
+        parallèle) n'écrasent pas leurs pages.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return tempfile.mkdtemp(prefix="run-", dir=self.cache_dir)
+
+    def params(self) -> Dict[str, Any]:
+        """Paramètres natifs XGBoost (histogrammes) dérivés de `model_params`."""
+        params: Dict[str, Any] = {"objective": "binary:logistic", "eval_metric": "logloss"}
+        for name, value in self.model_params.items():
+            if name != "n_estimators":
+                params[_NATIVE_PARAMS.get(name, name)] = value
+        params["tree_method"] = "hist"
+        return params
+
+    def train(
+        self,
+        paths: Sequence[str],
+        init_model: Optional[Union[str, xgb.Booster]] = None,
+        num_boost_round: Optional[int] = None,
+    ) -> xgb.Booster:
+        """
+        Entraîne (ou poursuit) le modèle sur les fichiers Parquet.
+
+        Args:
+            paths: Fichiers Parquet d'entraînement.
+            init_model: Modèle à poursuivre (chemin JSON ou Booster); seuls les
+                nouveaux arbres sont construits sur `paths`.
+            num_boost_round: Arbres à construire (par défaut: model_params.n_estimators,
+                ou external_memory.update_rounds pour une poursuite).
+
+        Returns:
+            Le Booster entraîné.
+        """
+        if num_boost_round is None:
+            num_boost_round = self.update_rounds if init_model is not None else int(
+                self.model_params.get("n_estimators", 100)
+            )
+        params = self.params()
+        page_dir = self.page_dir() if self.mode == "external" else None
+        try:
+            dtrain = self.dataset(paths, max_bin=int(params.get("max_bin", 256)), page_dir=page_dir)
+            if init_model is not None:
+                logger.info(f"Poursuite de l'entraînement: {num_boost_round} arbres sur les données récentes.")
+            booster = xgb.train(params, dtrain, num_boost_round=num_boost_round, xgb_model=init_model)
+            del dtrain  # Libère les pages avant la suppression du répertoire
+        finally:
+            if page_dir is not None:
+                shutil.rmtree(page_dir, ignore_errors=True)
+        logger.success(f"Modèle entraîné en mémoire externe: {booster.num_boosted_rounds()} arbres au total.")
+        return booster
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: 4 partitions hebdomadaires, puis poursuite sur la dernière
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    os.makedirs("/tmp/pts_parquet", exist_ok=True)
+    for week in range(4):
+        n = 50000
+        df = pd.DataFrame({"test_id": [f"test_{i % 100}" for i in range(n)],
+                           "feature_churn": rng.random(n), "feature_history": rng.random(n)})
+        df["test_failed"] = (df["feature_churn"] + 0.3 * rng.random(n) > 0.9).astype(int)
+        df.to_parquet(f"/tmp/pts_parquet/week={week}.parquet")
+
+    trainer = ExternalMemoryTrainer({"model_params": {"n_estimators": 50, "max_depth": 4},
+                                     "external_memory": {"cache_dir": "/tmp/pts_xgb_cache"}})
+    booster = trainer.train(parquet_files("/tmp/pts_parquet")[:-1])
+    booster = trainer.train(parquet_files("/tmp/pts_parquet", newest=1), init_model=booster)
@@ -1,4 +1,5 @@
 import logging
+import os
 from typing import List, Dict, Any, Optional
 
 import numpy as np
@@ -7,9 +8,11 @@ from loguru import logger
 from sklearn.base import BaseEstimator
 from xgboost import XGBClassifier
 
-from pts.utils.logger import setup_logging
+from pts.core.sampling import correct_probabilities, negative_rate_of
+from pts.utils.logger import sampled, setup_logging
+from pts.utils.metrics import record_tests_scored, record_tests_selected, time_stage
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="predictor")
 
@@ -39,6 +42,8 @@ class PredictiveTestSelector:
         self.threshold = threshold
         self.model_path = model_path
         self.model: BaseEstimator = model if model is not None else self._load_model()
+        # Taux de négatifs conservés à l'entraînement (1.0: pas de correction)
+        self.negative_rate = negative_rate_of(self.model)
 
     def _load_model(self) -> BaseEstimator:
         """
@@ -49,13 +54,14 @@ class PredictiveTestSelector:
         """
         logger.info(f"Chargement du modèle depuis {self.model_path}")
         try:
-            # Exemple de chargement d'un modèle XGBoost
             model = XGBClassifier()
-            # Dans un cas réel, on chargerait le modèle sauvegardé ici
-            # model.load_model(self.model_path)
-            logger.warning(
-                "Modèle par défaut initialisé. Le chargement réel du modèle est simulé."
-            )
+            if os.path.exists(self.model_path):
+                # Format natif XGBoost écrit par ModelTrainer.save_model
+                model.load_model(self.model_path)
+            else:
+                logger.warning(
+                    f"Modèle introuvable ({self.model_path}). Modèle par défaut initialisé."
+                )
             return model
         except Exception as e:
             logger.error(f"Erreur lors du chargement du modèle: {e}")
@@ -87,12 +93,16 @@ class PredictiveTestSelector:
                 probabilities = np.random.rand(len(X))
             else:
                 # La prédiction réelle
-                probabilities = self.model.predict_proba(X)[:, 1]  # Probabilité de la classe positive (échec)
+                with time_stage("inference"):
+                    probabilities = self.model.predict_proba(X)[:, 1]  # Probabilité de la classe positive (échec)
+                    probabilities = correct_probabilities(probabilities, self.negative_rate)
+            record_tests_scored(len(X))
 
             results = pd.DataFrame(
                 {"test_id": test_ids, "failure_probability": probabilities}
             )
-            logger.info(f"Prédiction effectuée pour {len(results)} tests.")
+            if sampled("predictor.predict"):
+                logger.info("Prédiction effectuée pour {} tests.", len(results))
             return results
 
         except Exception as e:
@@ -109,16 +119,20 @@ class PredictiveTestSelector:
         Returns:
             Liste des identifiants des tests sélectionnés.
         """
-        selected_tests_df = prediction_results[
-            prediction_results["failure_probability"] >= self.threshold
-        ]
-        selected_tests = selected_tests_df["test_id"].tolist()
-
-        logger.info(
-            f"{len(selected_tests)} tests sélectionnés (seuil: {self.threshold})."
-        )
+        with time_stage("selection"):
+            selected_tests_df = prediction_results[
+                prediction_results["failure_probability"] >= self.threshold
+            ]
+            selected_tests = selected_tests_df["test_id"].tolist()
+        record_tests_selected(len(selected_tests))
+
+        if sampled("predictor.select_tests"):
+            logger.info(
+                "{} tests sélectionnés (seuil: {}).", len(selected_tests), self.threshold
+            )
         return selected_tests
 
+    @profiled_stage("prediction")
     def run_prediction_pipeline(self, features_df: pd.DataFrame) -> List[str]:
         """
         Exécute le pipeline complet de prédiction et de sélection.
@@ -135,6 +149,7 @@ class PredictiveTestSelector:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     # 1. Création de données de caractéristiques simulées
     data = {
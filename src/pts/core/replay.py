@@ -0,0 +1,280 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from pts.core.backtest import ID_COLUMNS, Window, time_windows
+from pts.core.commit_metrics import CommitGroups, group_by_commit
+from pts.core.predictor import PredictiveTestSelector
+from pts.core.trainer import ModelTrainer
+from pts.core.tuning import partition_cores
+from pts.utils.logger import setup_logging
+from pts.utils.metrics import increment_cost_savings, update_test_reduction_rate
+
+logger.disable("pts")
+logger = logger.bind(name="replay")
+
+# Colonnes requises de l'historique rejoué (une ligne par exécution de test)
+REQUIRED_COLUMNS = ("commit_hash", "committed_date", "test_id", "test_failed", "duration")
+
+# Historique trié par date partagé par les processus du rejeu (voir _init_worker)
+_WORKER_DATA: Dict[str, Any] = {}
+
+
+class ReplayResult(NamedTuple):
+    """Résultat d'un rejeu: une ligne par commit et un résumé."""
+
+    per_commit: pd.DataFrame
+    summary: Dict[str, float]
+
+
+def _segmented_cumsum(values: np.ndarray, groups: CommitGroups) -> np.ndarray:
+    """Somme cumulée de `values` remise à zéro au début de chaque commit."""
+    cumulative = np.cumsum(values)
+    before = cumulative[groups.starts] - values[groups.starts]
+    return cumulative - np.repeat(before, groups.sizes)
+
+
+def _time_to_first(mask: np.ndarray, elapsed: np.ndarray, groups: CommitGroups) -> np.ndarray:
+    """Temps écoulé à la fin du premier test de `mask` de chaque commit (NaN si aucun)."""
+    positions = np.arange(len(mask))
+    sentinel = len(mask)
+    first = np.minimum.reduceat(np.where(mask, positions, sentinel), groups.starts)
+    found = first < sentinel
+    result = np.full(len(first), np.nan)
+    result[found] = elapsed[first[found]]
+    return result
+
+
+def replay_kernels(
+    commit_ids: np.ndarray,
+    probabilities: np.ndarray,
+    failed: np.ndarray,
+    durations: np.ndarray,
+    threshold: float,
+) -> pd.DataFrame:
+    """
+    Simule, commit par commit, l'exécution des tests sélectionnés par ordre de priorité.
+
+    - minutes économisées: durée des tests non sélectionnés;
+    - échecs manqués: tests en échec non sélectionnés;
+    - time-to-first-failure: temps jusqu'à la fin du premier test en échec, tests
+      sélectionnés exécutés par probabilité décroissante, comparé à la suite complète
+      exécutée dans l'ordre d'origine.
+
+    Args:
+        commit_ids: Commit de chaque exécution.
+        probabilities: Probabilité d'échec prédite.
+        failed: Résultat réel (1 = échec).
+        durations: Durée de chaque test (secondes).
+        threshold: Seuil de sélection.
+
+    Returns:
+        Une ligne par commit.
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    groups = group_by_commit(commit_ids, probabilities, failed)
+    sorted_durations = durations[groups.order]
+    selected = groups.probabilities >= threshold
+
+    def segment_sum(values: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(values, groups.starts)
+
+    total_seconds = segment_sum(sorted_durations)
+    selected_seconds = segment_sum(np.where(selected, sorted_durations, 0.0))
+    n_failed = segment_sum(groups.failed.astype(np.int64))
+    n_detected = segment_sum((groups.failed & selected).astype(np.int64))
+
+    # Tests sélectionnés exécutés par ordre de priorité (les autres ne coûtent rien)
+    prioritized = _segmented_cumsum(np.where(selected, sorted_durations, 0.0), groups)
+    ttff = _time_to_first(groups.failed & selected, prioritized, groups)
+
+    # Référence: suite complète dans l'ordre d'origine des exécutions de chaque commit
+    codes = pd.factorize(np.asarray(commit_ids))[0]
+    original = np.argsort(codes, kind="stable")
+    baseline_groups = groups._replace(order=original)
+    baseline_elapsed = _segmented_cumsum(durations[original], baseline_groups)
+    baseline_ttff = _time_to_first(np.asarray(failed)[original].astype(bool), baseline_elapsed, baseline_groups)
+
+    return pd.DataFrame({
+        "commit_hash": groups.commits,
+        "n_tests": groups.sizes,
+        "n_selected": segment_sum(selected.astype(np.int64)),
+        "n_failed": n_failed,
+        "missed_failures": n_failed - n_detected,
+        "total_minutes": total_seconds / 60.0,
+        "minutes_saved": (total_seconds - selected_seconds) / 60.0,
+        "ttff_minutes": ttff / 60.0,
+        "baseline_ttff_minutes": baseline_ttff / 60.0,
+    })
+
+
+def _init_worker(history: pd.DataFrame) -> None:
+    # L'historique est transmis une seule fois par processus, pas à chaque fenêtre
+    _WORKER_DATA["history"] = history
+
+
+def _replay_window(
+    window: Window,
+    bounds: List[int],
+    config: Dict[str, Any],
+    features: List[str],
+    threshold: float,
+    n_jobs: int,
+) -> pd.DataFrame:
+    """Entraîne le modèle sur le passé de la fenêtre puis rejoue ses commits."""
+    history = _WORKER_DATA["history"]
+    train_start, test_start, test_end = bounds
+    train_df = history.iloc[train_start:test_start]
+    test_df = history.iloc[test_start:test_end]
+
+    if train_df["test_failed"].sum() >= 2 and (train_df["test_failed"] == 0).sum() >= 2:
+        trainer_config = {**config, "model_params": {**config.get("model_params", {}), "n_jobs": n_jobs}}
+        trainer = ModelTrainer(trainer_config)
+        # Toute la fenêtre sert à l'entraînement: ses commits les plus récents ne sont pas mis de côté
+        model = trainer.train(train_df[["test_id", "committed_date", *features, "test_failed"]], holdout=False)
+        selector = PredictiveTestSelector(model=model, threshold=threshold)
+        probabilities = selector.predict(test_df[["test_id", *features]])["failure_probability"].to_numpy()
+    else:
+        # Pas assez d'échecs pour entraîner: toute la suite est exécutée
+        probabilities = np.ones(len(test_df))
+
+    per_commit = replay_kernels(
+        test_df["commit_hash"].to_numpy(), probabilities, test_df["test_failed"].to_numpy(),
+        test_df["duration"].to_numpy(), threshold,
+    )
+    per_commit.insert(1, "window", window.index)
+    return per_commit
+
+
+class ReplaySimulator:
+    """
+    Rejoue l'historique des commits dans l'ordre chronologique à travers
+    `PredictiveTestSelector`, avec un réentraînement périodique du modèle.
+
+    Chaque période de réentraînement est indépendante (son modèle ne voit que
+    le passé): les périodes sont rejouées en parallèle, en répartissant les
+    cœurs entre processus et threads XGBoost.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        """
+        Args:
+            config: Configuration du modèle (model_params, sampling, selection_threshold,
+                section `replay`).
+        """
+        section = config.get("replay", {})
+        self.config = config
+        self.threshold = section.get("threshold", config.get("selection_threshold", 0.6))
+        self.train_period = section.get("train_period", "28D")
+        self.retrain_every = section.get("retrain_every", "7D")
+        self.expanding = bool(section.get("expanding", False))
+        self.cost_per_minute = float(section.get("cost_per_minute", 0.008))
+        self.n_cores = section.get("n_cores")
+
+    def features(self, history: pd.DataFrame) -> List[str]:
+        """Colonnes numériques utilisées comme caractéristiques."""
+        excluded = {*REQUIRED_COLUMNS, *ID_COLUMNS}
+        return [c for c in history.select_dtypes(include=["number", "bool"]).columns if c not in excluded]
+
+    def run(self, history: pd.DataFrame) -> ReplayResult:
+        """
+        Rejoue l'historique.
+
+        Args:
+            history: Une ligne par exécution: commit_hash, committed_date, test_id,
+                test_failed, duration (secondes) et les caractéristiques.
+
+        Returns:
+            Les métriques par commit rejoué et leur résumé.
+        """
+        missing = [c for c in REQUIRED_COLUMNS if c not in history.columns]
+        if missing:
+            raise ValueError(f"Colonnes manquantes pour le rejeu: {missing}")
+
+        history = history.assign(committed_date=pd.to_datetime(history["committed_date"], utc=True))
+        history = history.sort_values("committed_date", kind="stable").reset_index(drop=True)
+        dates = history["committed_date"]
+        windows = time_windows(dates.iloc[0], dates.iloc[-1], self.train_period, self.retrain_every,
+                               expanding=self.expanding)
+        if not windows:
+            raise ValueError(f"Historique trop court pour une période d'entraînement de {self.train_period}.")
+
+        # Historique trié: chaque période est une tranche contiguë [début, fin)
+        jobs = []
+        for window in windows:
+            bounds = dates.searchsorted([window.train_start, window.test_start, window.test_end]).tolist()
+            if bounds[2] > bounds[1]:
+                jobs.append((window, bounds))
+
+        features = self.features(history)
+        workers, threads = partition_cores(len(jobs), self.n_cores)
+        logger.info(f"Rejeu: {len(jobs)} périodes de {self.retrain_every}, {workers} processus x {threads} threads.")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(history,)) as pool:
+            futures = [
+                pool.submit(_replay_window, window, bounds, self.config, features, self.threshold, threads)
+                for window, bounds in jobs
+            ]
+            per_commit = pd.concat([future.result() for future in futures], ignore_index=True)
+
+        summary = self.summarize(per_commit)
+        logger.success(
+            f"Rejeu terminé: {summary['minutes_saved']:.0f} minutes CI économisées "
+            f"({summary['saved_fraction']:.1%}), {summary['missed_failures']:.0f} échecs manqués."
+        )
+        return ReplayResult(per_commit, summary)
+
+    def summarize(self, per_commit: pd.DataFrame) -> Dict[str, float]:
+        """Résumé du rejeu: minutes et coûts économisés, échecs manqués, time-to-first-failure."""
+        broken = per_commit[per_commit["n_failed"] > 0]
+        total_minutes = float(per_commit["total_minutes"].sum())
+        minutes_saved = float(per_commit["minutes_saved"].sum())
+        return {
+            "commits": float(len(per_commit)),
+            "tests": float(per_commit["n_tests"].sum()),
+            "tests_selected": float(per_commit["n_selected"].sum()),
+            "total_minutes": total_minutes,
+            "minutes_saved": minutes_saved,
+            "saved_fraction": minutes_saved / total_minutes if total_minutes else 0.0,
+            "cost_saved_usd": minutes_saved * self.cost_per_minute,
+            "failures": float(per_commit["n_failed"].sum()),
+            "missed_failures": float(per_commit["missed_failures"].sum()),
+            "broken_commits": float(len(broken)),
+            "missed_broken_commits": float((broken["missed_failures"] == broken["n_failed"]).sum()),
+            "ttff_median_minutes": float(broken["ttff_minutes"].median()) if len(broken) else float("nan"),
+            "baseline_ttff_median_minutes": (
+                float(broken["baseline_ttff_minutes"].median()) if len(broken) else float("nan")
+            ),
+        }
+
+    @staticmethod
+    def publish(summary: Dict[str, float]) -> None:
+        """Alimente les métriques Prometheus (taux de réduction, économies) avec le résultat du rejeu."""
+        update_test_reduction_rate(int(summary["tests"]), int(summary["tests_selected"]))
+        increment_cost_savings(summary["cost_saved_usd"])
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: 120 jours, 30 commits par jour, 200 tests par commit
+    rng = np.random.default_rng(0)
+    n_commits, n_tests = 120 * 30, 200
+    commit_dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.uniform(0, 120, n_commits)), unit="D")
+    sample_history = pd.DataFrame({
+        "commit_hash": np.repeat([f"c{i}" for i in range(n_commits)], n_tests),
+        "committed_date": np.repeat(commit_dates, n_tests),
+        "test_id": np.tile([f"test_{j}" for j in range(n_tests)], n_commits),
+        "duration": np.tile(rng.exponential(30.0, n_tests), n_commits),
+        "feature_churn": rng.random(n_commits * n_tests),
+        "feature_history": np.tile(rng.beta(0.5, 20.0, n_tests), n_commits),
+    })
+    risk = sample_history["feature_churn"] * sample_history["feature_history"] * 8
+    sample_history["test_failed"] = (rng.random(len(sample_history)) < risk).astype(int)
+
+    simulator = ReplaySimulator({"model_params": {"n_estimators": 50, "max_depth": 4},
+                                 "split": {"strategy": "time"}, "replay": {"threshold": 0.05}})
+    result = simulator.run(sample_history)
+    for key, value in result.summary.items():
+        logger.info(f"{key}: {value:.2f}")
@@ -0,0 +1,103 @@
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="sampling")
+
+# Attribut du Booster XGBoost (sauvegardé dans le JSON du modèle) portant le taux d'échantillonnage
+NEGATIVE_RATE_ATTR = "pts_negative_rate"
+
+
+def downsample_negatives(
+    y: pd.Series,
+    rate: float,
+    groups: Optional[pd.Series] = None,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Sélectionne les lignes conservées après sous-échantillonnage des négatifs.
+
+    Tous les positifs (échecs) sont conservés. Dans chaque groupe (test ou commit),
+    ceil(rate * négatifs du groupe) négatifs sont tirés au hasard: un groupe garde
+    au moins un négatif, et la proportion est exacte groupe par groupe.
+
+    Args:
+        y: Cible binaire (1 = échec).
+        rate: Proportion de négatifs conservés, dans ]0, 1].
+        groups: Groupe de chaque ligne (ex: test_id); None pour un tirage global.
+        seed: Graine du tirage.
+
+    Returns:
+        Positions (triées) des lignes conservées.
+    """
+    if not 0.0 < rate <= 1.0:
+        raise ValueError(f"Le taux de négatifs conservés doit être dans ]0, 1]: {rate}")
+    labels = np.asarray(y)
+    if rate == 1.0:
+        return np.arange(len(labels))
+
+    negatives = np.flatnonzero(labels == 0)
+    if groups is None:
+        codes = np.zeros(len(negatives), dtype=np.int64)
+    else:
+        codes = pd.factorize(np.asarray(groups)[negatives])[0]
+
+    # Ordre aléatoire à l'intérieur de chaque groupe, puis rang de chaque négatif dans son groupe
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(negatives)), codes))
+    sorted_codes = codes[order]
+    counts = np.bincount(sorted_codes)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ranks = np.arange(len(order)) - starts[sorted_codes]
+    quotas = np.ceil(counts * rate).astype(np.int64)
+    kept_negatives = negatives[order[ranks < quotas[sorted_codes]]]
+
+    return np.sort(np.concatenate((np.flatnonzero(labels != 0), kept_negatives)))
+
+
+def correct_probabilities(probabilities: np.ndarray, rate: float) -> np.ndarray:
+    """
+    Corrige les probabilités d'un modèle entraîné avec `rate` des négatifs.
+
+    Le modèle surestime les échecs d'un facteur de cotes 1/rate:
+    p = rate * q / (rate * q + 1 - q).
+
+    Args:
+        probabilities: Probabilités prédites par le modèle sous-échantillonné.
+        rate: Taux de négatifs conservés à l'entraînement.
+
+    Returns:
+        Probabilités calibrées sur la distribution réelle.
+    """
+    if rate >= 1.0:
+        return probabilities
+    scaled = rate * probabilities
+    return scaled / (scaled + 1.0 - probabilities)
+
+
+def negative_rate_of(model: Any) -> float:
+    """Taux d'échantillonnage enregistré dans un modèle XGBoost (1.0 si absent)."""
+    try:
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        value = booster.attr(NEGATIVE_RATE_ATTR)
+        return float(value) if value is not None else 1.0
+    except Exception:
+        # Modèle non entraîné ou sans Booster: aucune correction
+        return 1.0
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: 0,5% d'échecs, 10% des négatifs conservés par test
+    rng = np.random.default_rng(0)
+    n = 100000
+    y = pd.Series((rng.random(n) < 0.005).astype(int))
+    test_ids = pd.Series([f"test_{i % 500}" for i in range(n)])
+    kept = downsample_negatives(y, 0.1, groups=test_ids, seed=0)
+    logger.info(f"{len(kept)} lignes conservées sur {n} ({y.iloc[kept].sum()} échecs).")
+    logger.info(f"Probabilité 0.5 corrigée: {correct_probabilities(np.array([0.5]), 0.1)[0]:.4f}")
@@ -1,14 +1,19 @@
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 from sklearn.model_selection import train_test_split
 from sklearn.base import BaseEstimator
-from xgboost import XGBClassifier
+from xgboost import Booster, XGBClassifier
 
+from pts.core.external_memory import ExternalMemoryTrainer
+from pts.core.sampling import NEGATIVE_RATE_ATTR, downsample_negatives
+from pts.core.tuning import HyperparameterSearch, SearchResult
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="trainer")
 
@@ -26,34 +31,104 @@ class ModelTrainer:
             config: Dictionnaire de configuration pour l'entraînement du modèle.
         """
         self.config = config
-        self.model: Optional[BaseEstimator] = None
+        self.model: Optional[Union[BaseEstimator, Booster]] = None
         self.model_params = self.config.get("model_params", {})
         self.target_column = self.config.get("target_column", "test_failed")
+        self.negative_rate = float(self.config.get("sampling", {}).get("negative_rate", 1.0))
 
-    def train(self, data_df: pd.DataFrame) -> BaseEstimator:
+    def _features(self, data_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """Sépare les caractéristiques de la colonne cible."""
+        if self.target_column not in data_df.columns:
+            logger.error(f"Colonne cible '{self.target_column}' non trouvée dans les données.")
+            raise ValueError(f"Colonne cible manquante: {self.target_column}")
+
+        date_column = self.config.get("split", {}).get("date_column", "committed_date")
+        X = data_df.drop(columns=[self.target_column, "test_id", date_column], errors="ignore")
+        return X, data_df[self.target_column]
+
+    def _split(self, data_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+        """
+        Sépare caractéristiques et cible, puis jeux d'entraînement et de validation
+        (section `split`: par date de commit ou aléatoire stratifiée).
+        """
+        X, y = self._features(data_df)
+        split = self.config.get("split", {})
+        strategy = split.get("strategy", "random")
+        date_column = split.get("date_column", "committed_date")
+        test_size = split.get("test_size", 0.2)
+
+        if strategy == "time":
+            if date_column in data_df.columns:
+                # Validation sur les commits les plus récents: pas de fuite du futur vers l'entraînement
+                dates = pd.to_datetime(data_df[date_column], utc=True).to_numpy()
+                order = dates.argsort(kind="stable")
+                sorted_dates = dates[order]
+                cut = len(order) - max(1, int(round(len(order) * test_size)))
+                # Coupure à une frontière de date: les lignes d'un commit restent du même côté
+                cut = int(np.searchsorted(sorted_dates, sorted_dates[cut], side="left"))
+                if cut == 0:
+                    cut = int(np.searchsorted(sorted_dates, sorted_dates[0], side="right"))
+                if 0 < cut < len(order):
+                    train, val = order[:cut], order[cut:]
+                    return X.iloc[train], X.iloc[val], y.iloc[train], y.iloc[val]
+                logger.warning(f"Une seule date dans '{date_column}': séparation aléatoire des données.")
+            else:
+                logger.warning(f"Colonne '{date_column}' absente: séparation aléatoire des données.")
+        elif strategy != "random":
+            raise ValueError(f"Stratégie de séparation inconnue: {strategy} (time ou random)")
+        return train_test_split(X, y, test_size=test_size, random_state=42, stratify=y)
+
+    def _downsample(
+        self, data_df: pd.DataFrame, X_train: pd.DataFrame, y_train: pd.Series
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Sous-échantillonne les négatifs du jeu d'entraînement (section `sampling`).
+
+        La validation garde la distribution réelle; le taux est enregistré dans le
+        modèle pour corriger les probabilités à l'inférence.
+        """
+        if self.negative_rate >= 1.0:
+            return X_train, y_train
+
+        sampling = self.config.get("sampling", {})
+        group_by = sampling.get("group_by")
+        groups = None
+        if group_by in data_df.columns:
+            groups = data_df.loc[X_train.index, group_by]
+        elif group_by:
+            logger.warning(f"Colonne '{group_by}' absente: sous-échantillonnage global des négatifs.")
+        kept = downsample_negatives(y_train, self.negative_rate, groups=groups, seed=sampling.get("seed", 42))
+        logger.info(
+            f"Négatifs sous-échantillonnés ({self.negative_rate:g} par {group_by or 'jeu'}): "
+            f"{len(kept)} lignes d'entraînement sur {len(y_train)}."
+        )
+        return X_train.iloc[kept], y_train.iloc[kept]
+
+    def _record_sampling(self) -> None:
+        """Enregistre le taux de négatifs conservés dans le Booster (sauvegardé avec le modèle)."""
+        self.model.get_booster().set_attr(**{NEGATIVE_RATE_ATTR: repr(self.negative_rate)})
+
+    @profiled_stage("training")
+    def train(self, data_df: pd.DataFrame, holdout: bool = True) -> BaseEstimator:
         """
         Entraîne le modèle sur les données fournies.
 
         Args:
             data_df: DataFrame contenant les caractéristiques et la colonne cible.
+            holdout: Si faux, toutes les lignes servent à l'entraînement (aucun jeu
+                de validation, ex: réentraînement périodique du rejeu).
 
         Returns:
             Le modèle entraîné.
         """
         logger.info(f"Démarrage de l'entraînement du modèle avec {len(data_df)} échantillons.")
 
-        # Préparation des données
-        if self.target_column not in data_df.columns:
-            logger.error(f"Colonne cible '{self.target_column}' non trouvée dans les données.")
-            raise ValueError(f"Colonne cible manquante: {self.target_column}")
-
-        X = data_df.drop(columns=[self.target_column, "test_id"], errors="ignore")
-        y = data_df[self.target_column]
-
-        # Séparation des données (simple pour l'exemple)
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        # Préparation et séparation des données (simple pour l'exemple)
+        if holdout:
+            X_train, X_test, y_train, y_test = self._split(data_df)
+        else:
+            (X_train, y_train), X_test = self._features(data_df), None
+        X_train, y_train = self._downsample(data_df, X_train, y_train)
 
         # Initialisation du modèle (XGBoost par défaut)
         model_type = self.config.get("model_type", "XGBClassifier")
@@ -69,14 +144,62 @@ class ModelTrainer:
 
         # Entraînement
         self.model.fit(X_train, y_train)
+        self._record_sampling()
         logger.success("Modèle entraîné avec succès.")
 
         # Évaluation rapide (pour information)
         train_score = self.model.score(X_train, y_train)
-        test_score = self.model.score(X_test, y_test)
         logger.info(f"Score d'entraînement (Accuracy): {train_score:.4f}")
-        logger.info(f"Score de test (Accuracy): {test_score:.4f}")
+        if X_test is not None:
+            test_score = self.model.score(X_test, y_test)
+            logger.info(f"Score de test (Accuracy): {test_score:.4f}")
+
+        return self.model
+
+    def search(self, data_df: pd.DataFrame, overrides: Optional[Dict[str, Any]] = None) -> SearchResult:
+        """
+        Recherche les meilleurs hyperparamètres (section `search` de la configuration).
 
+        Les essais tournent en parallèle et sont évalués sur le jeu de validation;
+        le meilleur modèle devient le modèle de l'entraîneur.
+
+        Args:
+            data_df: DataFrame contenant les caractéristiques et la colonne cible.
+            overrides: Valeurs remplaçant celles de la section `search` (ex: n_trials).
+
+        Returns:
+            Le résultat de la recherche.
+        """
+        logger.info(f"Démarrage de la recherche d'hyperparamètres avec {len(data_df)} échantillons.")
+        X_train, X_val, y_train, y_val = self._split(data_df)
+        X_train, y_train = self._downsample(data_df, X_train, y_train)
+
+        search_config = {**self.config.get("search", {}), **(overrides or {})}
+        result = HyperparameterSearch(search_config, base_params=self.model_params).run(
+            X_train, y_train, X_val, y_val
+        )
+        self.model = result.best_model
+        self.model_params = result.best_params
+        self._record_sampling()
+        logger.info(f"Score de validation du meilleur modèle: {result.best_score:.4f}")
+        return result
+
+    def train_external(
+        self,
+        paths: Sequence[str],
+        init_model: Optional[Union[str, Booster]] = None,
+    ) -> Booster:
+        """
+        Entraîne le modèle sur des fichiers Parquet lus par lots (mémoire externe).
+
+        Args:
+            paths: Fichiers Parquet d'entraînement.
+            init_model: Modèle à poursuivre sur ces données (chemin JSON ou Booster).
+
+        Returns:
+            Le Booster entraîné, sauvegardable par `save_model`.
+        """
+        self.model = ExternalMemoryTrainer(self.config).train(paths, init_model=init_model)
         return self.model
 
     def save_model(self, path: str) -> None:
@@ -90,15 +213,19 @@ class ModelTrainer:
             logger.warning("Aucun modèle à sauvegarder.")
             return
 
-        # Exemple de sauvegarde pour XGBoost
+        # Format natif XGBoost (JSON), relu par PredictiveTestSelector
         try:
-            # self.model.save_model(path)
-            logger.info(f"Modèle sauvegardé (simulé) dans: {path}")
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.model.save_model(path)
+            logger.info(f"Modèle sauvegardé dans: {path}")
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde du modèle: {e}")
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     # Création de données simulées
     data = {
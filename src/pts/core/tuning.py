@@ -0,0 +1,364 @@
+import json
+import math
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.metrics import log_loss, roc_auc_score
+from xgboost import XGBClassifier
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="tuning")
+
+# Espace de recherche par défaut (surchargé par la section `search.space` de la configuration)
+DEFAULT_SPACE: Dict[str, Dict[str, Any]] = {
+    "max_depth": {"type": "int", "low": 3, "high": 10},
+    "learning_rate": {"type": "float", "low": 0.01, "high": 0.3, "log": True},
+    "subsample": {"type": "float", "low": 0.5, "high": 1.0},
+    "colsample_bytree": {"type": "float", "low": 0.5, "high": 1.0},
+    "min_child_weight": {"type": "float", "low": 1.0, "high": 10.0, "log": True},
+    "gamma": {"type": "float", "low": 0.0, "high": 5.0},
+}
+
+# Métriques de validation: nom -> (fonction, True si plus grand est meilleur)
+METRICS = {
+    "logloss": (lambda y, p: log_loss(y, p, labels=[0, 1]), False),
+    "auc": (roc_auc_score, True),
+}
+
+
+class Trial(NamedTuple):
+    """Résultat d'une configuration à un palier de la recherche."""
+
+    trial_id: int
+    params: Dict[str, Any]
+    rung: int
+    n_estimators: int
+    score: float
+    duration: float
+
+
+class SearchResult(NamedTuple):
+    """Résultat d'une recherche d'hyperparamètres."""
+
+    run_id: str
+    best_params: Dict[str, Any]
+    best_score: float
+    best_model: XGBClassifier
+    trials: List[Trial]
+
+
+class RandomSampler:
+    """Échantillonnage aléatoire uniforme (ou log-uniforme) de l'espace de recherche."""
+
+    def __init__(self, space: Dict[str, Dict[str, Any]], seed: Optional[int] = None, maximize: bool = False) -> None:
+        self.space = space
+        self._rng = random.Random(seed)
+
+    def _draw(self, spec: Dict[str, Any]) -> Any:
+        if spec["type"] == "categorical":
+            return self._rng.choice(spec["choices"])
+        low, high = spec["low"], spec["high"]
+        if spec.get("log"):
+            value = math.exp(self._rng.uniform(math.log(low), math.log(high)))
+        else:
+            value = self._rng.uniform(low, high)
+        return int(round(value)) if spec["type"] == "int" else value
+
+    def ask(self) -> Tuple[Any, Dict[str, Any]]:
+        """Propose une configuration; retourne (jeton, paramètres)."""
+        return None, {name: self._draw(spec) for name, spec in self.space.items()}
+
+    def tell(self, token: Any, score: float) -> None:
+        """Sans effet: l'échantillonnage aléatoire ne tient pas compte des résultats."""
+
+
+class TPESampler:
+    """
+    Échantillonnage bayésien (TPE) via Optuna, en mode ask/tell.
+
+    Optuna est une dépendance optionnelle, importée seulement si ce sampler est utilisé.
+    """
+
+    def __init__(self, space: Dict[str, Dict[str, Any]], seed: Optional[int] = None, maximize: bool = False) -> None:
+        try:
+            import optuna
+        except ImportError:
+            raise ImportError("Le sampler 'tpe' nécessite optuna (pip install optuna).")
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        self._optuna = optuna
+        self.space = space
+        self.study = optuna.create_study(
+            direction="maximize" if maximize else "minimize",
+            sampler=optuna.samplers.TPESampler(seed=seed),
+        )
+
+    def _distribution(self, spec: Dict[str, Any]) -> Any:
+        distributions = self._optuna.distributions
+        if spec["type"] == "categorical":
+            return distributions.CategoricalDistribution(spec["choices"])
+        if spec["type"] == "int":
+            return distributions.IntDistribution(spec["low"], spec["high"], log=spec.get("log", False))
+        return distributions.FloatDistribution(spec["low"], spec["high"], log=spec.get("log", False))
+
+    def ask(self) -> Tuple[Any, Dict[str, Any]]:
+        """Propose une configuration; retourne (essai Optuna, paramètres)."""
+        trial = self.study.ask({name: self._distribution(spec) for name, spec in self.space.items()})
+        return trial, dict(trial.params)
+
+    def tell(self, token: Any, score: float) -> None:
+        """Transmet le score (au dernier palier atteint) au modèle TPE."""
+        self.study.tell(token, score)
+
+
+SAMPLERS = {"random": RandomSampler, "tpe": TPESampler}
+
+
+class TrialStore:
+    """
+    Journal local (SQLite) de tous les essais de recherche d'hyperparamètres.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: Chemin du fichier SQLite.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trials ("
+            " run_id TEXT NOT NULL, trial_id INTEGER NOT NULL, rung INTEGER NOT NULL,"
+            " n_estimators INTEGER NOT NULL, params TEXT NOT NULL, metric TEXT NOT NULL,"
+            " score REAL NOT NULL, duration REAL NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (run_id, trial_id, rung))"
+        )
+
+    def record(self, run_id: str, metric: str, trial: Trial) -> None:
+        """Enregistre un essai à un palier."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, trial.trial_id, trial.rung, trial.n_estimators, json.dumps(trial.params),
+                 metric, trial.score, trial.duration, time.time()),
+            )
+
+    def load(self, run_id: Optional[str] = None) -> pd.DataFrame:
+        """Retourne les essais enregistrés (d'une exécution ou de toutes)."""
+        query = "SELECT * FROM trials"
+        params: Tuple[Any, ...] = ()
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        with self._lock:
+            return pd.read_sql_query(query + " ORDER BY created_at", self._conn, params=params)
+
+    def close(self) -> None:
+        """Ferme la base SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+# Données de validation partagées par les processus de la recherche (voir _init_worker)
+_WORKER_DATA: Dict[str, Any] = {}
+
+
+def _init_worker(X_train: Any, y_train: Any, X_val: Any, y_val: Any) -> None:
+    # Les jeux de données sont transmis une seule fois par processus, pas à chaque essai
+    _WORKER_DATA.update(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val)
+
+
+def _run_trial(
+    params: Dict[str, Any],
+    rounds: int,
+    init_model: Optional[bytes],
+    n_jobs: int,
+    metric: str,
+) -> Tuple[float, bytes, float]:
+    """
+    Entraîne `rounds` arbres supplémentaires (à partir de `init_model`) et évalue
+    la configuration sur le jeu de validation.
+
+    Returns:
+        (score, modèle sérialisé, durée en secondes).
+    """
+    start = time.perf_counter()
+    model = XGBClassifier(eval_metric="logloss", tree_method="hist", n_jobs=n_jobs, n_estimators=rounds, **params)
+    booster = pickle.loads(init_model).get_booster() if init_model is not None else None
+    model.fit(_WORKER_DATA["X_train"], _WORKER_DATA["y_train"], xgb_model=booster)
+    probabilities = model.predict_proba(_WORKER_DATA["X_val"])[:, 1]
+    score = float(METRICS[metric][0](_WORKER_DATA["y_val"], probabilities))
+    return score, pickle.dumps(model), time.perf_counter() - start
+
+
+def partition_cores(n_parallel: int, n_cores: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Répartit les cœurs entre essais parallèles et threads XGBoost.
+
+    Args:
+        n_parallel: Nombre d'essais qui pourraient tourner en même temps.
+        n_cores: Cœurs disponibles (par défaut: os.cpu_count()).
+
+    Returns:
+        (processus, threads par processus) avec processus * threads <= cœurs.
+    """
+    n_cores = n_cores or os.cpu_count() or 1
+    workers = max(1, min(n_parallel, n_cores))
+    return workers, max(1, n_cores // workers)
+
+
+class HyperparameterSearch:
+    """
+    Recherche d'hyperparamètres XGBoost par successive halving.
+
+    Chaque tranche ("bracket") tire `n_configs` configurations du sampler, les
+    entraîne avec `min_resource` arbres, garde le meilleur tiers (`reduction_factor`),
+    poursuit leur entraînement jusqu'au palier suivant, et ainsi de suite jusqu'à
+    `max_resource` arbres. Les arbres déjà construits sont conservés d'un palier
+    à l'autre. Avec le sampler TPE, chaque tranche profite des résultats des précédentes.
+    """
+
+    def __init__(self, config: Dict[str, Any], base_params: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Args:
+            config: Section `search` de la configuration du modèle.
+            base_params: Paramètres fixes communs à tous les essais (ex: random_state).
+        """
+        self.space = config.get("space") or DEFAULT_SPACE
+        self.sampler_name = config.get("sampler", "random")
+        self.n_trials = int(config.get("n_trials", 27))
+        self.n_brackets = int(config.get("n_brackets", 1))
+        self.min_resource = int(config.get("min_resource", 50))
+        self.max_resource = int(config.get("max_resource", 400))
+        self.reduction_factor = int(config.get("reduction_factor", 3))
+        self.metric = config.get("metric", "logloss")
+        self.n_cores = config.get("n_cores")
+        self.seed = config.get("seed", 42)
+        self.trials_path = config.get("trials_path", "models/trials.sqlite")
+        if self.metric not in METRICS:
+            raise ValueError(f"Métrique inconnue: {self.metric} (disponibles: {sorted(METRICS)})")
+        if self.sampler_name not in SAMPLERS:
+            raise ValueError(f"Sampler inconnu: {self.sampler_name} (disponibles: {sorted(SAMPLERS)})")
+
+        # Les paramètres recherchés et la taille des modèles sont fixés par la recherche
+        self.base_params = {
+            k: v for k, v in (base_params or {}).items()
+            if k not in self.space and k not in ("n_estimators", "n_jobs")
+        }
+
+    def rungs(self) -> List[int]:
+        """Nombre d'arbres à chaque palier (min_resource, x facteur, ..., max_resource)."""
+        rungs = [self.min_resource]
+        while rungs[-1] * self.reduction_factor < self.max_resource:
+            rungs.append(rungs[-1] * self.reduction_factor)
+        if rungs[-1] < self.max_resource:
+            rungs.append(self.max_resource)
+        return rungs
+
+    def run(
+        self,
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_val: pd.DataFrame,
+        y_val: pd.Series,
+    ) -> SearchResult:
+        """
+        Exécute la recherche.
+
+        Returns:
+            La meilleure configuration, son score et le modèle correspondant.
+        """
+        run_id = uuid.uuid4().hex[:12]
+        maximize = METRICS[self.metric][1]
+        sampler = SAMPLERS[self.sampler_name](self.space, seed=self.seed, maximize=maximize)
+        store = TrialStore(self.trials_path)
+        rungs = self.rungs()
+        per_bracket = max(1, math.ceil(self.n_trials / self.n_brackets))
+        workers, threads = partition_cores(per_bracket, self.n_cores)
+        logger.info(
+            f"Recherche {run_id}: {self.n_trials} essais ({self.sampler_name}), paliers {rungs}, "
+            f"{workers} processus x {threads} threads XGBoost."
+        )
+
+        trials: List[Trial] = []
+        best: Optional[Tuple[float, Dict[str, Any], bytes]] = None
+        next_id = 0
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(X_train, y_train, X_val, y_val)
+        ) as pool:
+            for _ in range(self.n_brackets):
+                n_configs = min(per_bracket, self.n_trials - next_id)
+                if n_configs <= 0:
+                    break
+                # (id, jeton du sampler, paramètres, modèle courant, dernier score)
+                alive = []
+                for _ in range(n_configs):
+                    token, params = sampler.ask()
+                    alive.append([next_id, token, params, None, None])
+                    next_id += 1
+
+                trained = 0
+                for rung, n_estimators in enumerate(rungs):
+                    # Les threads XGBoost s'adaptent au nombre d'essais restant à ce palier
+                    _, threads = partition_cores(len(alive), self.n_cores)
+                    futures = [
+                        pool.submit(
+                            _run_trial, {**self.base_params, **entry[2]}, n_estimators - trained,
+                            entry[3], threads, self.metric,
+                        )
+                        for entry in alive
+                    ]
+                    for entry, future in zip(alive, futures):
+                        score, model_bytes, duration = future.result()
+                        entry[3], entry[4] = model_bytes, score
+                        trial = Trial(entry[0], entry[2], rung, n_estimators, score, duration)
+                        trials.append(trial)
+                        store.record(run_id, self.metric, trial)
+                    trained = n_estimators
+
+                    alive.sort(key=lambda entry: entry[4], reverse=maximize)
+                    if rung < len(rungs) - 1:
+                        keep = max(1, len(alive) // self.reduction_factor)
+                        for entry in alive[keep:]:
+                            sampler.tell(entry[1], entry[4])  # Arrêt anticipé: score du palier atteint
+                        alive = alive[:keep]
+
+                for entry in alive:
+                    sampler.tell(entry[1], entry[4])
+                    if best is None or (entry[4] > best[0] if maximize else entry[4] < best[0]):
+                        best = (entry[4], entry[2], entry[3])
+
+        store.close()
+        best_score, best_params, best_bytes = best
+        best_model = pickle.loads(best_bytes)
+        best_model.set_params(n_estimators=rungs[-1])
+        logger.success(f"Meilleure configuration ({self.metric}={best_score:.4f}): {best_params}")
+        return SearchResult(run_id, {**self.base_params, **best_params, "n_estimators": rungs[-1]},
+                            best_score, best_model, trials)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation sur des données simulées
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"feature_churn": rng.random(2000), "feature_history": rng.random(2000)})
+    y = pd.Series((X["feature_churn"] + 0.3 * rng.random(2000) > 0.9).astype(int))
+    search = HyperparameterSearch({"n_trials": 9, "min_resource": 10, "max_resource": 90,
+                                   "trials_path": "/tmp/pts_trials.sqlite"})
+    result = search.run(X[:1500], y[:1500], X[1500:], y[1500:])
+    logger.info(f"Meilleurs paramètres: {result.best_params}")
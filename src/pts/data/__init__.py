@@ -1,5 +1,19 @@
-from .collector import DataCollector
-from .processor import DataProcessor
-from .validator import DataValidator
+from typing import TYPE_CHECKING
+
+from pts.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .collector import DataCollector
+    from .processor import DataProcessor
+    from .validator import DataValidator
 
 __all__ = ["DataCollector", "DataProcessor", "DataValidator"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "DataCollector": ".collector",
+        "DataProcessor": ".processor",
+        "DataValidator": ".validator",
+    },
+)
@@ -5,9 +5,9 @@ import pandas as pd
 from loguru import logger
 
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 from scripts.miner import GitMiner # Réutilisation du GitMiner
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="data_collector")
 
@@ -67,6 +67,7 @@ class DataCollector:
         logger.info(f"Collecte terminée. {len(df)} résultats de tests simulés.")
         return df
 
+    @profiled_stage("collection")
     def run_collection_pipeline(self) -> Dict[str, pd.DataFrame]:
         """
         Exécute le pipeline complet de collecte de données.
@@ -84,6 +85,7 @@ class DataCollector:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     # Assurez-vous d'être dans un répertoire Git
     try:
@@ -0,0 +1,186 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from pts.data.queue import DurableQueue, Job
+from pts.data.store import DataStore
+from pts.integrations.jenkins import JenkinsHarvester, JenkinsIntegration
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="event_processor")
+
+# Types de tâches produites par les webhooks
+GITHUB_PUSH = "github_push"
+GITLAB_PUSH = "gitlab_push"
+JENKINS_BUILD = "jenkins_build"
+
+
+def jenkins_from_env() -> Optional[JenkinsIntegration]:
+    """
+    Crée l'intégration Jenkins configurée par $PTS_JENKINS_URL, $PTS_JENKINS_USER
+    et $PTS_JENKINS_TOKEN (None si l'URL n'est pas définie).
+    """
+    url = os.getenv("PTS_JENKINS_URL")
+    if not url:
+        return None
+    return JenkinsIntegration(url, os.getenv("PTS_JENKINS_USER", ""), os.getenv("PTS_JENKINS_TOKEN", ""))
+
+
+def push_commits(payload: Dict[str, Any], repository: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Extrait les commits d'un événement push (format commun GitHub et GitLab).
+
+    Args:
+        payload: Contenu du webhook.
+        repository: Nom complet du dépôt.
+
+    Returns:
+        Commits au format de `DataStore.upsert_commits`.
+    """
+    commits = []
+    for commit in payload.get("commits") or []:
+        changed_files = []
+        for key in ("added", "modified", "removed"):
+            changed_files.extend(commit.get(key) or [])
+        commits.append({
+            "sha": commit["id"],
+            "repository": repository,
+            "author": (commit.get("author") or {}).get("name"),
+            "committed_date": commit.get("timestamp"),
+            "message": commit.get("message"),
+            "changed_files": sorted(set(changed_files)),
+        })
+    return commits
+
+
+class EventProcessor:
+    """
+    Applique les événements reçus par webhook au stockage local.
+    """
+
+    def __init__(self, store: DataStore, jenkins: Optional[JenkinsIntegration] = None) -> None:
+        """
+        Initialise le processeur.
+
+        Args:
+            store: Stockage des commits, résultats et agrégats.
+            jenkins: Intégration utilisée pour récupérer les rapports de tests.
+        """
+        self.store = store
+        self.jenkins = jenkins
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            GITHUB_PUSH: self.handle_github_push,
+            GITLAB_PUSH: self.handle_gitlab_push,
+            JENKINS_BUILD: self.handle_jenkins_build,
+        }
+
+    def process(self, job: Job) -> None:
+        """
+        Traite une tâche de la file.
+
+        Raises:
+            ValueError: Si le type de tâche est inconnu.
+        """
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            raise ValueError(f"Type de tâche inconnu: {job.kind}")
+        handler(job.payload)
+
+    def handle_github_push(self, payload: Dict[str, Any]) -> None:
+        """Enregistre les commits d'un événement push GitHub."""
+        repository = (payload.get("repository") or {}).get("full_name")
+        count = self.store.upsert_commits(push_commits(payload, repository))
+        logger.info(f"Push GitHub {repository}: {count} commits enregistrés.")
+
+    def handle_gitlab_push(self, payload: Dict[str, Any]) -> None:
+        """Enregistre les commits d'un événement "Push Hook" GitLab."""
+        repository = (payload.get("project") or {}).get("path_with_namespace")
+        count = self.store.upsert_commits(push_commits(payload, repository))
+        logger.info(f"Push GitLab {repository}: {count} commits enregistrés.")
+
+    def handle_jenkins_build(self, payload: Dict[str, Any]) -> None:
+        """Récolte les résultats de tests d'une construction Jenkins terminée."""
+        if self.jenkins is None:
+            raise RuntimeError("Intégration Jenkins non configurée ($PTS_JENKINS_URL).")
+        build = payload["build"]
+        commit_hash = (build.get("scm") or {}).get("commit")
+        harvester = JenkinsHarvester(self.jenkins, payload["name"])
+        rows = harvester.harvest_build(int(build["number"]), commit_hash=commit_hash)
+        inserted = self.store.record_test_results(rows)
+        logger.info(f"Construction {payload['name']}#{build['number']}: {inserted} résultats de tests enregistrés.")
+
+
+class IngestionWorker(threading.Thread):
+    """
+    Thread d'arrière-plan qui consomme la file d'ingestion.
+
+    Une tâche en échec est remise en file avec un backoff exponentiel, puis
+    abandonnée après le nombre maximal de tentatives de la file.
+    """
+
+    def __init__(
+        self,
+        queue: DurableQueue,
+        processor: EventProcessor,
+        batch_size: int = 10,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            queue: File d'ingestion.
+            processor: Processeur des événements.
+            batch_size: Tâches réservées à la fois.
+            poll_interval: Attente maximale entre deux consultations d'une file vide (secondes).
+        """
+        super().__init__(name="pts-ingestion-worker", daemon=True)
+        self.queue = queue
+        self.processor = processor
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stopping = threading.Event()
+
+    def run_once(self) -> int:
+        """Traite un lot de tâches et retourne le nombre de tâches réservées."""
+        jobs = self.queue.claim(self.batch_size)
+        for job in jobs:
+            try:
+                self.processor.process(job)
+            except Exception as e:
+                logger.warning(f"Échec de la tâche {job.id} ({job.kind}, tentative {job.attempts}): {e}")
+                self.queue.nack(job, repr(e))
+            else:
+                self.queue.ack(job.id)
+        return len(jobs)
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception as e:
+                logger.error(f"Erreur du worker d'ingestion: {e}")
+            # Réveillé immédiatement par un `put` du même processus
+            self.queue.wait(self.poll_interval)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Arrête le thread après la tâche en cours."""
+        self._stopping.set()
+        self.queue.notify()
+        self.join(timeout)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation
+    queue = DurableQueue("/tmp/pts_queue.sqlite")
+    store = DataStore("/tmp/pts_store.sqlite")
+    queue.put(GITHUB_PUSH, {
+        "repository": {"full_name": "owner/repo"},
+        "commits": [{"id": "abc", "message": "fix", "timestamp": "2024-01-01T00:00:00Z",
+                     "author": {"name": "Dev"}, "added": [], "modified": ["src/a.py"], "removed": []}],
+    })
+    IngestionWorker(queue, EventProcessor(store)).run_once()
+    logger.info(f"Commit enregistré: {store.get_commit('abc')}")
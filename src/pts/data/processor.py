@@ -4,8 +4,8 @@ import pandas as pd
 from loguru import logger
 
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="data_processor")
 
@@ -91,6 +91,7 @@ class DataProcessor:
         logger.info(f"Fusion terminée. {len(merged_df)} lignes.")
         return merged_df
 
+    @profiled_stage("processing")
     def run_processing_pipeline(self, raw_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         """
         Exécute le pipeline complet de traitement des données.
@@ -111,6 +112,7 @@ class DataProcessor:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (nécessite des données brutes)
     # Simulation de données brutes
     raw_commits = {
@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="durable_queue")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+"""
+
+
+class Job(NamedTuple):
+    """Tâche réservée par un worker."""
+
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class DurableQueue:
+    """
+    File de tâches persistante adossée à SQLite.
+
+    Une tâche réservée par `claim` est louée pour une durée limitée: si le
+    worker meurt avant `ack`, elle redevient disponible à l'expiration du bail.
+    La file peut être partagée par plusieurs processus (workers de l'API).
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 5) -> None:
+        """
+        Ouvre (ou crée) la file.
+
+        Args:
+            path: Chemin du fichier SQLite.
+            lease_seconds: Durée du bail d'une tâche réservée.
+            max_attempts: Nombre de tentatives avant de placer la tâche en échec définitif.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._available = threading.Event()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def put(self, kind: str, payload: Dict[str, Any]) -> int:
+        """
+        Ajoute une tâche à la file.
+
+        Args:
+            kind: Type de tâche (ex: "github_push").
+            payload: Contenu JSON de la tâche.
+
+        Returns:
+            Identifiant de la tâche.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (kind, payload, available_at, created_at) VALUES (?, ?, ?, ?)",
+                (kind, json.dumps(payload), now, now),
+            )
+        self.notify()
+        return cursor.lastrowid
+
+    def claim(self, limit: int = 10) -> List[Job]:
+        """
+        Réserve jusqu'à `limit` tâches disponibles (en attente ou au bail expiré).
+
+        Une tâche dont le bail expire après `max_attempts` réservations passe en
+        échec définitif au lieu d'être réservée à nouveau.
+
+        Args:
+            limit: Nombre maximal de tâches réservées.
+
+        Returns:
+            Les tâches réservées, dans l'ordre d'arrivée.
+        """
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE: deux processus ne peuvent pas réserver la même tâche
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Bail expiré après la dernière tentative: le worker a planté ou bloqué à chaque fois
+                expired = self._conn.execute(
+                    "UPDATE jobs SET status = 'dead', last_error = 'bail expiré après la dernière tentative'"
+                    " WHERE status = 'processing' AND available_at <= ? AND attempts >= ?",
+                    (now, self.max_attempts),
+                ).rowcount
+                rows = self._conn.execute(
+                    "SELECT id, kind, payload, attempts FROM jobs"
+                    " WHERE status IN ('pending', 'processing') AND available_at <= ?"
+                    " ORDER BY id LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET status = 'processing', attempts = attempts + 1, available_at = ?"
+                    " WHERE id = ?",
+                    [(now + self.lease_seconds, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if expired:
+            logger.error(f"{expired} tâche(s) abandonnée(s) après {self.max_attempts} baux expirés.")
+        return [Job(job_id, kind, json.loads(payload), attempts + 1) for job_id, kind, payload, attempts in rows]
+
+    def ack(self, job_id: int) -> None:
+        """Supprime une tâche traitée avec succès."""
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def nack(self, job: Job, error: str, delay: Optional[float] = None) -> None:
+        """
+        Remet une tâche en file après un échec, ou la place en échec définitif.
+
+        Args:
+            job: Tâche en échec.
+            error: Description de l'erreur.
+            delay: Délai avant nouvelle tentative (par défaut: backoff exponentiel).
+        """
+        if delay is None:
+            delay = min(300.0, 2.0 ** job.attempts)
+        status = "dead" if job.attempts >= self.max_attempts else "pending"
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, last_error = ? WHERE id = ?",
+                (status, time.time() + delay, error, job.id),
+            )
+        if status == "dead":
+            logger.error(f"Tâche {job.id} ({job.kind}) abandonnée après {job.attempts} tentatives: {error}")
+
+    def notify(self) -> None:
+        """Réveille les workers de ce processus en attente dans `wait`."""
+        self._available.set()
+
+    def wait(self, timeout: float) -> None:
+        """Attend qu'une tâche soit ajoutée par ce processus (ou l'expiration du délai)."""
+        self._available.wait(timeout)
+        self._available.clear()
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre de tâches par statut (pending, processing, dead)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {"pending": 0, "processing": 0, "dead": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def __len__(self) -> int:
+        counts = self.counts()
+        return counts["pending"] + counts["processing"]
+
+    def close(self) -> None:
+        """Ferme la base SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation
+    queue = DurableQueue("/tmp/pts_queue.sqlite")
+    queue.put("github_push", {"commits": []})
+    for job in queue.claim():
+        logger.info(f"Tâche réservée: {job}")
+        queue.ack(job.id)
@@ -0,0 +1,194 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="data_store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    repository TEXT,
+    author TEXT,
+    committed_date TEXT,
+    message TEXT,
+    changed_files TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    test_id TEXT NOT NULL,
+    commit_hash TEXT NOT NULL,
+    test_failed INTEGER NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (test_id, commit_hash)
+);
+CREATE TABLE IF NOT EXISTS test_stats (
+    test_id TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    recent_failure_rate REAL NOT NULL,
+    last_failed_at REAL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Poids d'une nouvelle exécution dans le taux d'échec récent (moyenne mobile exponentielle)
+RECENT_WEIGHT = 0.1
+
+
+class DataStore:
+    """
+    Stockage local (SQLite) des commits, des résultats de tests et des
+    agrégats d'échecs par test, alimenté en continu par l'ingestion.
+
+    Les agrégats (exécutions, échecs, taux d'échec récent) sont mis à jour de
+    façon incrémentale à chaque résultat nouveau; un résultat déjà connu pour
+    le même couple (test, commit) est ignoré, ce qui rend l'ingestion idempotente.
+    """
+
+    def __init__(self, path: str, recent_weight: float = RECENT_WEIGHT) -> None:
+        """
+        Ouvre (ou crée) le stockage.
+
+        Args:
+            path: Chemin du fichier SQLite.
+            recent_weight: Poids d'une exécution dans le taux d'échec récent.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.recent_weight = recent_weight
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def upsert_commits(self, commits: Iterable[Dict[str, Any]]) -> int:
+        """
+        Enregistre ou met à jour des commits.
+
+        Args:
+            commits: Dictionnaires {sha, repository, author, committed_date, message, changed_files}.
+
+        Returns:
+            Nombre de commits enregistrés.
+        """
+        rows = [
+            (c["sha"], c.get("repository"), c.get("author"), c.get("committed_date"),
+             c.get("message"), json.dumps(c.get("changed_files", [])))
+            for c in commits
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def record_test_results(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Enregistre des résultats de tests et met à jour les agrégats par test.
+
+        Args:
+            rows: Lignes au format de `collect_test_results` (test_id, commit_hash, test_failed).
+
+        Returns:
+            Nombre de résultats nouveaux (les doublons sont ignorés).
+        """
+        now = time.time()
+        weight = self.recent_weight
+        inserted = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for row in rows:
+                    failed = int(row["test_failed"])
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO test_results VALUES (?, ?, ?, ?)",
+                        (row["test_id"], row["commit_hash"], failed, now),
+                    )
+                    if not cursor.rowcount:
+                        continue
+                    inserted += 1
+                    self._conn.execute(
+                        "INSERT INTO test_stats VALUES (?, 1, ?, ?, ?, ?)"
+                        " ON CONFLICT (test_id) DO UPDATE SET"
+                        " runs = runs + 1,"
+                        " failures = failures + excluded.failures,"
+                        " recent_failure_rate = recent_failure_rate * ? + excluded.failures * ?,"
+                        " last_failed_at = COALESCE(excluded.last_failed_at, last_failed_at),"
+                        " updated_at = excluded.updated_at",
+                        (row["test_id"], failed, float(failed), now if failed else None, now,
+                         1.0 - weight, weight),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return inserted
+
+    def get_commit(self, sha: str) -> Optional[Dict[str, Any]]:
+        """Retourne un commit enregistré, ou None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha, repository, author, committed_date, message, changed_files"
+                " FROM commits WHERE sha = ?",
+                (sha,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("sha", "repository", "author", "committed_date", "message", "changed_files")
+        commit = dict(zip(keys, row))
+        commit["changed_files"] = json.loads(commit["changed_files"])
+        return commit
+
+    def failure_stats(self, test_ids: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Retourne les agrégats d'échecs par test.
+
+        Args:
+            test_ids: Tests à inclure (par défaut: tous).
+
+        Returns:
+            DataFrame (test_id, runs, failures, failure_rate, recent_failure_rate, last_failed_at).
+        """
+        query = "SELECT test_id, runs, failures, recent_failure_rate, last_failed_at FROM test_stats"
+        params: List[Any] = []
+        if test_ids is not None:
+            query += f" WHERE test_id IN ({','.join('?' * len(test_ids))})"
+            params = list(test_ids)
+        with self._lock:
+            df = pd.read_sql_query(query, self._conn, params=params)
+        df.insert(3, "failure_rate", df["failures"] / df["runs"])
+        return df
+
+    def test_results(self) -> pd.DataFrame:
+        """Retourne tous les résultats au format de `collect_test_results`."""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT test_id, commit_hash, test_failed FROM test_results", self._conn
+            )
+
+    def close(self) -> None:
+        """Ferme la base SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation
+    store = DataStore("/tmp/pts_store.sqlite")
+    store.record_test_results([
+        {"test_id": "test_a", "commit_hash": "abc", "test_failed": 1},
+        {"test_id": "test_a", "commit_hash": "def", "test_failed": 0},
+    ])
+    logger.info(f"Agrégats:\n{store.failure_stats()}")
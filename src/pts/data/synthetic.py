@@ -0,0 +1,378 @@
+import os
+import subprocess
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from pts.data.store import DataStore
+from pts.utils.logger import setup_logging
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Dépendance optionnelle (extra "parquet")
+    pq = None
+
+logger.disable("pts")
+logger = logger.bind(name="synthetic")
+
+COMMIT_TYPES = ("feat", "fix", "refactor", "test", "docs", "chore")
+
+# Premier commit synthétique: 2024-01-01 00:00 UTC, puis un commit par heure en moyenne
+START_TIMESTAMP = 1704067200
+COMMIT_INTERVAL = 3600
+
+# Fichiers par module: un test couvre les fichiers d'un module
+FILES_PER_MODULE = 20
+
+# Résultats de tests par bloc: les blocs sont tirés indépendamment (graine dérivée
+# de leur index) et bornent la mémoire, quel que soit le nombre de commits
+BLOCK_ROWS = 1_000_000
+
+# Lignes ajoutées au plus par fichier modifié (queue de la loi de Pareto)
+MAX_LINES = 2000
+
+FORMATS = ("csv", "parquet", "sqlite")
+
+# Contenu des fichiers du dépôt Git: les n premières lignes sont un préfixe de ce texte
+_LINES = "".join(f"line {k}\n" for k in range(MAX_LINES)).encode()
+_LINE_ENDS = np.cumsum([len(f"line {k}\n") for k in range(MAX_LINES)])
+
+
+class SyntheticHistory(NamedTuple):
+    """Historique synthétique aux formats des étapes de collecte."""
+
+    commits: pd.DataFrame  # schéma de GitMiner.mine_history
+    changes: pd.DataFrame  # une ligne par (commit, fichier modifié)
+    test_results: pd.DataFrame  # schéma de DataCollector.collect_test_results, plus la durée
+
+
+class SyntheticGenerator:
+    """
+    Générateur déterministe d'historiques de dépôt et de CI à grande échelle.
+
+    - churn des fichiers en loi de puissance (loi de Zipf: quelques fichiers
+      concentrent la plupart des modifications);
+    - auteurs en loi de Zipf, les auteurs occasionnels cassant plus souvent les tests;
+    - échecs corrélés aux fichiers: un test couvre un module et échoue plus souvent
+      quand le commit le modifie, proportionnellement au churn;
+    - tests instables (flaky) qui échouent au hasard, indépendamment des changements.
+
+    L'historique est produit par blocs d'environ BLOCK_ROWS résultats: un bloc ne
+    dépend que de la graine et de son index, ce qui permet d'écrire des millions de
+    commits sans jamais les garder en mémoire.
+    """
+
+    def __init__(
+        self,
+        n_commits: int,
+        n_tests: int,
+        n_files: int,
+        n_authors: int = 20,
+        tests_per_commit: Optional[int] = None,
+        failure_rate: float = 0.01,
+        coupling: float = 0.3,
+        flaky_rate: float = 0.02,
+        flaky_probability: float = 0.05,
+        churn_exponent: float = 1.1,
+        author_exponent: float = 1.2,
+        seed: int = 0,
+    ) -> None:
+        """
+        Args:
+            n_commits: Nombre de commits.
+            n_tests: Nombre de tests de la suite.
+            n_files: Nombre de fichiers du dépôt.
+            n_authors: Nombre d'auteurs.
+            tests_per_commit: Tests exécutés par commit (par défaut: toute la suite).
+            failure_rate: Probabilité d'échec d'un test non concerné par le commit.
+            coupling: Hausse maximale de la probabilité d'échec quand le commit modifie le module du test.
+            flaky_rate: Proportion de tests instables.
+            flaky_probability: Probabilité d'échec aléatoire d'un test instable.
+            churn_exponent: Exposant de la loi de Zipf des fichiers modifiés.
+            author_exponent: Exposant de la loi de Zipf des auteurs.
+            seed: Graine.
+        """
+        self.n_commits = n_commits
+        self.n_tests = n_tests
+        self.n_files = n_files
+        self.n_authors = n_authors
+        self.tests_per_commit = min(tests_per_commit or n_tests, n_tests)
+        self.failure_rate = failure_rate
+        self.coupling = coupling
+        self.flaky_probability = flaky_probability
+        self.seed = seed
+        self.block_commits = max(1, BLOCK_ROWS // self.tests_per_commit)
+        self.n_modules = max(1, -(-n_files // FILES_PER_MODULE))
+
+        # Propriétés fixes du dépôt, tirées une fois pour toutes
+        rng = np.random.default_rng([seed, 0])
+        self.file_weights = self._zipf(n_files, churn_exponent)[rng.permutation(n_files)]
+        self.author_weights = self._zipf(n_authors, author_exponent)
+        # Les auteurs les moins actifs (rang élevé) cassent jusqu'à deux fois plus souvent
+        self.author_risk = 1.0 + np.arange(n_authors) / max(1, n_authors - 1)
+        self.test_module = rng.integers(0, self.n_modules, n_tests)
+        self.test_flaky = rng.random(n_tests) < flaky_rate
+        self.test_duration = rng.lognormal(np.log(5.0), 1.0, n_tests)
+        self.test_names = np.array([f"test_{j}" for j in range(n_tests)])
+        # Pas premiers avec n_tests: (début + pas * k) % n_tests parcourt des tests distincts
+        candidates = np.arange(1, min(n_tests, 1000) + 1)
+        self.test_steps = candidates[np.gcd(candidates, n_tests) == 1]
+
+    @staticmethod
+    def _zipf(n: int, exponent: float) -> np.ndarray:
+        """Probabilités de la loi de Zipf sur n rangs."""
+        weights = 1.0 / np.arange(1, n + 1) ** exponent
+        return weights / weights.sum()
+
+    @property
+    def n_blocks(self) -> int:
+        return -(-self.n_commits // self.block_commits)
+
+    def block(self, index: int) -> SyntheticHistory:
+        """Génère le bloc `index` (commits [index * block_commits, ...))."""
+        first = index * self.block_commits
+        n = min(self.block_commits, self.n_commits - first)
+        rng = np.random.default_rng([self.seed, 1, index])
+
+        raw_hashes = rng.bytes(20 * n).hex()
+        hashes = np.array([raw_hashes[40 * i: 40 * (i + 1)] for i in range(n)])
+        authors = rng.choice(self.n_authors, n, p=self.author_weights)
+        # Processus de Poisson: dates uniformes triées sur la période du bloc
+        dates = START_TIMESTAMP + (first + np.sort(rng.random(n)) * n) * COMMIT_INTERVAL
+        types = rng.integers(0, len(COMMIT_TYPES), n)
+
+        # Fichiers modifiés (au moins un), choisis selon leur churn; lignes en loi de Pareto
+        files_changed = rng.geometric(0.4, n)
+        change_commit = np.repeat(np.arange(n), files_changed)
+        change_file = rng.choice(self.n_files, len(change_commit), p=self.file_weights)
+        insertions = np.minimum(1 + rng.pareto(1.5, len(change_commit)) * 10, MAX_LINES).astype(np.int64)
+        deletions = rng.binomial(insertions, 0.4)
+        commit_insertions = np.bincount(change_commit, weights=insertions, minlength=n).astype(np.int64)
+        commit_deletions = np.bincount(change_commit, weights=deletions, minlength=n).astype(np.int64)
+        churn = commit_insertions + commit_deletions
+
+        commits = pd.DataFrame({
+            "commit_hash": hashes,
+            "author_name": [f"author_{a}" for a in authors],
+            "author_email": [f"author_{a}@example.com" for a in authors],
+            "committed_date": dates.astype(np.int64),
+            "message": [f"{COMMIT_TYPES[t]}: change {first + i}" for i, t in enumerate(types)],
+            "insertions": commit_insertions,
+            "deletions": commit_deletions,
+            "files_changed": files_changed,
+            "churn": churn,
+        })
+        changes = pd.DataFrame({
+            "commit_hash": hashes[change_commit],
+            "path": [f"src/module_{f // FILES_PER_MODULE}/file_{f}.py" for f in change_file],
+            "insertions": insertions,
+            "deletions": deletions,
+        })
+
+        # Tests exécutés: toute la suite, ou un parcours (début, pas) propre à chaque commit
+        k = self.tests_per_commit
+        if k == self.n_tests:
+            tests = np.tile(np.arange(k), n)
+        else:
+            starts = rng.integers(0, self.n_tests, n)
+            steps = self.test_steps[rng.integers(0, len(self.test_steps), n)]
+            tests = ((starts[:, None] + steps[:, None] * np.arange(k)) % self.n_tests).ravel()
+        run_commit = np.repeat(np.arange(n), k)
+
+        # Le commit modifie-t-il le module couvert par le test ?
+        touched = np.unique(change_commit * self.n_modules + change_file // FILES_PER_MODULE)
+        hit = np.isin(run_commit * self.n_modules + self.test_module[tests], touched, assume_unique=False)
+        risk = np.minimum(1.0, churn / 200.0) * self.author_risk[authors]
+        probability = self.failure_rate + self.coupling * hit * risk[run_commit]
+        probability = 1.0 - (1.0 - probability) * (1.0 - self.flaky_probability * self.test_flaky[tests])
+        failed = rng.random(len(tests)) < probability
+
+        test_results = pd.DataFrame({
+            "test_id": self.test_names[tests],
+            "commit_hash": hashes[run_commit],
+            "test_failed": failed.astype(np.int64),
+            "duration": self.test_duration[tests] * rng.lognormal(0.0, 0.1, len(tests)),
+        })
+        return SyntheticHistory(commits, changes, test_results)
+
+    def iter_blocks(self) -> Iterator[SyntheticHistory]:
+        """Produit l'historique bloc par bloc, dans l'ordre chronologique."""
+        for index in range(self.n_blocks):
+            yield self.block(index)
+
+    def generate(self) -> SyntheticHistory:
+        """Génère tout l'historique en mémoire (petites tailles)."""
+        blocks = list(self.iter_blocks())
+        history = SyntheticHistory(*(pd.concat(parts, ignore_index=True) for parts in zip(*blocks)))
+        logger.info(
+            f"Historique synthétique: {self.n_commits} commits, {len(history.changes)} fichiers modifiés, "
+            f"{len(history.test_results)} résultats de tests ({history.test_results['test_failed'].mean():.2%} d'échecs)."
+        )
+        return history
+
+
+def generate_history(
+    n_commits: int,
+    n_tests: int,
+    n_files: int,
+    n_authors: int = 20,
+    failure_rate: float = 0.01,
+    seed: int = 0,
+) -> SyntheticHistory:
+    """
+    Génère en mémoire un historique où chaque commit exécute toute la suite.
+
+    Raccourci de `SyntheticGenerator(...).generate()`; le même `seed` donne
+    toujours le même historique.
+    """
+    return SyntheticGenerator(
+        n_commits, n_tests, n_files, n_authors=n_authors, failure_rate=failure_rate, seed=seed
+    ).generate()
+
+
+def _fast_import_block(block: SyntheticHistory, first_mark: int) -> bytes:
+    """Flux `git fast-import` d'un bloc (un commit par mark, sur refs/heads/main)."""
+    changes = block.changes
+    bounds = np.concatenate(([0], np.cumsum(block.commits["files_changed"].to_numpy())))
+    paths, lines_added = changes["path"].to_numpy(), changes["insertions"].to_numpy()
+    stream = []
+    for i, commit in enumerate(block.commits.itertuples(index=False)):
+        mark = first_mark + i
+        message = commit.message.encode()
+        identity = f"{commit.author_name} <{commit.author_email}> {commit.committed_date} +0000"
+        stream.append(f"commit refs/heads/main\nmark :{mark}\nauthor {identity}\ncommitter {identity}\n".encode())
+        stream.append(f"data {len(message)}\n".encode() + message + b"\n")
+        if mark > 1:
+            stream.append(f"from :{mark - 1}\n".encode())
+        for j in range(bounds[i], bounds[i + 1]):
+            # En-tête propre au commit: le fichier change même à nombre de lignes égal
+            content = f"commit {mark}\n".encode() + _LINES[: _LINE_ENDS[lines_added[j] - 1]]
+            stream.append(f"M 100644 inline {paths[j]}\ndata {len(content)}\n".encode() + content + b"\n")
+    return b"".join(stream)
+
+
+def write_git_repo(history: Union[SyntheticHistory, Iterable[SyntheticHistory]], path: str) -> int:
+    """
+    Matérialise l'historique en dépôt Git réel via `git fast-import` (pour le GitMiner).
+
+    Chaque fichier modifié est réécrit avec `insertions` lignes (plus un en-tête): les statistiques
+    calculées par Git diffèrent donc de celles du DataFrame, pas le nombre de commits.
+
+    Args:
+        history: Historique en mémoire, ou blocs de `SyntheticGenerator.iter_blocks`.
+        path: Répertoire du dépôt (créé si nécessaire).
+
+    Returns:
+        Nombre de commits écrits.
+    """
+    blocks = [history] if isinstance(history, SyntheticHistory) else history
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(["git", "init", "-q", path], check=True)
+    subprocess.run(["git", "-C", path, "symbolic-ref", "HEAD", "refs/heads/main"], check=True)
+
+    process = subprocess.Popen(["git", "-C", path, "fast-import", "--quiet"], stdin=subprocess.PIPE)
+    written = 0
+    try:
+        for block in blocks:
+            process.stdin.write(_fast_import_block(block, written + 1))
+            written += len(block.commits)
+    finally:
+        process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"git fast-import a échoué (code {process.returncode}).")
+    logger.info(f"Dépôt Git synthétique écrit dans {path} ({written} commits).")
+    return written
+
+
+def write_history(
+    generator: SyntheticGenerator,
+    directory: str,
+    formats: Sequence[str] = ("csv",),
+    repository: str = "synthetic",
+    git: bool = False,
+) -> Dict[str, int]:
+    """
+    Écrit l'historique bloc par bloc dans les formats de stockage du pipeline.
+
+    - csv: `commit_history.csv` et `test_results.csv` (sorties du GitMiner et du collecteur);
+    - parquet: une partition par bloc sous `commit_history/` et `test_results/` (pyarrow);
+    - sqlite: `store.sqlite` alimenté par `DataStore` (commits et agrégats d'échecs);
+    - git: dépôt `repo/` matérialisé par `git fast-import`.
+
+    Args:
+        generator: Générateur configuré.
+        directory: Répertoire de sortie.
+        formats: Formats tabulaires à écrire (parmi FORMATS).
+        repository: Nom du dépôt enregistré dans le stockage SQLite.
+        git: Écrire aussi le dépôt Git.
+
+    Returns:
+        Nombre de commits et de résultats de tests écrits.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Formats inconnus: {sorted(unknown)} (disponibles: {FORMATS})")
+    if "parquet" in formats and pq is None:
+        raise ImportError("pyarrow est requis pour l'écriture Parquet (pip install pyarrow).")
+    os.makedirs(directory, exist_ok=True)
+    store = DataStore(os.path.join(directory, "store.sqlite")) if "sqlite" in formats else None
+
+    def blocks() -> Iterator[SyntheticHistory]:
+        for index, block in enumerate(generator.iter_blocks()):
+            if "csv" in formats:
+                header, mode = index == 0, "w" if index == 0 else "a"
+                block.commits.to_csv(os.path.join(directory, "commit_history.csv"), index=False,
+                                     header=header, mode=mode)
+                block.test_results.to_csv(os.path.join(directory, "test_results.csv"), index=False,
+                                          header=header, mode=mode)
+            if "parquet" in formats:
+                for name, df in (("commit_history", block.commits), ("test_results", block.test_results)):
+                    os.makedirs(os.path.join(directory, name), exist_ok=True)
+                    df.to_parquet(os.path.join(directory, name, f"part-{index:05d}.parquet"), index=False)
+            if store is not None:
+                store.upsert_commits(_store_commits(block, repository))
+                store.record_test_results(block.test_results.to_dict("records"))
+            counts["commits"] += len(block.commits)
+            counts["test_results"] += len(block.test_results)
+            logger.info(f"Bloc {index + 1}/{generator.n_blocks} écrit ({counts['commits']} commits).")
+            yield block
+
+    counts = {"commits": 0, "test_results": 0}
+    try:
+        if git:
+            write_git_repo(blocks(), os.path.join(directory, "repo"))
+        else:
+            for _ in blocks():
+                pass
+    finally:
+        if store is not None:
+            store.close()
+    return counts
+
+
+def _store_commits(block: SyntheticHistory, repository: str) -> Iterator[Dict[str, object]]:
+    """Commits d'un bloc au format de `DataStore.upsert_commits`."""
+    paths = block.changes.groupby("commit_hash", sort=False)["path"].agg(list)
+    for commit in block.commits.itertuples(index=False):
+        yield {
+            "sha": commit.commit_hash,
+            "repository": repository,
+            "author": commit.author_name,
+            "committed_date": pd.Timestamp(commit.committed_date, unit="s", tz="UTC").isoformat(),
+            "message": commit.message,
+            "changed_files": paths[commit.commit_hash],
+        }
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: 20 000 commits, 200 tests exécutés par commit sur 5 000
+    generator = SyntheticGenerator(n_commits=20_000, n_tests=5_000, n_files=20_000,
+                                   n_authors=200, tests_per_commit=200)
+    counts = write_history(generator, "/tmp/pts_synthetic", formats=("csv",))
+    logger.info(f"{counts['commits']} commits et {counts['test_results']} résultats écrits.")
+    changes = pd.concat(block.changes for block in generator.iter_blocks())
+    top = changes["path"].value_counts()
+    logger.info(f"1% des fichiers les plus modifiés: {top.iloc[: len(top) // 100].sum() / len(changes):.1%} des changements.")
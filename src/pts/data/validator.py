@@ -5,7 +5,6 @@ from loguru import logger
 
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="data_validator")
 
@@ -107,6 +106,7 @@ class DataValidator:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     required = ["commit_id", "test_id", "test_failed", "churn"]
     validator = DataValidator(required_columns=required)
@@ -1,5 +1,19 @@
-from .extractor import FeatureExtractor
-from .engineer import FeatureEngineer
-from .selector import FeatureSelector
+from typing import TYPE_CHECKING
+
+from pts.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .extractor import FeatureExtractor
+    from .engineer import FeatureEngineer
+    from .selector import FeatureSelector
 
 __all__ = ["FeatureExtractor", "FeatureEngineer", "FeatureSelector"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "FeatureExtractor": ".extractor",
+        "FeatureEngineer": ".engineer",
+        "FeatureSelector": ".selector",
+    },
+)
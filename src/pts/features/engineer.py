@@ -4,8 +4,8 @@ import pandas as pd
 from loguru import logger
 
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="feature_engineer")
 
@@ -74,6 +74,7 @@ class FeatureEngineer:
             
         return features_df
 
+    @profiled_stage("engineering")
     def run_engineering_pipeline(self, features_df: pd.DataFrame) -> pd.DataFrame:
         """
         Exécute le pipeline complet d'ingénierie de caractéristiques.
@@ -92,6 +93,7 @@ class FeatureEngineer:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (nécessite des données extraites)
     # Simulation de données extraites
     data = {
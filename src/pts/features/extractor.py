@@ -4,8 +4,8 @@ import pandas as pd
 from loguru import logger
 
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="feature_extractor")
 
@@ -87,6 +87,7 @@ class FeatureExtractor:
         
         return merged_df
 
+    @profiled_stage("extraction")
     def run_extraction_pipeline(self, processed_df: pd.DataFrame) -> pd.DataFrame:
         """
         Exécute le pipeline complet d'extraction de caractéristiques.
@@ -106,6 +107,7 @@ class FeatureExtractor:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (nécessite des données traitées)
     # Simulation de données traitées
     data = {
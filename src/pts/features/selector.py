@@ -5,8 +5,8 @@ from loguru import logger
 from sklearn.feature_selection import SelectKBest, f_classif
 
 from pts.utils.logger import setup_logging
+from pts.utils.profiling import profiled_stage
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="feature_selector")
 
@@ -70,6 +70,7 @@ class FeatureSelector:
         
         return data_df[final_cols]
 
+    @profiled_stage("feature_selection")
     def run_selection_pipeline(self, engineered_df: pd.DataFrame) -> pd.DataFrame:
         """
         Exécute le pipeline complet de sélection de caractéristiques.
@@ -87,6 +88,7 @@ class FeatureSelector:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (nécessite des données ingéniées)
     # Simulation de données ingéniées
     data = {
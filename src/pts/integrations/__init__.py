@@ -1,5 +1,20 @@
-from .github import GitHubIntegration
-from .gitlab import GitLabIntegration
-from .jenkins import JenkinsIntegration
+from typing import TYPE_CHECKING
 
-__all__ = ["GitHubIntegration", "GitLabIntegration", "JenkinsIntegration"]
+from pts.utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .github import GitHubIntegration
+    from .gitlab import GitLabIntegration
+    from .jenkins import JenkinsHarvester, JenkinsIntegration
+
+__all__ = ["GitHubIntegration", "GitLabIntegration", "JenkinsIntegration", "JenkinsHarvester"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "GitHubIntegration": ".github",
+        "GitLabIntegration": ".gitlab",
+        "JenkinsIntegration": ".jenkins",
+        "JenkinsHarvester": ".jenkins",
+    },
+)
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Pattern, Sequence
+
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="http_cache")
+
+# Ressources qui ne changent jamais une fois créées: un commit désigné par son
+# SHA complet (GitHub: /repos/o/r/commits/{sha}, GitLab: /repository/commits/{sha}).
+IMMUTABLE_PATTERNS = (re.compile(r"/commits/[0-9a-f]{40}(\?|$)"),)
+
+# En-têtes qui ne décrivent pas le contenu et ne doivent pas être rejoués
+_SKIPPED_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length", "date"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    immutable INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class CacheEntry(NamedTuple):
+    """Réponse mise en cache."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+    immutable: bool
+
+
+class ResponseCache:
+    """
+    Cache persistant (SQLite) des réponses GET des API GitHub/GitLab.
+
+    - Les réponses portant un `ETag` ou un `Last-Modified` sont revalidées par
+      requête conditionnelle (`If-None-Match` / `If-Modified-Since`); une
+      réponse 304 ne consomme pas de quota sur GitHub.
+    - Les commits désignés par un SHA complet sont immuables: servis sans requête.
+    - La taille totale est bornée; les entrées les moins récemment utilisées
+      sont évincées en premier.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        immutable_patterns: Sequence[Pattern[str]] = IMMUTABLE_PATTERNS,
+    ) -> None:
+        """
+        Ouvre (ou crée) le cache.
+
+        Args:
+            path: Chemin du fichier SQLite.
+            max_bytes: Taille maximale des corps de réponses conservés.
+            immutable_patterns: Expressions des URL dont la réponse ne change jamais.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.immutable_patterns = tuple(immutable_patterns)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logger.info(f"Cache HTTP ouvert: {path} (max {max_bytes / 1024 / 1024:.0f} Mo)")
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Crée le cache configuré par $PTS_HTTP_CACHE_PATH et $PTS_HTTP_CACHE_MAX_MB.
+
+        Returns:
+            Le cache, ou None si $PTS_HTTP_CACHE_PATH n'est pas défini.
+        """
+        path = os.getenv("PTS_HTTP_CACHE_PATH")
+        if not path:
+            return None
+        return cls(path, max_bytes=int(float(os.getenv("PTS_HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024))
+
+    @staticmethod
+    def key(url: str, headers: Optional[Mapping[str, str]] = None, auth: Any = None) -> str:
+        """
+        Clé de cache d'une requête GET: URL complète (paramètres compris), `Accept`
+        et empreinte des identifiants.
+
+        Les identifiants (`Authorization`, `auth`) font partie de la clé: une
+        réponse privée obtenue avec un jeton n'est jamais servie à une requête
+        portant un autre jeton, ou aucun. Seule leur empreinte SHA-256 est stockée.
+
+        Args:
+            url: URL complète de la requête.
+            headers: En-têtes de la requête.
+            auth: Identifiants transmis au client HTTP (tuple ou objet d'authentification).
+        """
+        accept = authorization = ""
+        for name, value in (headers or {}).items():
+            if name.lower() == "accept":
+                accept = value
+            elif name.lower() == "authorization":
+                authorization = value
+        if auth is not None and not isinstance(auth, (tuple, list)):
+            # requests.auth.HTTPBasicAuth / httpx.BasicAuth: username et password
+            auth = (getattr(auth, "username", None), getattr(auth, "password", None), type(auth).__name__)
+        if not authorization and auth is None:
+            return f"{url} {accept}"
+        credentials = json.dumps([authorization, list(auth) if auth is not None else None], default=repr)
+        return f"{url} {accept} {hashlib.sha256(credentials.encode()).hexdigest()}"
+
+    def is_immutable(self, url: str) -> bool:
+        """Indique si la ressource désignée par l'URL ne change jamais."""
+        return any(pattern.search(url) for pattern in self.immutable_patterns)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Retourne l'entrée associée à une clé et la marque comme récemment utilisée.
+
+        Args:
+            key: Clé de cache (voir `key`).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body, immutable FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        etag, last_modified, headers, body, immutable = row
+        return CacheEntry(etag, last_modified, json.loads(headers), bytes(body), bool(immutable))
+
+    def put(self, key: str, url: str, headers: Mapping[str, str], body: bytes) -> int:
+        """
+        Enregistre une réponse 200 si elle peut être revalidée ou si elle est immuable.
+
+        Args:
+            key: Clé de cache (voir `key`).
+            url: URL complète de la requête.
+            headers: En-têtes de la réponse.
+            body: Corps de la réponse.
+
+        Returns:
+            Nombre d'entrées évincées pour respecter la taille maximale.
+        """
+        stored = {k: v for k, v in headers.items() if k.lower() not in _SKIPPED_HEADERS}
+        lowered = {k.lower(): v for k, v in stored.items()}
+        etag, last_modified = lowered.get("etag"), lowered.get("last-modified")
+        immutable = self.is_immutable(url)
+        if not (etag or last_modified or immutable) or len(body) > self.max_bytes:
+            return 0
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(stored), sqlite3.Binary(body), len(body),
+                 int(immutable), time.time()),
+            )
+            return self._evict()
+
+    def _evict(self) -> int:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        # Évince jusqu'à 90% de la taille maximale pour ne pas évincer à chaque écriture
+        target = total - int(self.max_bytes * 0.9)
+        evicted, freed = [], 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            evicted.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug("Cache HTTP: {} entrées évincées ({} octets)", len(evicted), freed)
+        return len(evicted)
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        """En-têtes de revalidation d'une entrée (`If-None-Match`, `If-Modified-Since`)."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def size_bytes(self) -> int:
+        """Taille totale des corps de réponses en cache."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        """Supprime toutes les entrées."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Ferme la base SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation
+    cache = ResponseCache("/tmp/pts_http_cache.sqlite")
+    url = "https://api.github.com/repos/o/r/commits/" + "a" * 40
+    cache.put(cache.key(url), url, {"ETag": '"v1"'}, b'{"sha": "aaa"}')
+    entry = cache.get(cache.key(url))
+    logger.info(f"Entrée en cache: immuable={entry.immutable}, {len(cache)} entrées")
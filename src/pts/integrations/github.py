@@ -1,11 +1,14 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from loguru import logger
+import httpx
 import requests
 
+from pts.integrations.http import AsyncHttpClient, HttpClient, get_http_client
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="github_integration")
 
@@ -15,7 +18,14 @@ class GitHubIntegration:
     Classe pour interagir avec l'API GitHub.
     """
 
-    def __init__(self, token: str, repo_owner: str, repo_name: str) -> None:
+    def __init__(
+        self,
+        token: str,
+        repo_owner: str,
+        repo_name: str,
+        api_url: str = "https://api.github.com",
+        client: Optional[HttpClient] = None,
+    ) -> None:
         """
         Initialise l'intégration GitHub.
 
@@ -23,8 +33,11 @@ class GitHubIntegration:
             token: Jeton d'accès personnel GitHub.
             repo_owner: Propriétaire du dépôt.
             repo_name: Nom du dépôt.
+            api_url: URL de base de l'API (GitHub Enterprise ou serveur de test).
+            client: Client HTTP à utiliser (par défaut: client partagé).
         """
-        self.base_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+        self.base_url = f"{api_url.rstrip('/')}/repos/{repo_owner}/{repo_name}"
+        self.client = client or get_http_client()
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json",
@@ -43,24 +56,195 @@ class GitHubIntegration:
         """
         url = f"{self.base_url}/commits/{commit_sha}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.client.get(url, headers=self.headers)
             response.raise_for_status()
-            data = response.json()
-            
-            # Extraction des noms de fichiers modifiés
-            changed_files = [file["filename"] for file in data.get("files", [])]
-            
-            return {
-                "sha": data["sha"],
-                "author": data["commit"]["author"]["name"],
-                "date": data["commit"]["author"]["date"],
-                "message": data["commit"]["message"],
-                "changed_files": changed_files,
-            }
+            return self._parse_commit(response.json())
         except requests.exceptions.RequestException as e:
             logger.error(f"Erreur lors de la récupération des détails du commit {commit_sha}: {e}")
             return None
 
+    @staticmethod
+    def _parse_commit(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extrait les champs utiles d'une réponse `GET /commits/{sha}`."""
+        # Extraction des noms de fichiers modifiés
+        changed_files = [file["filename"] for file in data.get("files", [])]
+
+        return {
+            "sha": data["sha"],
+            "author": data["commit"]["author"]["name"],
+            "date": data["commit"]["author"]["date"],
+            "message": data["commit"]["message"],
+            "changed_files": changed_files,
+        }
+
+    async def aget_commit_details(
+        self, commit_sha: str, client: Optional[AsyncHttpClient] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Version asynchrone de `get_commit_details`.
+
+        Args:
+            commit_sha: Le SHA du commit.
+            client: Client asynchrone ouvert dans la boucle courante
+                    (par défaut: un client dédié à l'appel).
+
+        Returns:
+            Dictionnaire des détails du commit ou None en cas d'échec.
+        """
+        url = f"{self.base_url}/commits/{commit_sha}"
+        try:
+            async with self._async_client(client, 1) as active:
+                response = await active.get(url, headers=self.headers)
+            response.raise_for_status()
+            return self._parse_commit(response.json())
+        except httpx.HTTPError as e:
+            logger.error(f"Erreur lors de la récupération des détails du commit {commit_sha}: {e}")
+            return None
+
+    @asynccontextmanager
+    async def _async_client(
+        self, client: Optional[AsyncHttpClient], concurrency: int
+    ) -> AsyncIterator[AsyncHttpClient]:
+        if client is not None:
+            yield client
+            return
+        async with AsyncHttpClient(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+            per_host_limit=concurrency,
+        ) as owned:
+            yield owned
+
+    async def _fetch_bounded(
+        self,
+        shas: List[str],
+        concurrency: int,
+        client: AsyncHttpClient,
+        emit: Callable[[int, str, Optional[Dict[str, Any]]], Awaitable[None]],
+    ) -> None:
+        # Un nombre fixe de workers consomme les SHA: la mémoire reste bornée
+        # même pour des dizaines de milliers de commits.
+        pending = iter(enumerate(shas))
+
+        async def worker() -> None:
+            for index, sha in pending:
+                await emit(index, sha, await self.aget_commit_details(sha, client))
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(shas)))))
+
+    async def aget_many(
+        self,
+        commit_shas: Iterable[str],
+        concurrency: int = 32,
+        client: Optional[AsyncHttpClient] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Récupère les détails de nombreux commits en parallèle.
+
+        Args:
+            commit_shas: SHA des commits.
+            concurrency: Nombre maximal de requêtes simultanées.
+            client: Client asynchrone à utiliser (par défaut: un client dédié à l'appel).
+
+        Returns:
+            Détails des commits dans l'ordre des SHA fournis (None en cas d'échec).
+        """
+        shas = list(commit_shas)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(shas)
+
+        async def store(index: int, sha: str, details: Optional[Dict[str, Any]]) -> None:
+            results[index] = details
+
+        async with self._async_client(client, concurrency) as active:
+            await self._fetch_bounded(shas, concurrency, active, store)
+        logger.info(f"{sum(r is not None for r in results)}/{len(shas)} commits récupérés.")
+        return results
+
+    async def astream_commit_details(
+        self,
+        commit_shas: Iterable[str],
+        concurrency: int = 32,
+        client: Optional[AsyncHttpClient] = None,
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Récupère les détails de nombreux commits et les renvoie dès qu'ils arrivent.
+
+        L'ordre de sortie est l'ordre d'achèvement, pas celui des SHA fournis.
+
+        Args:
+            commit_shas: SHA des commits.
+            concurrency: Nombre maximal de requêtes simultanées.
+            client: Client asynchrone à utiliser (par défaut: un client dédié à l'appel).
+
+        Yields:
+            Tuples (sha, détails ou None en cas d'échec).
+        """
+        shas = list(commit_shas)
+        done = object()
+        # File bornée: les workers attendent si le consommateur est lent
+        results: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=2 * concurrency)
+
+        async def publish(index: int, sha: str, details: Optional[Dict[str, Any]]) -> None:
+            await results.put((sha, details))
+
+        async with self._async_client(client, concurrency) as active:
+            async def produce() -> None:
+                try:
+                    await self._fetch_bounded(shas, concurrency, active, publish)
+                finally:
+                    await results.put(done)
+
+            producer = asyncio.ensure_future(produce())
+            try:
+                while True:
+                    item = await results.get()
+                    if item is done:
+                        break
+                    yield item
+                await producer
+            finally:
+                # Arrêt anticipé du consommateur: les requêtes en cours sont annulées
+                if not producer.done():
+                    producer.cancel()
+                    await asyncio.gather(producer, return_exceptions=True)
+
+    def get_many_commit_details(
+        self, commit_shas: Iterable[str], concurrency: int = 32
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Variante bloquante de `aget_many` pour les scripts synchrones.
+
+        Args:
+            commit_shas: SHA des commits.
+            concurrency: Nombre maximal de requêtes simultanées.
+
+        Returns:
+            Détails des commits dans l'ordre des SHA fournis (None en cas d'échec).
+        """
+        return asyncio.run(self.aget_many(commit_shas, concurrency))
+
+    def iter_pull_request_files(self, pr_number: int, per_page: int = 100) -> Iterator[str]:
+        """
+        Parcourt les fichiers modifiés d'une Pull Request, page par page.
+
+        Toutes les pages sont suivies (l'API renvoie 30 fichiers par défaut);
+        une fois le nombre de pages connu, elles sont récupérées en parallèle.
+
+        Args:
+            pr_number: Le numéro de la Pull Request.
+            per_page: Fichiers par page (maximum 100 pour GitHub).
+
+        Yields:
+            Les chemins de fichiers modifiés, dans l'ordre de l'API.
+
+        Raises:
+            requests.exceptions.RequestException: Si une page échoue.
+        """
+        url = f"{self.base_url}/pulls/{pr_number}/files"
+        for response in self.client.iter_pages(url, params={"per_page": per_page}, headers=self.headers):
+            for file in response.json():
+                yield file["filename"]
+
     def get_pull_request_files(self, pr_number: int) -> List[str]:
         """
         Récupère la liste des fichiers modifiés dans une Pull Request.
@@ -71,21 +255,16 @@ class GitHubIntegration:
         Returns:
             Liste des chemins de fichiers modifiés.
         """
-        url = f"{self.base_url}/pulls/{pr_number}/files"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            changed_files = [file["filename"] for file in data]
+            changed_files = list(self.iter_pull_request_files(pr_number))
             logger.info(f"PR #{pr_number}: {len(changed_files)} fichiers modifiés trouvés.")
             return changed_files
         except requests.exceptions.RequestException as e:
             logger.error(f"Erreur lors de la récupération des fichiers de la PR #{pr_number}: {e}")
             return []
 
-
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (nécessite un jeton et un dépôt réel)
     # L'exécution est simulée pour éviter d'exposer le jeton
     logger.info("Exemple d'utilisation de GitHubIntegration simulé.")
@@ -1,11 +1,11 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 from loguru import logger
 import requests
 
+from pts.integrations.http import HttpClient, get_http_client
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="gitlab_integration")
 
@@ -15,7 +15,13 @@ class GitLabIntegration:
     Classe pour interagir avec l'API GitLab.
     """
 
-    def __init__(self, private_token: str, project_id: int, base_url: str = "https://gitlab.com/api/v4") -> None:
+    def __init__(
+        self,
+        private_token: str,
+        project_id: int,
+        base_url: str = "https://gitlab.com/api/v4",
+        client: Optional[HttpClient] = None,
+    ) -> None:
         """
         Initialise l'intégration GitLab.
 
@@ -23,8 +29,10 @@ class GitLabIntegration:
             private_token: Jeton d'accès privé GitLab.
             project_id: ID du projet GitLab.
             base_url: URL de base de l'API GitLab.
+            client: Client HTTP à utiliser (par défaut: client partagé).
         """
         self.base_url = f"{base_url}/projects/{project_id}"
+        self.client = client or get_http_client()
         self.headers = {
             "Private-Token": private_token,
         }
@@ -42,7 +50,7 @@ class GitLabIntegration:
         """
         url = f"{self.base_url}/repository/commits/{commit_sha}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.client.get(url, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             
@@ -56,6 +64,29 @@ class GitLabIntegration:
             logger.error(f"Erreur lors de la récupération des détails du commit {commit_sha}: {e}")
             return None
 
+    def iter_merge_request_files(self, mr_iid: int, per_page: int = 100) -> Iterator[str]:
+        """
+        Parcourt les fichiers modifiés d'une Merge Request, page par page.
+
+        Utilise l'endpoint paginé `/diffs` (GitLab >= 15.7) plutôt que `/changes`,
+        qui renvoie tous les diffs en une seule réponse. Les pages sont récupérées
+        en parallèle lorsque `X-Total-Pages` est fourni, sinon `X-Next-Page` est suivi.
+
+        Args:
+            mr_iid: L'Internal ID (IID) de la Merge Request.
+            per_page: Fichiers par page (maximum 100 pour GitLab).
+
+        Yields:
+            Les chemins de fichiers modifiés (`new_path`).
+
+        Raises:
+            requests.exceptions.RequestException: Si une page échoue.
+        """
+        url = f"{self.base_url}/merge_requests/{mr_iid}/diffs"
+        for response in self.client.iter_pages(url, params={"per_page": per_page}, headers=self.headers):
+            for change in response.json():
+                yield change["new_path"]
+
     def get_merge_request_changes(self, mr_iid: int) -> List[str]:
         """
         Récupère la liste des fichiers modifiés dans une Merge Request.
@@ -66,21 +97,16 @@ class GitLabIntegration:
         Returns:
             Liste des chemins de fichiers modifiés.
         """
-        url = f"{self.base_url}/merge_requests/{mr_iid}/changes"
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            changed_files = [change["new_path"] for change in data.get("changes", [])]
+            changed_files = list(self.iter_merge_request_files(mr_iid))
             logger.info(f"MR !{mr_iid}: {len(changed_files)} fichiers modifiés trouvés.")
             return changed_files
         except requests.exceptions.RequestException as e:
             logger.error(f"Erreur lors de la récupération des changements de la MR !{mr_iid}: {e}")
             return []
 
-
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (simulé)
     logger.info("Exemple d'utilisation de GitLabIntegration simulé.")
     pass
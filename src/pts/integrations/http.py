@@ -0,0 +1,597 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from pts.integrations.cache import CacheEntry, ResponseCache
+from pts.utils.metrics import record_http_cache
+
+logger.disable("pts")
+logger = logger.bind(name="http_client")
+
+# Statuts HTTP considérés comme transitoires
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Convertit un en-tête `Retry-After` (secondes ou date HTTP) en délai.
+
+    Args:
+        value: Valeur de l'en-tête.
+        now: Horodatage courant (par défaut: time.time()).
+
+    Returns:
+        Délai en secondes, ou None si l'en-tête est absent ou invalide.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+def rate_limit_delay(headers: Any, now: Optional[float] = None) -> Optional[float]:
+    """
+    Calcule le délai imposé par un serveur à partir des en-têtes de réponse.
+
+    `Retry-After` est prioritaire; sinon `X-RateLimit-Reset` (horodatage Unix,
+    GitHub/GitLab) est utilisé lorsque le quota restant est épuisé.
+
+    Args:
+        headers: En-têtes de la réponse.
+        now: Horodatage courant (par défaut: time.time()).
+
+    Returns:
+        Délai en secondes, ou None si le serveur n'en impose pas.
+    """
+    delay = parse_retry_after(headers.get("Retry-After"), now)
+    if delay is not None:
+        return delay
+
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if reset and (remaining is None or str(remaining).strip() == "0"):
+        try:
+            return max(0.0, float(reset) - (now if now is not None else time.time()))
+        except ValueError:
+            return None
+    return None
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """
+    Analyse un en-tête `Link` (RFC 8288) tel que renvoyé par l'API GitHub.
+
+    Args:
+        value: Valeur de l'en-tête, ex: '<https://...?page=2>; rel="next", ...'.
+
+    Returns:
+        Dictionnaire {rel: url}.
+    """
+    links: Dict[str, str] = {}
+    for part in (value or "").split(","):
+        segments = part.split(";")
+        url = segments[0].strip()
+        if not (url.startswith("<") and url.endswith(">")):
+            continue
+        for param in segments[1:]:
+            key, _, rel = param.strip().partition("=")
+            if key.strip() == "rel":
+                for name in rel.strip('"').split():
+                    links[name] = url[1:-1]
+    return links
+
+
+def _page_of(url: str) -> Optional[int]:
+    pages = parse_qs(urlsplit(url).query).get("page")
+    try:
+        return int(pages[0]) if pages else None
+    except ValueError:
+        return None
+
+
+def total_pages(headers: Any) -> Optional[int]:
+    """
+    Nombre total de pages d'une collection, s'il est annoncé par le serveur.
+
+    Utilise `Link: rel="last"` (GitHub) ou `X-Total-Pages` (GitLab, omis pour
+    les très grandes collections).
+
+    Returns:
+        Nombre de pages, ou None s'il est inconnu.
+    """
+    last = parse_link_header(headers.get("Link")).get("last")
+    if last:
+        return _page_of(last)
+    value = headers.get("X-Total-Pages")
+    return int(value) if value and str(value).isdigit() else None
+
+
+def next_page(headers: Any, params: Dict[str, Any]) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+    """
+    Requête de la page suivante d'après `Link: rel="next"` ou `X-Next-Page`.
+
+    Args:
+        headers: En-têtes de la page courante.
+        params: Paramètres de la requête courante.
+
+    Returns:
+        (URL complète ou None pour garder l'URL courante, paramètres), ou None
+        s'il n'y a plus de page.
+    """
+    url = parse_link_header(headers.get("Link")).get("next")
+    if url:
+        # L'URL `next` contient déjà tous les paramètres de la requête
+        return url, {}
+    value = headers.get("X-Next-Page")
+    if value and str(value).isdigit():
+        return None, {**params, "page": int(value)}
+    return None
+
+
+class RetryPolicy:
+    """
+    Politique de nouvelles tentatives commune aux clients synchrone et asynchrone.
+
+    Backoff exponentiel à gigue complète; `Retry-After` et `X-RateLimit-Reset`
+    sont prioritaires lorsque le serveur les fournit.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        max_retry_wait: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            max_retries: Nombre maximal de nouvelles tentatives.
+            backoff_factor: Délai de base du backoff exponentiel (secondes).
+            backoff_max: Délai maximal entre deux tentatives sans indication serveur.
+            max_retry_wait: Attente maximale acceptée pour une limite de débit;
+                            au-delà, la réponse est renvoyée telle quelle.
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.max_retry_wait = max_retry_wait
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Délai avant la tentative `attempt + 1` (backoff exponentiel, gigue complète)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2**attempt)))
+
+    def retry_decision(self, response: Any, attempt: int) -> Tuple[bool, float]:
+        """
+        Détermine si une réponse doit être retentée et après quel délai.
+
+        Args:
+            response: Réponse reçue (requests ou httpx).
+            attempt: Numéro de la tentative (à partir de 0).
+
+        Returns:
+            Tuple (retenter, délai en secondes).
+        """
+        status = response.status_code
+        rate_limited = status == 429 or (
+            status == 403 and str(response.headers.get("X-RateLimit-Remaining", "")).strip() == "0"
+        )
+        if attempt >= self.max_retries or not (rate_limited or status in RETRY_STATUSES):
+            return False, 0.0
+
+        delay = rate_limit_delay(response.headers)
+        if delay is None:
+            return True, self.backoff_delay(attempt)
+        if delay > self.max_retry_wait:
+            logger.warning(f"Limite de débit: attente de {delay:.0f}s refusée pour {response.url}")
+            return False, 0.0
+        # Petite gigue pour éviter que tous les clients repartent en même temps
+        return True, delay + random.uniform(0, self.backoff_factor)
+
+
+class HttpClient(RetryPolicy):
+    """
+    Client HTTP partagé par les intégrations (GitHub, GitLab, Jenkins).
+
+    - Connexions keep-alive réutilisées via un pool par hôte.
+    - Nouvelles tentatives sur erreurs réseau, 5xx et limites de débit, avec
+      backoff exponentiel à gigue complète et respect de `Retry-After` /
+      `X-RateLimit-Reset`.
+    - Nombre de requêtes simultanées borné par hôte.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        per_host_limit: int = 8,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        max_retry_wait: float = 60.0,
+        timeout: float = 10.0,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """
+        Initialise le client et son pool de connexions.
+
+        Args:
+            pool_connections: Nombre d'hôtes dont le pool est conservé.
+            pool_maxsize: Connexions keep-alive conservées par hôte.
+            per_host_limit: Requêtes simultanées maximales par hôte.
+            max_retries: Nombre maximal de nouvelles tentatives.
+            backoff_factor: Délai de base du backoff exponentiel (secondes).
+            backoff_max: Délai maximal entre deux tentatives sans indication serveur.
+            max_retry_wait: Attente maximale acceptée pour une limite de débit;
+                            au-delà, la réponse est renvoyée telle quelle.
+            timeout: Délai d'attente par défaut d'une requête (secondes).
+            cache: Cache persistant des réponses GET (requêtes conditionnelles).
+        """
+        super().__init__(max_retries, backoff_factor, backoff_max, max_retry_wait)
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._host_limits.setdefault(
+                    host, threading.BoundedSemaphore(self.per_host_limit)
+                )
+        return semaphore
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Envoie une requête avec gestion du pool, de la concurrence et des tentatives.
+
+        Args:
+            method: Méthode HTTP.
+            url: URL complète.
+            **kwargs: Arguments transmis à `requests.Session.request`.
+
+        Returns:
+            La réponse finale (éventuellement en erreur: l'appelant décide).
+
+        Raises:
+            requests.exceptions.RequestException: Si toutes les tentatives échouent
+            sur une erreur réseau.
+        """
+        if self.cache is not None and method == "GET":
+            return self._cached_get(url, **kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _cached_get(self, url: str, **kwargs: Any) -> requests.Response:
+        # Réponse lue en flux par l'appelant: la mettre en cache consommerait le corps
+        if kwargs.get("stream"):
+            return self._send("GET", url, **kwargs)
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        key = self.cache.key(full_url, kwargs.get("headers"), kwargs.get("auth"))
+        entry = self.cache.get(key)
+        if entry is not None and entry.immutable:
+            record_http_cache("hit")
+            return self._from_cache(entry, full_url)
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **self.cache.conditional_headers(entry)}
+
+        response = self._send("GET", url, **kwargs)
+        if entry is not None and response.status_code == 304:
+            record_http_cache("revalidated")
+            return self._from_cache(entry, full_url)
+
+        evicted = 0
+        if response.status_code == 200:
+            evicted = self.cache.put(key, full_url, response.headers, response.content)
+        record_http_cache("miss", evicted)
+        return response
+
+    @staticmethod
+    def _from_cache(entry: CacheEntry, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response.from_cache = True  # type: ignore[attr-defined]
+        return response
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        host_limit = self._host_limit(url)
+
+        attempt = 0
+        while True:
+            try:
+                with host_limit:
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"Erreur réseau sur {url} ({e}), nouvelle tentative dans {delay:.2f}s")
+            else:
+                retry, delay = self.retry_decision(response, attempt)
+                if not retry:
+                    return response
+                logger.warning(
+                    f"Statut {response.status_code} sur {url}, nouvelle tentative dans {delay:.2f}s"
+                )
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Envoie une requête GET (voir `request`)."""
+        return self.request("GET", url, **kwargs)
+
+    def iter_pages(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+        **kwargs: Any,
+    ) -> Iterator[requests.Response]:
+        """
+        Parcourt toutes les pages d'une collection paginée, dans l'ordre.
+
+        Lorsque la première page annonce le nombre total de pages, les pages
+        suivantes sont récupérées en parallèle (dans la limite par hôte);
+        sinon les liens `next` / `X-Next-Page` sont suivis un par un.
+
+        Args:
+            url: URL de la collection.
+            params: Paramètres de la requête (ex: {"per_page": 100}).
+            max_workers: Pages récupérées simultanément lorsque le total est connu.
+            **kwargs: Arguments transmis à `request` (en-têtes, authentification...).
+
+        Yields:
+            Les réponses de chaque page, dans l'ordre des pages.
+
+        Raises:
+            requests.exceptions.RequestException: Si une page échoue.
+        """
+        params = dict(params or {})
+        response = self.get(url, params=params, **kwargs)
+        response.raise_for_status()
+        yield response
+
+        total = total_pages(response.headers)
+        first = int(params.get("page", 1))
+        if total is not None and total > first:
+            pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, self.per_host_limit)))
+            try:
+                futures = [
+                    pool.submit(self.get, url, params={**params, "page": page}, **kwargs)
+                    for page in range(first + 1, total + 1)
+                ]
+                for future in futures:
+                    response = future.result()
+                    response.raise_for_status()
+                    yield response
+            finally:
+                # Arrêt anticipé du consommateur: les pages non commencées sont abandonnées
+                pool.shutdown(wait=True, cancel_futures=True)
+            return
+
+        following = next_page(response.headers, params)
+        while following is not None:
+            next_url, params = following
+            response = self.get(next_url or url, params=params, **kwargs)
+            response.raise_for_status()
+            yield response
+            following = next_page(response.headers, params)
+
+    def close(self) -> None:
+        """Ferme les connexions du pool."""
+        self.session.close()
+
+
+class AsyncHttpClient(RetryPolicy):
+    """
+    Équivalent asynchrone de `HttpClient` (httpx), pour les collectes massives.
+
+    Même politique de nouvelles tentatives; la concurrence par hôte est bornée
+    par un `asyncio.Semaphore`. Un client est lié à la boucle d'événements dans
+    laquelle il est utilisé: l'ouvrir avec `async with` dans cette boucle.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 32,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        max_retry_wait: float = 60.0,
+        timeout: float = 10.0,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """
+        Initialise le client et son pool de connexions.
+
+        Args:
+            max_connections: Connexions simultanées maximales (tous hôtes).
+            max_keepalive_connections: Connexions keep-alive conservées.
+            per_host_limit: Requêtes simultanées maximales par hôte.
+            max_retries: Nombre maximal de nouvelles tentatives.
+            backoff_factor: Délai de base du backoff exponentiel (secondes).
+            backoff_max: Délai maximal entre deux tentatives sans indication serveur.
+            max_retry_wait: Attente maximale acceptée pour une limite de débit.
+            timeout: Délai d'attente par défaut d'une requête (secondes).
+            cache: Cache persistant des réponses GET (par défaut: celui du
+                   client partagé, s'il est configuré).
+        """
+        super().__init__(max_retries, backoff_factor, backoff_max, max_retry_wait)
+        self.per_host_limit = per_host_limit
+        self.cache = cache if cache is not None else get_http_client().cache
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            # Pas de verrou: la boucle d'événements est mono-thread
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Envoie une requête avec gestion du pool, de la concurrence et des tentatives.
+
+        Args:
+            method: Méthode HTTP.
+            url: URL complète.
+            **kwargs: Arguments transmis à `httpx.AsyncClient.request`.
+
+        Returns:
+            La réponse finale (éventuellement en erreur: l'appelant décide).
+
+        Raises:
+            httpx.TransportError: Si toutes les tentatives échouent sur une erreur réseau.
+        """
+        if self.cache is not None and method == "GET":
+            return await self._cached_get(url, **kwargs)
+        return await self._send(method, url, **kwargs)
+
+    async def _cached_get(self, url: str, **kwargs: Any) -> httpx.Response:
+        # Les accès SQLite sont locaux et brefs: ils restent dans la boucle d'événements
+        full_url = str(httpx.URL(url, params=kwargs.get("params")))
+        key = self.cache.key(full_url, kwargs.get("headers"), kwargs.get("auth"))
+        entry = self.cache.get(key)
+        if entry is not None and entry.immutable:
+            record_http_cache("hit")
+            return self._from_cache(entry, full_url)
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **self.cache.conditional_headers(entry)}
+
+        response = await self._send("GET", url, **kwargs)
+        if entry is not None and response.status_code == 304:
+            record_http_cache("revalidated")
+            return self._from_cache(entry, full_url)
+
+        evicted = 0
+        if response.status_code == 200:
+            evicted = self.cache.put(key, full_url, response.headers, response.content)
+        record_http_cache("miss", evicted)
+        return response
+
+    @staticmethod
+    def _from_cache(entry: CacheEntry, url: str) -> httpx.Response:
+        response = httpx.Response(
+            200, headers=entry.headers, content=entry.body, request=httpx.Request("GET", url)
+        )
+        response.extensions["from_cache"] = True
+        return response
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        host_limit = self._host_limit(url)
+
+        attempt = 0
+        while True:
+            try:
+                async with host_limit:
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"Erreur réseau sur {url} ({e!r}), nouvelle tentative dans {delay:.2f}s")
+            else:
+                retry, delay = self.retry_decision(response, attempt)
+                if not retry:
+                    return response
+                logger.warning(
+                    f"Statut {response.status_code} sur {url}, nouvelle tentative dans {delay:.2f}s"
+                )
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Envoie une requête GET (voir `request`)."""
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Ferme les connexions du pool."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+_SHARED_CLIENT: Optional[HttpClient] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Retourne le client HTTP partagé par défaut par toutes les intégrations.
+
+    Le cache de réponses est activé lorsque $PTS_HTTP_CACHE_PATH est défini.
+    """
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_LOCK:
+            if _SHARED_CLIENT is None:
+                _SHARED_CLIENT = HttpClient(cache=ResponseCache.from_env())
+    return _SHARED_CLIENT
+
+
+def configure_http_client(**kwargs: Any) -> HttpClient:
+    """
+    Remplace le client partagé par un client configuré (tailles de pool, limites...).
+
+    Args:
+        **kwargs: Arguments de `HttpClient` (`cache` par défaut: $PTS_HTTP_CACHE_PATH).
+
+    Returns:
+        Le nouveau client partagé.
+    """
+    global _SHARED_CLIENT
+    if "cache" not in kwargs:
+        kwargs["cache"] = ResponseCache.from_env()
+    with _SHARED_LOCK:
+        if _SHARED_CLIENT is not None:
+            _SHARED_CLIENT.close()
+        _SHARED_CLIENT = HttpClient(**kwargs)
+    return _SHARED_CLIENT
@@ -1,21 +1,47 @@
-from typing import Dict, Any, Optional
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Any, Iterator, List, Optional, Tuple
 
+import pandas as pd
 from loguru import logger
 import requests
 
+try:
+    import ijson
+except ImportError:  # Dépendance optionnelle: analyse en flux des rapports volumineux
+    ijson = None
+
+from pts.integrations.http import HttpClient, get_http_client
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="jenkins_integration")
 
+# Filtre `tree=` minimal d'un rapport de tests: seuls les champs utiles au modèle
+TEST_REPORT_TREE = "suites[cases[className,name,status,duration]]"
+# Révision Git d'une construction (plugin Git: action BuildData)
+BUILD_REVISION_TREE = "actions[lastBuiltRevision[SHA1]]"
+# Statuts JUnit de Jenkins considérés comme des échecs (SKIPPED est ignoré)
+FAILED_STATUSES = frozenset({"FAILED", "REGRESSION"})
+PASSED_STATUSES = frozenset({"PASSED", "FIXED"})
+# Rapport tronqué ou invalide (ValueError: response.json(), JSONError: ijson)
+PARSE_ERRORS: Tuple[type, ...] = (ValueError,) + ((ijson.JSONError,) if ijson is not None else ())
+
 
 class JenkinsIntegration:
     """
     Classe pour interagir avec l'API Jenkins.
     """
 
-    def __init__(self, base_url: str, username: str, api_token: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        api_token: str,
+        client: Optional[HttpClient] = None,
+    ) -> None:
         """
         Initialise l'intégration Jenkins.
 
@@ -23,9 +49,11 @@ class JenkinsIntegration:
             base_url: URL de base de l'instance Jenkins.
             username: Nom d'utilisateur Jenkins.
             api_token: Jeton API Jenkins.
+            client: Client HTTP à utiliser (par défaut: client partagé).
         """
         self.base_url = base_url.rstrip("/")
         self.auth = (username, api_token)
+        self.client = client or get_http_client()
         logger.info(f"Intégration Jenkins initialisée pour {self.base_url}")
 
     def get_job_info(self, job_name: str) -> Optional[Dict[str, Any]]:
@@ -40,7 +68,7 @@ class JenkinsIntegration:
         """
         url = f"{self.base_url}/job/{job_name}/api/json"
         try:
-            response = requests.get(url, auth=self.auth, timeout=10)
+            response = self.client.get(url, auth=self.auth)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -60,15 +88,271 @@ class JenkinsIntegration:
         """
         url = f"{self.base_url}/job/{job_name}/{build_number}/testReport/api/json"
         try:
-            response = requests.get(url, auth=self.auth, timeout=10)
+            response = self.client.get(url, auth=self.auth)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Erreur lors de la récupération des résultats de tests pour {job_name}#{build_number}: {e}")
             return None
 
+    def get_last_completed_build(self, job_name: str) -> Optional[int]:
+        """
+        Retourne le numéro de la dernière construction terminée d'un job.
+
+        Args:
+            job_name: Nom du job.
+
+        Returns:
+            Numéro de construction, ou None si aucune ou en cas d'échec.
+        """
+        url = f"{self.base_url}/job/{job_name}/api/json"
+        try:
+            response = self.client.get(url, params={"tree": "lastCompletedBuild[number]"}, auth=self.auth)
+            response.raise_for_status()
+            build = response.json().get("lastCompletedBuild")
+            return build["number"] if build else None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Erreur lors de la récupération de la dernière construction de {job_name}: {e}")
+            return None
+
+    def get_build_revision(self, job_name: str, build_number: int) -> Optional[str]:
+        """
+        Retourne le SHA du commit construit par une construction.
+
+        Args:
+            job_name: Nom du job.
+            build_number: Numéro de la construction.
+
+        Returns:
+            SHA du commit, ou None si la construction n'existe pas ou n'a pas de révision Git.
+
+        Raises:
+            requests.exceptions.RequestException: En cas d'erreur autre que 404.
+        """
+        url = f"{self.base_url}/job/{job_name}/{build_number}/api/json"
+        response = self.client.get(url, params={"tree": BUILD_REVISION_TREE}, auth=self.auth)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        for action in response.json().get("actions", []):
+            revision = (action or {}).get("lastBuiltRevision")
+            if revision and revision.get("SHA1"):
+                return revision["SHA1"]
+        return None
+
+    def iter_build_test_cases(self, job_name: str, build_number: int) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt les cas de test d'une construction avec un filtre `tree=` minimal.
+
+        Le rapport est analysé en flux avec ijson s'il est installé, sinon chargé
+        en une fois (il reste petit grâce au filtre).
+
+        Args:
+            job_name: Nom du job.
+            build_number: Numéro de la construction.
+
+        Yields:
+            Dictionnaires {className, name, status, duration}. Rien si la
+            construction n'a pas de rapport de tests.
+
+        Raises:
+            requests.exceptions.RequestException: En cas d'erreur autre que 404.
+        """
+        url = f"{self.base_url}/job/{job_name}/{build_number}/testReport/api/json"
+        response = self.client.get(
+            url, params={"tree": TEST_REPORT_TREE}, auth=self.auth, stream=ijson is not None
+        )
+        try:
+            if response.status_code == 404:
+                return
+            response.raise_for_status()
+            if ijson is not None:
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, "suites.item.cases.item")
+            else:
+                for suite in response.json().get("suites", []):
+                    yield from suite.get("cases", [])
+        finally:
+            response.close()
+
+
+class JenkinsHarvester:
+    """
+    Collecte en masse les résultats de tests d'un job Jenkins.
+
+    Les constructions sont récupérées en parallèle mais émises dans l'ordre, ce
+    qui permet d'enregistrer un point de reprise: la dernière construction
+    récoltée sans trou et traitée par le consommateur. Une construction en
+    échec (erreur réseau, rapport invalide) arrête la progression du point de
+    reprise; elle sera retentée à la prochaine exécution.
+    """
+
+    COLUMNS = ["test_id", "commit_hash", "test_failed"]
+
+    def __init__(
+        self,
+        integration: JenkinsIntegration,
+        job_name: str,
+        checkpoint_path: Optional[str] = None,
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Initialise le collecteur.
+
+        Args:
+            integration: Intégration Jenkins à utiliser.
+            job_name: Nom du job.
+            checkpoint_path: Fichier JSON du point de reprise (optionnel).
+            max_workers: Constructions récupérées simultanément.
+        """
+        self.integration = integration
+        self.job_name = job_name
+        self.checkpoint_path = checkpoint_path
+        self.max_workers = max_workers
+
+    def load_checkpoint(self) -> int:
+        """Retourne la dernière construction récoltée (0 si aucune)."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path) as f:
+            return int(json.load(f).get(self.job_name, 0))
+
+    def save_checkpoint(self, build_number: int) -> None:
+        """Enregistre la dernière construction récoltée (écriture atomique)."""
+        if not self.checkpoint_path:
+            return
+        state: Dict[str, int] = {}
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                state = json.load(f)
+        state[self.job_name] = build_number
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def harvest_build(self, build_number: int, commit_hash: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Récolte les résultats de tests d'une construction.
+
+        Args:
+            build_number: Numéro de la construction.
+            commit_hash: SHA construit, s'il est déjà connu (ex: fourni par un webhook).
+
+        Returns:
+            Lignes au format de `collect_test_results` (vide si pas de révision ou de rapport).
+
+        Raises:
+            requests.exceptions.RequestException: En cas d'erreur autre que 404.
+            ValueError, ijson.JSONError: Rapport de tests tronqué ou invalide.
+        """
+        if commit_hash is None:
+            commit_hash = self.integration.get_build_revision(self.job_name, build_number)
+        if commit_hash is None:
+            logger.warning(f"{self.job_name}#{build_number}: aucune révision Git, construction ignorée.")
+            return []
+
+        rows = []
+        for case in self.integration.iter_build_test_cases(self.job_name, build_number):
+            status = case.get("status")
+            if status not in FAILED_STATUSES and status not in PASSED_STATUSES:
+                continue
+            rows.append({
+                "test_id": f"{case.get('className', '')}.{case.get('name', '')}",
+                "commit_hash": commit_hash,
+                "test_failed": int(status in FAILED_STATUSES),
+            })
+        return rows
+
+    def iter_builds(
+        self, start: Optional[int] = None, end: Optional[int] = None, checkpoint: bool = True
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Récolte les constructions `start..end` et les émet dans l'ordre.
+
+        Args:
+            start: Première construction (par défaut: après le point de reprise).
+            end: Dernière construction (par défaut: dernière construction terminée).
+            checkpoint: Si faux, le point de reprise n'est jamais enregistré.
+
+        Le point de reprise d'une construction n'est enregistré que lorsque le
+        consommateur demande la suivante: une construction émise puis perdue
+        (arrêt, exception) sera récoltée à nouveau.
+
+        Yields:
+            Tuples (numéro de construction, lignes au format de `collect_test_results`).
+        """
+        start = start if start is not None else self.load_checkpoint() + 1
+        end = end if end is not None else self.integration.get_last_completed_build(self.job_name)
+        if end is None or start > end:
+            logger.info(f"{self.job_name}: aucune nouvelle construction à récolter.")
+            return
+
+        logger.info(f"{self.job_name}: récolte des constructions {start} à {end}.")
+        builds = iter(range(start, end + 1))
+        pending: Deque[Tuple[int, "Future[List[Dict[str, Any]]]"]] = deque()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            # Fenêtre glissante: quelques constructions d'avance, pas toute la plage
+            for build_number in builds:
+                pending.append((build_number, pool.submit(self.harvest_build, build_number)))
+                if len(pending) >= 2 * self.max_workers:
+                    break
+            while pending:
+                build_number, future = pending.popleft()
+                try:
+                    rows = future.result()
+                except requests.exceptions.RequestException as e:
+                    logger.error(f"{self.job_name}#{build_number}: échec de la récolte ({e}), arrêt.")
+                    return
+                except PARSE_ERRORS as e:
+                    logger.error(f"{self.job_name}#{build_number}: rapport de tests invalide ({e!r}), arrêt.")
+                    return
+                yield build_number, rows
+                # Le consommateur demande la construction suivante: il a traité celle-ci
+                if checkpoint:
+                    self.save_checkpoint(build_number)
+                next_build = next(builds, None)
+                if next_build is not None:
+                    pending.append((next_build, pool.submit(self.harvest_build, next_build)))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def harvest(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        sink: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Récolte les constructions et retourne un DataFrame (test_id, commit_hash, test_failed).
+
+        Le point de reprise n'avance que si `sink` est fourni: chaque construction
+        y est enregistrée avant que sa reprise ne soit marquée. Sans `sink`, les
+        lignes ne vivent qu'en mémoire et le point de reprise est laissé intact.
+
+        Args:
+            start: Première construction (par défaut: après le point de reprise).
+            end: Dernière construction (par défaut: dernière construction terminée).
+            sink: Fonction appelée avec (numéro de construction, lignes) pour les
+                persister (ex: `DataStore.record_test_results` sur les lignes).
+
+        Returns:
+            DataFrame au format de `DataCollector.collect_test_results`.
+        """
+        rows: List[Dict[str, Any]] = []
+        builds = 0
+        for build_number, build_rows in self.iter_builds(start, end, checkpoint=sink is not None):
+            if sink is not None:
+                sink(build_number, build_rows)
+            rows.extend(build_rows)
+            builds += 1
+        logger.info(f"{self.job_name}: {builds} constructions récoltées, {len(rows)} résultats de tests.")
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation (simulé)
     logger.info("Exemple d'utilisation de JenkinsIntegration simulé.")
     pass
@@ -0,0 +1,359 @@
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, get_type_hints
+
+import pandas as pd
+from loguru import logger
+from sklearn.base import BaseEstimator
+
+from pts import __version__
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="pipeline")
+
+
+class Stage(NamedTuple):
+    """
+    Étape du pipeline.
+
+    `func(config, **entrées)` reçoit la configuration puis les sorties des étapes
+    nommées par ses autres paramètres: le graphe et les types des entrées et de
+    la sortie sont lus dans la signature annotée de `func`.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    config_keys: Tuple[str, ...] = ()  # clés de configuration incluses dans l'empreinte
+    modules: Tuple[str, ...] = ()  # modules dont le code est inclus dans l'empreinte
+    source: Optional[Callable[[Dict[str, Any]], str]] = None  # empreinte des données externes
+
+    @property
+    def inputs(self) -> Tuple[str, ...]:
+        return tuple(inspect.signature(self.func).parameters)[1:]
+
+    @property
+    def output_type(self) -> type:
+        return get_type_hints(self.func)["return"]
+
+
+class PipelineRun(NamedTuple):
+    """Résultat d'une exécution: statut ("cached" ou "run"), durée et empreinte par étape."""
+
+    status: Dict[str, str]
+    seconds: Dict[str, float]
+    fingerprints: Dict[str, str]
+    outputs: Dict[str, Any]
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _file_stat(path: Optional[str]) -> str:
+    """Empreinte bon marché d'un fichier d'entrée: chemin, taille et date de modification."""
+    if not path or not os.path.exists(path):
+        return f"{path}:absent"
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class Pipeline:
+    """
+    Exécute un graphe d'étapes en ne recalculant que ce qui a changé.
+
+    L'empreinte d'une étape combine son nom, la version de son code (sources
+    des modules déclarés), sa section de configuration, ses données externes et
+    les empreintes de ses entrées: une modification invalide l'étape et toutes
+    celles qui en dépendent. Les sorties sont mises en cache sur disque par
+    empreinte; les branches indépendantes s'exécutent en parallèle (threads).
+    """
+
+    def __init__(self, stages: Sequence[Stage], config: Dict[str, Any]) -> None:
+        """
+        Args:
+            stages: Étapes du graphe (dans n'importe quel ordre).
+            config: Configuration (section `pipeline` pour l'orchestration).
+        """
+        section = config.get("pipeline", {})
+        self.config = config
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = section.get("cache_dir", "data/cache/pipeline")
+        self.max_workers = section.get("max_workers", 2)
+        self.keep = section.get("keep", 3)
+        self.order = self._validate()
+
+    def _validate(self) -> List[str]:
+        """Vérifie entrées et types du graphe et retourne un ordre topologique."""
+        for stage in self.stages.values():
+            hints = get_type_hints(stage.func)
+            for name in stage.inputs:
+                if name not in self.stages:
+                    raise ValueError(f"Étape '{stage.name}': entrée inconnue '{name}'.")
+                expected, produced = hints.get(name), self.stages[name].output_type
+                if expected is not None and not issubclass(produced, expected):
+                    raise TypeError(
+                        f"Étape '{stage.name}': l'entrée '{name}' attend {expected.__name__}, "
+                        f"l'étape '{name}' produit {produced.__name__}."
+                    )
+
+        order: List[str] = []
+        visiting: Set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle dans le pipeline autour de l'étape '{name}'.")
+            visiting.add(name)
+            for upstream in self.stages[name].inputs:
+                visit(upstream)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in sorted(self.stages):
+            visit(name)
+        return order
+
+    def _code_version(self, stage: Stage) -> str:
+        digest = hashlib.sha256(__version__.encode())
+        modules = {stage.func.__module__, *stage.modules}
+        for module in sorted(modules):
+            # Localise la source sans exécuter le module (scripts.* n'est pas toujours importable)
+            try:
+                spec = importlib.util.find_spec(module)
+            except ModuleNotFoundError:
+                spec = None
+            path = spec.origin if spec is not None else None
+            digest.update(_file_digest(path).encode() if path and os.path.isfile(path) else module.encode())
+        return digest.hexdigest()
+
+    def fingerprints(self) -> Dict[str, str]:
+        """Empreinte de chaque étape, dans l'ordre topologique."""
+        fingerprints: Dict[str, str] = {}
+        for name in self.order:
+            stage = self.stages[name]
+            payload = {
+                "stage": name,
+                "code": self._code_version(stage),
+                "config": {key: self.config.get(key) for key in stage.config_keys},
+                "source": stage.source(self.config) if stage.source else None,
+                "inputs": {upstream: fingerprints[upstream] for upstream in stage.inputs},
+            }
+            encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+            fingerprints[name] = hashlib.sha256(encoded).hexdigest()[:16]
+        return fingerprints
+
+    def _cache_path(self, name: str, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, name, f"{fingerprint}.pkl")
+
+    def _load(self, name: str, fingerprint: str) -> Any:
+        with open(self._cache_path(name, fingerprint), "rb") as f:
+            return pickle.load(f)
+
+    def _store(self, name: str, fingerprint: str, output: Any) -> None:
+        """Écrit la sortie de façon atomique puis ne garde que les `keep` plus récentes."""
+        path = self._cache_path(name, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+        directory = os.path.dirname(path)
+        entries = sorted(
+            (os.path.join(directory, entry) for entry in os.listdir(directory) if entry.endswith(".pkl")),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        for stale in entries[self.keep:]:
+            os.remove(stale)
+
+    def _execute(self, name: str, inputs: Dict[str, Any]) -> Tuple[Any, float]:
+        stage = self.stages[name]
+        start = time.perf_counter()
+        output = stage.func(self.config, **inputs)
+        if not isinstance(output, stage.output_type):
+            raise TypeError(
+                f"Étape '{name}': sortie de type {type(output).__name__}, {stage.output_type.__name__} attendu."
+            )
+        return output, time.perf_counter() - start
+
+    def run(self, targets: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> PipelineRun:
+        """
+        Exécute les étapes nécessaires aux cibles.
+
+        Args:
+            targets: Étapes dont la sortie est demandée (par défaut: les étapes finales).
+            force: Étapes à recalculer même si leur sortie est en cache.
+
+        Returns:
+            Statuts, durées, empreintes et sorties des cibles.
+        """
+        if targets is None:
+            consumed = {upstream for stage in self.stages.values() for upstream in stage.inputs}
+            targets = [name for name in self.order if name not in consumed]
+        targets = list(targets)
+        force = set(force)
+
+        # Étapes nécessaires: les cibles et leurs ancêtres
+        needed: Set[str] = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].inputs)
+        order = [name for name in self.order if name in needed]
+
+        fingerprints = self.fingerprints()
+        to_run = {
+            name for name in order
+            if name in force or not os.path.exists(self._cache_path(name, fingerprints[name]))
+        }
+        # Sorties en cache à charger: entrées d'une étape recalculée, et cibles
+        to_load = {
+            upstream for name in to_run for upstream in self.stages[name].inputs if upstream not in to_run
+        } | {name for name in targets if name not in to_run}
+
+        status = {name: "run" if name in to_run else "cached" for name in order}
+        seconds: Dict[str, float] = {}
+        outputs: Dict[str, Any] = {}
+        for name in order:
+            if name in to_load:
+                outputs[name] = self._load(name, fingerprints[name])
+                logger.info(f"Étape {name}: en cache ({fingerprints[name]}).")
+
+        remaining = [name for name in order if name in to_run]
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while remaining or running:
+                # Soumet toutes les étapes dont les entrées sont disponibles
+                for name in [n for n in remaining if all(u in outputs for u in self.stages[n].inputs)]:
+                    remaining.remove(name)
+                    inputs = {upstream: outputs[upstream] for upstream in self.stages[name].inputs}
+                    running[pool.submit(self._execute, name, inputs)] = name
+                    logger.info(f"Étape {name}: exécution ({fingerprints[name]}).")
+                if not running:
+                    raise RuntimeError(f"Étapes bloquées: {remaining}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        output, seconds[name] = future.result()
+                    except Exception:
+                        logger.error(f"Échec de l'étape {name}.")
+                        for other in running:
+                            other.cancel()
+                        raise
+                    self._store(name, fingerprints[name], output)
+                    outputs[name] = output
+                    logger.success(f"Étape {name} terminée en {seconds[name]:.2f} s.")
+
+        return PipelineRun(status, seconds, fingerprints, {name: outputs[name] for name in targets})
+
+
+# Étapes par défaut: collecte -> traitement -> extraction -> ingénierie -> sélection -> entraînement
+
+
+def _commits_source(config: Dict[str, Any]) -> str:
+    section = config.get("pipeline", {})
+    if section.get("commit_history"):
+        return _file_stat(section["commit_history"])
+    from git import Repo
+
+    return f"{Repo(section.get('repo_path', '.')).head.commit.hexsha}:{section.get('max_commits', 1000)}"
+
+
+def _test_results_source(config: Dict[str, Any]) -> str:
+    return _file_stat(config.get("pipeline", {}).get("test_results"))
+
+
+def mine_commits(config: Dict[str, Any]) -> pd.DataFrame:
+    """Historique des commits: fichier CSV (`pipeline.commit_history`) ou minage du dépôt."""
+    section = config.get("pipeline", {})
+    if section.get("commit_history"):
+        return pd.read_csv(section["commit_history"])
+    from pts.data.collector import DataCollector
+
+    collector = DataCollector(repo_path=section.get("repo_path", "."))
+    return collector.collect_commit_history(max_commits=section.get("max_commits", 1000))
+
+
+def ingest_test_results(config: Dict[str, Any]) -> pd.DataFrame:
+    """Résultats de tests: fichier CSV (`pipeline.test_results`) ou collecteur."""
+    section = config.get("pipeline", {})
+    if section.get("test_results"):
+        return pd.read_csv(section["test_results"])
+    from pts.data.collector import DataCollector
+
+    return DataCollector(repo_path=section.get("repo_path", ".")).collect_test_results()
+
+
+def process(config: Dict[str, Any], commits: pd.DataFrame, test_results: pd.DataFrame) -> pd.DataFrame:
+    from pts.data.processor import DataProcessor
+
+    return DataProcessor(config).run_processing_pipeline(
+        {"commit_history": commits.copy(), "test_results": test_results}
+    )
+
+
+def extract(config: Dict[str, Any], processed: pd.DataFrame) -> pd.DataFrame:
+    from pts.features.extractor import FeatureExtractor
+
+    return FeatureExtractor(config).run_extraction_pipeline(processed)
+
+
+def engineer(config: Dict[str, Any], extracted: pd.DataFrame) -> pd.DataFrame:
+    from pts.features.engineer import FeatureEngineer
+
+    return FeatureEngineer(config).run_engineering_pipeline(extracted.copy())
+
+
+def select(config: Dict[str, Any], engineered: pd.DataFrame) -> pd.DataFrame:
+    from pts.features.selector import FeatureSelector
+
+    return FeatureSelector(config).run_selection_pipeline(engineered)
+
+
+def train(config: Dict[str, Any], selected: pd.DataFrame) -> BaseEstimator:
+    from pts.core.trainer import ModelTrainer
+
+    return ModelTrainer(config).train(selected.drop(columns=["commit_id"], errors="ignore"))
+
+
+DEFAULT_STAGES = (
+    Stage("commits", mine_commits, ("pipeline",), ("pts.data.collector", "scripts.miner"), _commits_source),
+    Stage("test_results", ingest_test_results, ("pipeline",), ("pts.data.collector",), _test_results_source),
+    Stage("processed", process, (), ("pts.data.processor",)),
+    Stage("extracted", extract, (), ("pts.features.extractor",)),
+    Stage("engineered", engineer, (), ("pts.features.engineer",)),
+    Stage("selected", select, ("k_best", "target_column"), ("pts.features.selector",)),
+    Stage(
+        "model", train,
+        ("model_type", "model_params", "target_column", "split", "sampling"),
+        ("pts.core.trainer", "pts.core.sampling"),
+    ),
+)
+
+
+def default_pipeline(config: Dict[str, Any]) -> Pipeline:
+    """Pipeline complet de l'entraînement, de la collecte au modèle."""
+    return Pipeline(DEFAULT_STAGES, config)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: deux exécutions, la seconde entièrement en cache
+    sample_config = {"pipeline": {"cache_dir": "/tmp/pts_pipeline"}, "model_params": {"n_estimators": 20}}
+    for _ in range(2):
+        result = default_pipeline(sample_config).run()
+        logger.info(f"Statuts: {result.status}")
@@ -1,24 +1,80 @@
-from .logger import setup_logging
-from .metrics import (
-    TEST_REDUCTION_RATE,
-    COST_SAVINGS_USD,
-    PREDICTION_LATENCY,
-    update_test_reduction_rate,
-    increment_cost_savings,
-    observe_prediction_latency,
-    get_prometheus_metrics,
-)
-from .helpers import load_yaml_config, get_project_root
+from typing import TYPE_CHECKING
+
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .logger import setup_logging
+    from .metrics import (
+        TEST_REDUCTION_RATE,
+        COST_SAVINGS_USD,
+        PREDICTION_LATENCY,
+        STAGE_LATENCY,
+        TESTS_SCORED,
+        TESTS_SELECTED,
+        HTTP_CACHE_REQUESTS,
+        HTTP_CACHE_EVICTIONS,
+        update_test_reduction_rate,
+        increment_cost_savings,
+        observe_prediction_latency,
+        get_prometheus_metrics,
+        set_instrumentation_enabled,
+        time_stage,
+        timed_stage,
+        record_tests_scored,
+        record_tests_selected,
+        record_http_cache,
+    )
+    from .helpers import load_yaml_config, get_project_root
+    from .config import ConfigError, PTSConfig, load_config
+    from .profiling import configure_profiling, profile_run, profiled_stage, stage_report, reset_stage_report
 
 __all__ = [
     "setup_logging",
     "TEST_REDUCTION_RATE",
     "COST_SAVINGS_USD",
     "PREDICTION_LATENCY",
+    "STAGE_LATENCY",
+    "TESTS_SCORED",
+    "TESTS_SELECTED",
+    "HTTP_CACHE_REQUESTS",
+    "HTTP_CACHE_EVICTIONS",
     "update_test_reduction_rate",
     "increment_cost_savings",
     "observe_prediction_latency",
     "get_prometheus_metrics",
+    "set_instrumentation_enabled",
+    "time_stage",
+    "timed_stage",
+    "record_tests_scored",
+    "record_tests_selected",
+    "record_http_cache",
     "load_yaml_config",
     "get_project_root",
+    "ConfigError",
+    "PTSConfig",
+    "load_config",
+    "configure_profiling",
+    "profile_run",
+    "profiled_stage",
+    "stage_report",
+    "reset_stage_report",
 ]
+
+_EXPORTS = {name: ".metrics" for name in __all__}
+_EXPORTS.update(
+    {
+        "setup_logging": ".logger",
+        "load_yaml_config": ".helpers",
+        "get_project_root": ".helpers",
+        "ConfigError": ".config",
+        "PTSConfig": ".config",
+        "load_config": ".config",
+        "configure_profiling": ".profiling",
+        "profile_run": ".profiling",
+        "profiled_stage": ".profiling",
+        "stage_report": ".profiling",
+        "reset_stage_report": ".profiling",
+    }
+)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,267 @@
+import copy
+import os
+import threading
+from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple, Union
+
+import pandas as pd
+import yaml
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+
+from pts.utils.helpers import read_yaml
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="config")
+
+DEFAULT_CONFIG_PATH = "configs/model_config.yaml"
+
+# Surcharges par variables d'environnement: PTS_CONFIG__SELECTION_THRESHOLD=0.5,
+# PTS_CONFIG__REPLAY__THRESHOLD=0.4 (sections séparées par "__", valeurs lues en YAML)
+ENV_PREFIX = "PTS_CONFIG__"
+
+
+class ConfigError(ValueError):
+    """Configuration absente, illisible ou invalide."""
+
+
+class _Section(BaseModel):
+    """Section de configuration: clés inconnues refusées, objet immuable."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True, protected_namespaces=())
+
+
+def _check_period(value: Optional[str]) -> Optional[str]:
+    if value is not None:
+        try:
+            pd.to_timedelta(value)
+        except ValueError:
+            raise ValueError(f"période invalide: {value!r} (ex: 7D, 12h)") from None
+    return value
+
+
+class SearchParameter(_Section):
+    type: Literal["int", "float"]
+    low: Union[int, float]
+    high: Union[int, float]
+    log: bool = False
+
+    @model_validator(mode="after")
+    def _bounds(self) -> "SearchParameter":
+        if self.low >= self.high:
+            raise ValueError("low doit être inférieur à high")
+        return self
+
+
+class SearchConfig(_Section):
+    sampler: Literal["random", "tpe"] = "random"
+    n_trials: int = Field(27, ge=1)
+    n_brackets: int = Field(1, ge=1)
+    min_resource: int = Field(50, ge=1)
+    max_resource: int = Field(400, ge=1)
+    reduction_factor: int = Field(3, ge=2)
+    metric: Literal["logloss", "auc"] = "logloss"
+    n_cores: Optional[int] = Field(None, ge=1)
+    seed: int = 42
+    trials_path: str = "models/trials.sqlite"
+    space: Optional[Dict[str, SearchParameter]] = None
+
+    @model_validator(mode="after")
+    def _resources(self) -> "SearchConfig":
+        if self.min_resource > self.max_resource:
+            raise ValueError("min_resource doit être inférieur ou égal à max_resource")
+        return self
+
+
+class SplitConfig(_Section):
+    strategy: Literal["time", "random"] = "random"
+    date_column: str = "committed_date"
+    test_size: float = Field(0.2, gt=0, lt=1)
+
+
+class SamplingConfig(_Section):
+    negative_rate: float = Field(1.0, gt=0, le=1)
+    group_by: Optional[str] = None
+    seed: int = 42
+
+
+class EvaluationConfig(_Section):
+    bootstrap_resamples: int = Field(0, ge=0)
+    confidence: float = Field(0.95, gt=0, lt=1)
+    seed: int = 42
+
+
+class BacktestConfig(_Section):
+    date_column: str = "committed_date"
+    train_period: str = "28D"
+    test_period: str = "7D"
+    step: Optional[str] = None
+    expanding: bool = False
+    cache_dir: str = "data/cache/backtest"
+
+    _periods = field_validator("train_period", "test_period", "step")(_check_period)
+
+
+class ReplayConfig(_Section):
+    train_period: str = "28D"
+    retrain_every: str = "7D"
+    expanding: bool = False
+    threshold: Optional[float] = Field(None, ge=0, le=1)  # None: selection_threshold
+    cost_per_minute: float = Field(0.008, ge=0)
+
+    _periods = field_validator("train_period", "retrain_every")(_check_period)
+
+
+class ExternalMemoryConfig(_Section):
+    mode: Literal["external", "quantile"] = "external"
+    batch_size: int = Field(65536, ge=1)
+    cache_dir: str = "data/cache/xgboost"
+    update_rounds: int = Field(50, ge=0)
+
+
+class PipelineConfig(_Section):
+    repo_path: str = "."
+    max_commits: int = Field(1000, ge=1)
+    commit_history: Optional[str] = None
+    test_results: Optional[str] = None
+    cache_dir: str = "data/cache/pipeline"
+    max_workers: int = Field(2, ge=1)
+    keep: int = Field(3, ge=1)
+
+
+class PTSConfig(_Section):
+    """
+    Configuration validée du modèle et du pipeline (configs/model_config.yaml).
+
+    Les valeurs par défaut sont celles qu'appliquent les classes lorsqu'une clé
+    est absente. Les classes reçoivent toujours un dictionnaire: `to_dict()`.
+    """
+
+    model_type: Literal["XGBClassifier"] = "XGBClassifier"
+    model_params: Dict[str, Any] = Field(default_factory=dict)  # paramètres XGBoost, transmis tels quels
+    search: SearchConfig = SearchConfig()
+    split: SplitConfig = SplitConfig()
+    sampling: SamplingConfig = SamplingConfig()
+    evaluation: EvaluationConfig = EvaluationConfig()
+    backtest: BacktestConfig = BacktestConfig()
+    replay: ReplayConfig = ReplayConfig()
+    external_memory: ExternalMemoryConfig = ExternalMemoryConfig()
+    pipeline: PipelineConfig = PipelineConfig()
+    target_column: str = "test_failed"
+    selection_threshold: float = Field(0.6, ge=0, le=1)
+    model_save_path: str = "models/latest_model.json"
+    features: List[str] = Field(default_factory=list)
+    k_best: int = Field(10, ge=1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Dictionnaire attendu par les classes du pipeline (nouvelle copie à chaque appel).
+
+        Les valeurs nulles sont omises: la classe applique alors son propre repli
+        (ex: replay.threshold -> selection_threshold).
+        """
+        return self.model_dump(exclude_none=True)
+
+
+def env_overrides(environ: Optional[Mapping[str, str]] = None) -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+    """
+    Surcharges lues dans l'environnement (variables PTS_CONFIG__...).
+
+    Returns:
+        Paires (chemin de clés, valeur YAML brute), triées.
+    """
+    environ = os.environ if environ is None else environ
+    overrides = []
+    for name, raw in environ.items():
+        if name.startswith(ENV_PREFIX) and len(name) > len(ENV_PREFIX):
+            keys = tuple(key.lower() for key in name[len(ENV_PREFIX):].split("__"))
+            overrides.append((keys, raw))
+    return tuple(sorted(overrides, key=lambda item: item[0]))
+
+
+def parse_config(
+    raw: Optional[Mapping[str, Any]], overrides: Tuple = (), source: str = "<dict>"
+) -> PTSConfig:
+    """
+    Valide une configuration brute après application des surcharges.
+
+    Raises:
+        ConfigError: Configuration invalide (toutes les erreurs sont listées).
+    """
+    if raw is not None and not isinstance(raw, Mapping):
+        raise ConfigError(f"Configuration invalide ({source}): un dictionnaire est attendu.")
+    data = copy.deepcopy(dict(raw or {}))
+    for keys, value in overrides:
+        section = data
+        for key in keys[:-1]:
+            if not isinstance(section.get(key), dict):
+                section[key] = {}
+            section = section[key]
+        try:
+            section[keys[-1]] = yaml.safe_load(value)
+        except yaml.YAMLError:
+            raise ConfigError(f"Surcharge invalide {ENV_PREFIX}{'__'.join(keys).upper()}: {value!r}") from None
+
+    try:
+        return PTSConfig.model_validate(data)
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+        raise ConfigError(f"Configuration invalide ({source}): {errors}") from None
+
+
+# Configurations validées, par (chemin, date de modification, taille, surcharges)
+_CACHE: Dict[Tuple, PTSConfig] = {}
+_LOCK = threading.Lock()
+
+
+def load_config(path: str = DEFAULT_CONFIG_PATH, environ: Optional[Mapping[str, str]] = None) -> PTSConfig:
+    """
+    Charge et valide la configuration.
+
+    Le fichier n'est relu et validé que s'il a changé (ou si les surcharges
+    d'environnement ont changé): sinon, le même objet immuable est retourné.
+    Un appel par requête suffit donc à suivre les modifications du fichier.
+
+    Args:
+        path: Chemin du fichier YAML.
+        environ: Variables d'environnement (par défaut: os.environ).
+
+    Raises:
+        ConfigError: Fichier absent, YAML illisible ou configuration invalide.
+    """
+    absolute = os.path.abspath(path)
+    overrides = env_overrides(environ)
+    try:
+        stat = os.stat(absolute)
+    except FileNotFoundError:
+        raise ConfigError(f"Fichier de configuration non trouvé: {path}") from None
+
+    key = (absolute, stat.st_mtime_ns, stat.st_size, overrides)
+    config = _CACHE.get(key)
+    if config is not None:
+        return config
+
+    try:
+        raw = read_yaml(absolute)
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Erreur de parsing YAML dans {path}: {e}") from None
+    config = parse_config(raw, overrides, source=path)
+    with _LOCK:
+        # Seule la version courante de chaque fichier est conservée
+        for stale in [k for k in _CACHE if k[0] == absolute]:
+            del _CACHE[stale]
+        _CACHE[key] = config
+    logger.info(f"Configuration chargée et validée depuis: {path}")
+    return config
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: chargement mémoïsé et surcharge par l'environnement
+    settings = load_config()
+    assert load_config() is settings
+    logger.info(f"Seuil de sélection: {settings.selection_threshold}")
+    overridden = load_config(environ={"PTS_CONFIG__REPLAY__THRESHOLD": "0.4"})
+    logger.info(f"Seuil du rejeu (surchargé): {overridden.replay.threshold}")
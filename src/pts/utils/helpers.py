@@ -1,3 +1,5 @@
+import copy
+import functools
 import os
 import yaml
 from typing import Any, Dict, Optional
@@ -6,15 +8,39 @@ from loguru import logger
 
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="helpers")
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """Lit et analyse un fichier YAML; mémoïsé par chemin, date de modification et taille."""
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def read_yaml(file_path: str) -> Any:
+    """
+    Contenu d'un fichier YAML, relu seulement s'il a été modifié.
+
+    Le résultat est partagé entre les appels: ne pas le modifier.
+
+    Raises:
+        FileNotFoundError: Fichier absent.
+        yaml.YAMLError: YAML invalide.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return _parse_yaml(path, stat.st_mtime_ns, stat.st_size)
+
+
 def load_yaml_config(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Charge un fichier de configuration YAML.
 
+    Le fichier n'est relu que s'il a été modifié depuis le dernier appel; chaque
+    appel retourne une copie que l'appelant peut modifier.
+
     Args:
         file_path: Chemin vers le fichier YAML.
 
@@ -26,8 +52,7 @@ def load_yaml_config(file_path: str) -> Optional[Dict[str, Any]]:
         return None
 
     try:
-        with open(file_path, "r") as f:
-            config = yaml.safe_load(f)
+        config = copy.deepcopy(read_yaml(file_path))
         logger.info(f"Configuration chargée avec succès depuis: {file_path}")
         return config
     except yaml.YAMLError as e:
@@ -47,6 +72,7 @@ def get_project_root() -> str:
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     # Création d'un fichier de configuration temporaire
     temp_config_path = "temp_config.yaml"
@@ -0,0 +1,41 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Construit les fonctions `__getattr__` et `__dir__` (PEP 562) d'un package.
+
+    Les attributs publics ne sont importés qu'au premier accès, ce qui évite de
+    charger pandas, xgboost ou scikit-learn lors d'un simple `import pts`.
+
+    Args:
+        package: Nom du package (`__name__` du module appelant).
+        exports: Dictionnaire {nom_public: sous_module_relatif}. Un sous-module
+                 vide ("") désigne le sous-module portant le nom public.
+
+    Returns:
+        Tuple (`__getattr__`, `__dir__`) à assigner dans le module appelant.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        submodule = exports[name]
+        if submodule:
+            value = getattr(importlib.import_module(submodule, package), name)
+        else:
+            value = importlib.import_module(f".{name}", package)
+
+        # Mise en cache: les accès suivants ne repassent plus par __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
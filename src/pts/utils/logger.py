@@ -1,8 +1,160 @@
+import collections
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
 from loguru import logger
-from typing import Optional
+from typing import Callable, Dict, Iterator, Optional
 
-def setup_logging(level: str = "INFO", sink: Optional[str] = None) -> None:
+# Politiques appliquées lorsque la file du writer asynchrone est pleine
+DROP_POLICIES = ("drop_new", "drop_oldest")
+
+_STOP = object()
+
+
+class AsyncSink:
+    """
+    Sink Loguru non bloquant: les messages sont placés dans une file bornée et
+    écrits par un thread d'arrière-plan.
+
+    Lorsque la file est pleine, les messages sont abandonnés selon la politique
+    choisie plutôt que de bloquer l'appelant (ex: une requête de l'API).
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str], None],
+        flush: Optional[Callable[[], None]] = None,
+        queue_size: int = 10000,
+        drop_policy: str = "drop_new",
+    ) -> None:
+        """
+        Initialise le sink et démarre le thread d'écriture.
+
+        Args:
+            write: Fonction d'écriture d'un message formaté.
+            flush: Fonction de vidage appelée après chaque lot (optionnelle).
+            queue_size: Nombre maximum de messages en attente.
+            drop_policy: "drop_new" (abandonne le nouveau message) ou
+                         "drop_oldest" (abandonne le plus ancien).
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Politique d'abandon inconnue: {drop_policy}")
+
+        self._write = write
+        self._flush = flush
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=queue_size)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="pts-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        """Place un message dans la file sans jamais bloquer."""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            if self.drop_policy == "drop_oldest":
+                try:
+                    self._queue.get_nowait()
+                    self._queue.put_nowait(message)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Regroupe les messages déjà en attente pour un seul flush
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for message in batch:
+                if message is _STOP:
+                    self._flush_quietly()
+                    return
+                try:
+                    self._write(message)  # type: ignore[arg-type]
+                except Exception:
+                    self.dropped += 1
+            self._flush_quietly()
+
+    def _flush_quietly(self) -> None:
+        if self._flush is not None:
+            try:
+                self._flush()
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        """Écrit les messages restants puis arrête le thread (appelé par Loguru)."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+
+
+class LogSampler:
+    """
+    Échantillonneur déterministe pour les journaux des chemins critiques.
+
+    Avec un taux de 0.01, un appel sur cent est journalisé. Chaque point de
+    journalisation a son propre compteur: plusieurs points traversés par une même
+    requête ne se partagent pas la décision (et journalisent la même requête).
+    """
+
+    def __init__(self, rate: float = 1.0) -> None:
+        self.set_rate(rate)
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Modifie le taux d'échantillonnage.
+
+        Args:
+            rate: Proportion des appels à journaliser (entre 0 et 1).
+        """
+        self.rate = min(max(rate, 0.0), 1.0)
+        self._every = int(round(1 / self.rate)) if self.rate > 0 else 0
+        self._counters: Dict[str, Iterator[int]] = collections.defaultdict(itertools.count)
+
+    def __call__(self, site: str = "") -> bool:
+        """
+        Indique si l'appel courant doit être journalisé.
+
+        Args:
+            site: Point de journalisation (ex: "predictor.predict").
+        """
+        if self._every <= 1:
+            return self._every == 1
+        return next(self._counters[site]) % self._every == 0
+
+
+# Échantillonneur des journaux par requête (predict, select_tests, API), un compteur par point
+sampled = LogSampler(float(os.getenv("PTS_LOG_SAMPLE_RATE", "1.0")))
+
+
+def _file_writer(path: str) -> logging.handlers.RotatingFileHandler:
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+    )
+    handler.terminator = ""
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def setup_logging(
+    level: str = "INFO",
+    sink: Optional[str] = None,
+    async_mode: Optional[bool] = None,
+    sample_rate: Optional[float] = None,
+    queue_size: int = 10000,
+    drop_policy: str = "drop_new",
+) -> None:
     """
     Configure la journalisation (logging) pour l'application PTS.
 
@@ -11,38 +163,77 @@ def setup_logging(level: str = "INFO", sink: Optional[str] = None) -> None:
     Args:
         level: Niveau de journalisation minimum (ex: "INFO", "DEBUG", "WARNING").
         sink: Destination des logs (ex: "sys.stderr", "file.log").
+        async_mode: Si True, tous les sinks passent par un writer d'arrière-plan
+                    à file bornée (par défaut: $PTS_LOG_ASYNC).
+        sample_rate: Taux d'échantillonnage des journaux par requête
+                     (par défaut: $PTS_LOG_SAMPLE_RATE ou 1.0).
+        queue_size: Taille maximale de la file du writer asynchrone.
+        drop_policy: Politique lorsque la file est pleine ("drop_new" ou "drop_oldest").
     """
     logger.remove()  # Supprime le gestionnaire par défaut
-    
-    # Ajoute un nouveau gestionnaire pour la sortie standard (stderr)
-    logger.add(
-        sink=sys.stderr,
-        level=level,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        colorize=True,
-        diagnose=True,
-    )
 
-    # Ajoute un gestionnaire pour un fichier si spécifié
-    if sink:
+    if async_mode is None:
+        async_mode = os.getenv("PTS_LOG_ASYNC", "0") == "1"
+    if sample_rate is not None:
+        sampled.set_rate(sample_rate)
+
+    console_format = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    file_format = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+
+    if async_mode:
+        # Mode production: aucune E/S dans le thread appelant, pas de diagnose
+        logger.add(
+            sink=AsyncSink(sys.stderr.write, sys.stderr.flush, queue_size, drop_policy),
+            level=level,
+            format=console_format,
+            colorize=True,
+            diagnose=False,
+            backtrace=False,
+        )
+        if sink:
+            handler = _file_writer(sink)
+            logger.add(
+                sink=AsyncSink(
+                    lambda message: handler.emit(logging.makeLogRecord({"msg": message})),
+                    handler.flush,
+                    queue_size,
+                    drop_policy,
+                ),
+                level=level,
+                format=file_format,
+                diagnose=False,
+                backtrace=False,
+            )
+    else:
+        # Ajoute un nouveau gestionnaire pour la sortie standard (stderr)
         logger.add(
-            sink=sink,
+            sink=sys.stderr,
             level=level,
-            format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-            rotation="10 MB",
-            compression="zip",
-            enqueue=True,  # Rend la journalisation asynchrone et plus rapide
+            format=console_format,
+            colorize=True,
+            diagnose=True,
         )
 
-    logger.info(f"Journalisation configurée au niveau: {level}")
+        # Ajoute un gestionnaire pour un fichier si spécifié
+        if sink:
+            logger.add(
+                sink=sink,
+                level=level,
+                format=file_format,
+                rotation="10 MB",
+                compression="zip",
+                enqueue=True,  # Rend la journalisation asynchrone et plus rapide
+            )
+
+    logger.info("Journalisation configurée au niveau: {} (asynchrone: {})", level, async_mode)
 
 # Exemple d'utilisation (peut être appelé dans le point d'entrée de l'application)
 if __name__ == "__main__":
     setup_logging(level="DEBUG", sink="pts_app.log")
-    
+
     # L'utilisation de logger.bind permet d'ajouter un contexte
     app_logger = logger.bind(name="main_app")
-    
+
     app_logger.debug("Ceci est un message de débogage.")
     app_logger.info("L'application démarre.")
     app_logger.warning("Attention: une configuration par défaut est utilisée.")
@@ -1,19 +1,36 @@
-from typing import Dict, Any
+import functools
+import os
+import time
+from typing import Any, Callable, Dict, TypeVar
 
 from loguru import logger
-from prometheus_client import Gauge, Counter, Histogram, generate_latest
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
 
 from pts.utils.logger import setup_logging
 
-setup_logging()
 logger.disable("pts")
 logger = logger.bind(name="metrics_util")
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Instrumentation des étapes du chemin critique (désactivable: PTS_METRICS_ENABLED=0)
+INSTRUMENTATION_ENABLED = os.getenv("PTS_METRICS_ENABLED", "1") != "0"
+
 # Définition des métriques Prometheus
+# Toutes les métriques sont compatibles avec le mode multi-processus
+# (PROMETHEUS_MULTIPROC_DIR): les jauges précisent comment agréger les workers.
 # 1. Jauge pour le taux de réduction des tests
 TEST_REDUCTION_RATE = Gauge(
     "pts_test_reduction_rate",
     "Taux de réduction des tests (Tests sautés / Total tests)",
+    multiprocess_mode="mostrecent",
 )
 
 # 2. Compteur pour les économies de coûts
@@ -29,6 +46,169 @@ PREDICTION_LATENCY = Histogram(
     buckets=(0.001, 0.01, 0.1, 0.5, 1.0, 2.0, 5.0, float("inf")),
 )
 
+# 4. Histogramme par étape du chemin critique de prédiction
+STAGE_LATENCY = Histogram(
+    "pts_stage_latency_seconds",
+    "Latence par étape de la prédiction (en secondes)",
+    ["stage"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, float("inf")),
+)
+
+# 5. Compteurs de tests évalués et sélectionnés
+TESTS_SCORED = Counter(
+    "pts_tests_scored_total",
+    "Nombre total de tests évalués par le modèle",
+)
+TESTS_SELECTED = Counter(
+    "pts_tests_selected_total",
+    "Nombre total de tests sélectionnés pour l'exécution",
+)
+
+# 6. Cache de réponses HTTP des intégrations (hit, revalidated = 304, miss)
+HTTP_CACHE_REQUESTS = Counter(
+    "pts_http_cache_requests_total",
+    "Requêtes GET servies par le cache HTTP des intégrations, par résultat",
+    ["result"],
+)
+HTTP_CACHE_EVICTIONS = Counter(
+    "pts_http_cache_evictions_total",
+    "Entrées évincées du cache HTTP (LRU, taille maximale atteinte)",
+)
+
+# Enfants étiquetés de STAGE_LATENCY, résolus une seule fois par étape
+_STAGE_HISTOGRAMS: Dict[str, Any] = {}
+
+
+def set_instrumentation_enabled(enabled: bool) -> None:
+    """
+    Active ou désactive l'instrumentation des étapes et des compteurs de tests.
+
+    Args:
+        enabled: True pour enregistrer les mesures, False pour les ignorer.
+    """
+    global INSTRUMENTATION_ENABLED
+    INSTRUMENTATION_ENABLED = enabled
+
+
+def _stage_histogram(stage: str) -> Any:
+    histogram = _STAGE_HISTOGRAMS.get(stage)
+    if histogram is None:
+        histogram = _STAGE_HISTOGRAMS.setdefault(stage, STAGE_LATENCY.labels(stage=stage))
+    return histogram
+
+
+class StageTimer:
+    """
+    Chronomètre d'une étape, utilisable comme context manager.
+
+    Une instance est créée par bloc `with`, ce qui la rend sûre en contexte
+    concurrent (threads ou coroutines).
+    """
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, stage: str) -> None:
+        self._histogram = _stage_histogram(stage)
+        self._start = time.perf_counter()
+
+    def __enter__(self) -> "StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _NullTimer:
+    """Chronomètre inactif, partagé lorsque l'instrumentation est désactivée."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def time_stage(stage: str) -> Any:
+    """
+    Retourne un context manager mesurant la durée d'une étape.
+
+    Exemple:
+        with time_stage("inference"):
+            probabilities = model.predict_proba(X)
+
+    Args:
+        stage: Nom de l'étape (étiquette `stage` de pts_stage_latency_seconds).
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return _NULL_TIMER
+    return StageTimer(stage)
+
+
+def timed_stage(stage: str) -> Callable[[F], F]:
+    """
+    Décorateur mesurant la durée d'exécution d'une fonction comme une étape.
+
+    Args:
+        stage: Nom de l'étape (étiquette `stage` de pts_stage_latency_seconds).
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not INSTRUMENTATION_ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _stage_histogram(stage).observe(time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record_tests_scored(count: int) -> None:
+    """
+    Incrémente le compteur des tests évalués par le modèle.
+
+    Args:
+        count: Nombre de tests évalués.
+    """
+    if INSTRUMENTATION_ENABLED and count:
+        TESTS_SCORED.inc(count)
+
+
+def record_tests_selected(count: int) -> None:
+    """
+    Incrémente le compteur des tests sélectionnés.
+
+    Args:
+        count: Nombre de tests sélectionnés.
+    """
+    if INSTRUMENTATION_ENABLED and count:
+        TESTS_SELECTED.inc(count)
+
+
+def record_http_cache(result: str, evicted: int = 0) -> None:
+    """
+    Enregistre le résultat d'une consultation du cache HTTP.
+
+    Args:
+        result: "hit" (sans requête), "revalidated" (304) ou "miss".
+        evicted: Nombre d'entrées évincées à cette occasion.
+    """
+    if INSTRUMENTATION_ENABLED:
+        HTTP_CACHE_REQUESTS.labels(result=result).inc()
+        if evicted:
+            HTTP_CACHE_EVICTIONS.inc(evicted)
+
 
 def update_test_reduction_rate(total_tests: int, selected_tests: int) -> float:
     """
@@ -47,7 +227,7 @@ def update_test_reduction_rate(total_tests: int, selected_tests: int) -> float:
         trr = 1.0 - (selected_tests / total_tests)
 
     TEST_REDUCTION_RATE.set(trr)
-    logger.info(f"Mise à jour du Taux de Réduction des Tests (TRR): {trr:.4f}")
+    logger.debug("Mise à jour du Taux de Réduction des Tests (TRR): {:.4f}", trr)
     return trr
 
 
@@ -59,7 +239,7 @@ def increment_cost_savings(amount: float) -> None:
         amount: Montant des économies réalisées (en USD).
     """
     COST_SAVINGS_USD.inc(amount)
-    logger.info(f"Économies de coûts incrémentées de {amount} USD.")
+    logger.debug("Économies de coûts incrémentées de {} USD.", amount)
 
 
 def observe_prediction_latency(duration: float) -> None:
@@ -70,20 +250,28 @@ def observe_prediction_latency(duration: float) -> None:
         duration: Durée de la prédiction (en secondes).
     """
     PREDICTION_LATENCY.observe(duration)
-    logger.info(f"Latence de prédiction observée: {duration:.4f} secondes.")
+    logger.debug("Latence de prédiction observée: {:.4f} secondes.", duration)
 
 
 def get_prometheus_metrics() -> bytes:
     """
     Génère les métriques Prometheus au format texte.
 
+    En mode multi-processus (variable PROMETHEUS_MULTIPROC_DIR définie), les
+    valeurs écrites par chaque worker sont agrégées depuis ce répertoire.
+
     Returns:
         Les métriques encodées en bytes.
     """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
     return generate_latest()
 
 
 if __name__ == "__main__":
+    setup_logging()
     # Exemple d'utilisation
     update_test_reduction_rate(total_tests=1000, selected_tests=200)
     increment_cost_savings(amount=5.50)
@@ -0,0 +1,282 @@
+import cProfile
+import functools
+import io
+import itertools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, TypeVar
+
+from loguru import logger
+
+from pts.utils.logger import setup_logging
+
+logger.disable("pts")
+logger = logger.bind(name="profiling")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+PROFILE_MODES = ("cprofile", "sample")
+
+# Profilage des étapes (désactivé par défaut):
+# - PTS_PROFILE=cprofile|sample: profile les PTS_PROFILE_COUNT premiers appels de chaque étape;
+# - PTS_STAGE_REPORT=1: durée et pic mémoire (tracemalloc) de chaque étape;
+# - PTS_PROFILE_QUERY=1: autorise `?profile=cprofile|sample` sur /predict.
+PROFILE_MODE = os.getenv("PTS_PROFILE", "") if os.getenv("PTS_PROFILE", "") in PROFILE_MODES else ""
+PROFILE_COUNT = int(os.getenv("PTS_PROFILE_COUNT", "1"))
+PROFILE_DIR = os.getenv("PTS_PROFILE_DIR", "data/profiles")
+PROFILE_QUERY_ENABLED = os.getenv("PTS_PROFILE_QUERY", "0") != "0"
+STAGE_REPORT_ENABLED = os.getenv("PTS_STAGE_REPORT", "0") != "0"
+
+# Intervalle d'échantillonnage des piles (mode "sample")
+SAMPLE_INTERVAL = 0.005
+
+# Seul test du chemin rapide: faux tant que rien n'est activé
+_ENABLED = bool(PROFILE_MODE) or STAGE_REPORT_ENABLED
+
+# Appels déjà profilés par étape, et profilage en cours (cProfile ne s'imbrique pas)
+_PROFILED: Counter = Counter()
+_ACTIVE = threading.local()
+_RUN_IDS = itertools.count(1)
+
+# tracemalloc et cProfile sont globaux au processus: les étapes mesurées ou profilées
+# s'exécutent une à une, même lancées en parallèle (threads du Pipeline, requêtes).
+# Réentrant: une étape imbriquée dans le même thread ne se bloque pas.
+_STAGE_LOCK = threading.RLock()
+
+
+class StageRecord(NamedTuple):
+    """Mesure d'une exécution d'étape."""
+
+    stage: str
+    seconds: float
+    peak_memory_mb: Optional[float]  # None sans PTS_STAGE_REPORT
+    profile_dir: Optional[str]  # None si l'appel n'a pas été profilé
+
+
+_RECORDS: List[StageRecord] = []
+
+
+def configure_profiling(
+    mode: Optional[str] = None,
+    stage_report: Optional[bool] = None,
+    directory: Optional[str] = None,
+    count: Optional[int] = None,
+    query: Optional[bool] = None,
+) -> None:
+    """
+    Modifie la configuration du profilage (valeurs par défaut: variables d'environnement).
+
+    Args:
+        mode: "cprofile", "sample" ou "" pour désactiver le profilage des étapes.
+        stage_report: Enregistre durée et pic mémoire de chaque étape.
+        directory: Répertoire racine des profils.
+        count: Nombre d'appels profilés par étape.
+        query: Autorise le paramètre `profile` de /predict.
+    """
+    global PROFILE_MODE, STAGE_REPORT_ENABLED, PROFILE_DIR, PROFILE_COUNT, PROFILE_QUERY_ENABLED, _ENABLED
+    if mode is not None:
+        if mode and mode not in PROFILE_MODES:
+            raise ValueError(f"Mode de profilage inconnu: {mode} (disponibles: {PROFILE_MODES})")
+        PROFILE_MODE = mode
+        _PROFILED.clear()
+    if stage_report is not None:
+        STAGE_REPORT_ENABLED = stage_report
+    if directory is not None:
+        PROFILE_DIR = directory
+    if count is not None:
+        PROFILE_COUNT = count
+    if query is not None:
+        PROFILE_QUERY_ENABLED = query
+    _ENABLED = bool(PROFILE_MODE) or STAGE_REPORT_ENABLED
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage: un thread relève la pile du thread profilé à
+    intervalle régulier. Le surcoût ne dépend pas du nombre d'appels de fonctions,
+    contrairement à cProfile.
+
+    Les piles sont écrites au format « replié » (une pile par ligne, frames séparées
+    par `;`, suivie du nombre d'échantillons), lu par flamegraph.pl et speedscope.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="pts-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _run_directory(name: str) -> str:
+    """Crée le répertoire d'un profil: {PROFILE_DIR}/{date}-{nom}-{pid}-{n}."""
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(PROFILE_DIR, f"{timestamp}-{name}-{os.getpid()}-{next(_RUN_IDS)}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@contextmanager
+def profile_run(name: str, mode: str = "cprofile") -> Iterator[str]:
+    """
+    Profile le bloc et écrit le résultat dans un nouveau répertoire.
+
+    - cprofile: `profile.prof` (pstats, lisible par snakeviz) et `profile.txt`
+      (40 fonctions les plus coûteuses en temps cumulé);
+    - sample: `stacks.txt` (piles repliées).
+
+    Les blocs profilés de plusieurs threads s'exécutent l'un après l'autre.
+
+    Args:
+        name: Nom du profil (étape, requête).
+        mode: "cprofile" ou "sample".
+
+    Yields:
+        Le répertoire du profil.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Mode de profilage inconnu: {mode} (disponibles: {PROFILE_MODES})")
+    with _STAGE_LOCK:
+        directory = _run_directory(name)
+        profiler: Any = cProfile.Profile() if mode == "cprofile" else SamplingProfiler()
+        _ACTIVE.running = True
+        profiler.enable() if mode == "cprofile" else profiler.start()
+        try:
+            yield directory
+        finally:
+            if mode == "cprofile":
+                profiler.disable()
+                profiler.dump_stats(os.path.join(directory, "profile.prof"))
+                summary = io.StringIO()
+                pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(40)
+                with open(os.path.join(directory, "profile.txt"), "w") as f:
+                    f.write(summary.getvalue())
+            else:
+                profiler.stop()
+                profiler.write(os.path.join(directory, "stacks.txt"))
+            _ACTIVE.running = False
+            logger.info(f"Profil {mode} de '{name}' écrit dans {directory}")
+
+
+def _run_stage(stage: str, func: Callable[..., Any], args: Any, kwargs: Any) -> Any:
+    """
+    Exécute une étape avec mesure et, selon la configuration, profilage.
+
+    Les étapes sont sérialisées (`_STAGE_LOCK`): une étape ne doit pas attendre
+    une étape décorée exécutée dans un autre thread.
+    """
+    with _STAGE_LOCK:
+        return _measure_stage(stage, func, args, kwargs)
+
+
+def _measure_stage(stage: str, func: Callable[..., Any], args: Any, kwargs: Any) -> Any:
+    profile = (
+        PROFILE_MODE
+        and _PROFILED[stage] < PROFILE_COUNT
+        and not getattr(_ACTIVE, "running", False)
+    )
+    # Un seul suivi tracemalloc à la fois: une étape imbriquée est mesurée par l'étape englobante
+    trace = STAGE_REPORT_ENABLED and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+
+    directory = None
+    start = time.perf_counter()
+    try:
+        if profile:
+            _PROFILED[stage] += 1
+            with profile_run(stage, PROFILE_MODE) as directory:
+                return func(*args, **kwargs)
+        return func(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        peak_mb = None
+        if trace:
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        record = StageRecord(stage, seconds, peak_mb, directory)
+        if STAGE_REPORT_ENABLED:
+            _RECORDS.append(record)
+            memory = f", pic mémoire {peak_mb:.1f} Mo" if peak_mb is not None else ""
+            logger.info(f"Étape {stage}: {seconds:.3f} s{memory}.")
+        if directory:
+            with open(os.path.join(directory, "report.json"), "w") as f:
+                json.dump(record._asdict(), f, indent=2)
+
+
+def profiled_stage(stage: str) -> Callable[[F], F]:
+    """
+    Décorateur des étapes du pipeline (méthodes `run_*_pipeline`, entraînement...).
+
+    Désactivé (par défaut), il coûte un appel de fonction et un test de booléen.
+    Activé, il exécute les étapes une à une dans le processus.
+
+    Args:
+        stage: Nom de l'étape dans le rapport et dans les répertoires de profils.
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _ENABLED:
+                return func(*args, **kwargs)
+            return _run_stage(stage, func, args, kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def stage_report() -> List[Dict[str, Any]]:
+    """Mesures des étapes exécutées depuis le dernier `reset_stage_report` (PTS_STAGE_REPORT=1)."""
+    return [record._asdict() for record in _RECORDS]
+
+
+def reset_stage_report() -> None:
+    """Vide le rapport des étapes."""
+    _RECORDS.clear()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Exemple d'utilisation: rapport des étapes et profil par échantillonnage
+    configure_profiling(mode="sample", stage_report=True, directory="/tmp/pts_profiles")
+
+    @profiled_stage("example")
+    def build(n: int) -> int:
+        return len([str(i) for i in range(n)])
+
+    build(2_000_000)
+    for entry in stage_report():
+        logger.info(entry)
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Réponse simulée: (statut, en-têtes, corps JSON ou bytes)
+StubResponse = Tuple[int, Dict[str, str], Any]
+StubRoute = Callable[[str, Dict[str, List[str]], Dict[str, str]], StubResponse]
+
+
+class StubServer:
+    """
+    Serveur HTTP/1.1 local pour tester les intégrations sans réseau.
+
+    Compte les connexions TCP ouvertes, les requêtes reçues et la concurrence
+    maximale observée. Chaque route est une fonction (chemin, query, en-têtes)
+    qui renvoie (statut, en-têtes, corps).
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.routes: Dict[str, StubRoute] = {}
+        self.prefix_routes: Dict[str, StubRoute] = {}
+        self.latency = latency
+        self.connections_opened = 0
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.max_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, path: str, handler: StubRoute) -> None:
+        self.routes[path] = handler
+
+    def prefix_route(self, prefix: str, handler: StubRoute) -> None:
+        """Route appliquée à tous les chemins commençant par `prefix`."""
+        self.prefix_routes[prefix] = handler
+
+    def _resolve(self, path: str) -> Optional[StubRoute]:
+        handler = self.routes.get(path)
+        if handler is None:
+            for prefix, candidate in self.prefix_routes.items():
+                if path.startswith(prefix):
+                    return candidate
+        return handler
+
+    def json_route(self, path: str, body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        self.routes[path] = lambda *_: (status, headers or {}, body)
+
+    def sequence_route(self, path: str, responses: List[StubResponse]) -> None:
+        """Route renvoyant les réponses dans l'ordre (la dernière est répétée)."""
+        remaining = list(responses)
+
+        def handler(*_: Any) -> StubResponse:
+            return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+        self.routes[path] = handler
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections_opened += 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                split = urlsplit(self.path)
+                headers = {key.lower(): value for key, value in self.headers.items()}
+                with stub._lock:
+                    stub.requests.append((self.path, headers))
+                    stub._active += 1
+                    stub.max_concurrency = max(stub.max_concurrency, stub._active)
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    handler = stub._resolve(split.path)
+                    if handler is None:
+                        status, extra_headers, body = 404, {}, {"message": "Not Found"}
+                    else:
+                        status, extra_headers, body = handler(split.path, parse_qs(split.query), headers)
+                finally:
+                    with stub._lock:
+                        stub._active -= 1
+
+                if body is None:
+                    payload = b""
+                else:
+                    payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in extra_headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -60,3 +62,109 @@ def test_metrics_endpoint():
     assert "pts_test_reduction_rate" in content
     assert "pts_cost_savings_usd_total" in content
     assert "pts_prediction_latency_seconds" in content
+
+
+def test_predict_openapi_schema_preserved():
+    """Teste que le schéma OpenAPI référence toujours les modèles de réponse."""
+    schema = client.get("/openapi.json").json()
+
+    predict_response = schema["paths"]["/api/v1/predict"]["post"]["responses"]["200"]
+    health_response = schema["paths"]["/api/v1/health"]["get"]["responses"]["200"]
+
+    assert predict_response["content"]["application/json"]["schema"]["$ref"].endswith("/PredictionResponse")
+    assert health_response["content"]["application/json"]["schema"]["$ref"].endswith("/HealthCheckResponse")
+
+
+def test_predict_response_matches_model():
+    """Teste que la réponse orjson respecte le modèle PredictionResponse."""
+    from pts.api.models import PredictionResponse
+
+    request_data = {
+        "commit_hash": "a1b2c3d4e5f67890",
+        "repository_url": "https://github.com/Amir032-cyber/AI-Optimized-Massive-Scale-CI-CD",
+    }
+
+    response = client.post("/api/v1/predict", json=request_data)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    PredictionResponse.model_validate(response.json())
+
+
+def test_selector_shared_between_requests():
+    """Teste que le sélecteur est chargé une seule fois par processus."""
+    from pts.api.routes import get_test_selector
+
+    assert get_test_selector() is get_test_selector()
+
+
+def test_metrics_multiprocess_aggregation(tmp_path):
+    """Teste l'agrégation des métriques écrites par plusieurs processus."""
+    import subprocess
+    import sys
+
+    code = (
+        "import os\n"
+        "from multiprocessing import get_context\n"
+        "from pts.utils.metrics import observe_prediction_latency, get_prometheus_metrics\n"
+        "ctx = get_context('fork')\n"
+        "procs = [ctx.Process(target=observe_prediction_latency, args=(0.01,)) for _ in range(3)]\n"
+        "[p.start() for p in procs]\n"
+        "[p.join() for p in procs]\n"
+        "print(get_prometheus_metrics().decode())\n"
+    )
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+    assert "pts_prediction_latency_seconds_count 3.0" in result.stdout
+
+
+def test_predict_profile_query_flag(tmp_path):
+    """Teste le profilage d'une requête /predict via `?profile=` (PTS_PROFILE_QUERY=1)."""
+    from pts.utils import profiling
+
+    request_data = {"commit_hash": "a1b2c3d4e5f67890", "repository_url": "https://example.com/repo.git"}
+    previous = (profiling.PROFILE_DIR, profiling.PROFILE_QUERY_ENABLED)
+
+    # Paramètre ignoré tant que le profilage par requête n'est pas autorisé
+    response = client.post("/api/v1/predict?profile=sample", json=request_data)
+    assert response.status_code == 200
+    assert "x-pts-profile" not in response.headers
+
+    profiling.configure_profiling(directory=str(tmp_path), query=True)
+    try:
+        response = client.post("/api/v1/predict?profile=sample", json=request_data)
+        assert response.status_code == 200
+        assert os.path.exists(os.path.join(response.headers["x-pts-profile"], "stacks.txt"))
+        assert client.post("/api/v1/predict?profile=perf", json=request_data).status_code == 400
+    finally:
+        profiling.configure_profiling(directory=previous[0], query=previous[1])
+
+
+def test_model_state_reloads_when_config_changes(tmp_path, monkeypatch):
+    """Teste le rechargement du sélecteur après modification de la configuration."""
+    from pts.api import state
+
+    path = tmp_path / "config.yaml"
+    path.write_text("selection_threshold: 0.5\n")
+    monkeypatch.setattr(state, "CONFIG_PATH", str(path))
+    monkeypatch.setattr(state, "CONFIG_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(state, "_SELECTOR", None)
+    monkeypatch.setattr(state, "_CONFIG", None)
+    monkeypatch.delenv("PTS_SELECTION_THRESHOLD", raising=False)
+
+    selector = state.get_model_state()
+    assert selector.threshold == 0.5
+    assert state.get_model_state() is selector
+
+    # Une section sans rapport avec le sélecteur ne recharge pas le modèle
+    path.write_text("selection_threshold: 0.5\nk_best: 5\n")
+    assert state.get_model_state() is selector
+    assert state._CONFIG.k_best == 5
+
+    path.write_text("selection_threshold: 0.35\n")
+    assert state.get_model_state().threshold == 0.35
+
+    # Une configuration invalide est ignorée après le démarrage
+    path.write_text("selection_threshold: 1.5\n")
+    assert state.get_model_state().threshold == 0.35
@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+# Définir le chemin de base du projet
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+def run_script(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+
+
+def test_pipeline_suite_report_and_regression_check(tmp_path):
+    """Teste la suite de benchmarks à petite échelle puis la détection de régression."""
+    baseline = tmp_path / "baseline.json"
+    result = run_script("benchmarks/pipeline_suite.py", "--commits", "20", "--tests", "20", "--files", "40",
+                        "--repeat", "1", "--stages", "process", "engineer", "predict", "--output", str(baseline))
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(baseline.read_text())
+    assert set(report["stages"]) == {"process", "engineer", "predict"}
+    assert report["stages"]["process"]["rows"] == 400
+    assert report["meta"]["scale"] == {"commits": 20, "tests": 20, "files": 40}
+
+    # Rapport identique: aucune régression; étape 3x plus lente: régression signalée
+    assert run_script("benchmarks/compare.py", str(baseline), str(baseline)).returncode == 0
+    slower = tmp_path / "slower.json"
+    report["stages"]["engineer"]["median_s"] = 3 * report["stages"]["engineer"]["median_s"] + 1.0
+    slower.write_text(json.dumps(report))
+    result = run_script("benchmarks/compare.py", str(baseline), str(slower), "--tolerance", "0.2")
+    assert result.returncode == 1
+    assert "RÉGRESSION" in result.stdout
@@ -93,3 +93,50 @@ def test_e2e_train_predict_evaluate():
     assert metrics["defect_detection_rate"] <= 1.0
     
     print(f"Métriques E2E: {metrics}")
+
+
+def test_evaluate_joins_each_run_to_its_commit(tmp_path):
+    """
+    Teste les métriques, le balayage des seuils et le bootstrap du script d'évaluation
+    lorsque les mêmes test_id reviennent à chaque commit: chaque prédiction n'est
+    comparée qu'au résultat de son commit.
+    """
+    import numpy as np
+
+    from pts.core.trainer import ModelTrainer
+
+    rng = np.random.default_rng(0)
+    n_commits, n_tests = 40, 10
+    failed = (rng.random(n_commits * n_tests) < 0.15).astype(int)
+    data_df = pd.DataFrame({
+        "test_id": [f"test_{i}" for i in range(n_tests)] * n_commits,
+        "commit_hash": np.repeat([f"c{i}" for i in range(n_commits)], n_tests),
+        # Caractéristique parfaitement prédictive de l'échec de cette exécution
+        "feature_churn": failed + 0.1 * rng.random(n_commits * n_tests),
+        "test_failed": failed,
+    })
+    data_path = tmp_path / "evaluation_data.csv"
+    data_df.to_csv(data_path, index=False)
+
+    model_path = str(tmp_path / "model.json")
+    trainer = ModelTrainer(config={"model_params": {"n_estimators": 20, "max_depth": 2}})
+    trainer.train(data_df.drop(columns=["commit_hash"]))
+    trainer.save_model(model_path)
+    config_path = tmp_path / "model_config.yaml"
+    config_path.write_text(yaml.safe_dump({"model_save_path": model_path, "selection_threshold": 0.5}))
+
+    metrics_path, sweep_path = tmp_path / "metrics.yaml", tmp_path / "sweep.csv"
+    result = run_script("evaluate.py", ["--config", str(config_path), "--data", str(data_path),
+                                        "--output", str(metrics_path), "--bootstrap", "50",
+                                        "--sweep", str(sweep_path), "--target-ddr", "1.0"])
+    assert result.returncode == 0, f"Échec de l'évaluation: {result.stderr}"
+    metrics = yaml.safe_load(metrics_path.read_text())
+
+    # Une jointure sur test_id seul croiserait les commits et dégraderait ces résultats
+    assert metrics["total_tests"] == n_commits * n_tests
+    assert metrics["defect_detection_rate"] == 1.0
+    assert pd.read_csv(sweep_path)["total_selected"].max() == n_commits * n_tests
+    assert metrics["recommended_test_reduction_rate"] == pytest.approx(1 - failed.mean())
+    assert metrics["defect_detection_rate_ci_lower"] == 1.0
+    assert metrics["roc_auc_ci_lower"] == 1.0
+    assert metrics["test_reduction_rate_ci_upper"] < 1.0
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from pts.integrations.github import GitHubIntegration
+from pts.integrations.http import AsyncHttpClient
+from tests.fixtures.stub_server import StubServer
+
+COMMITS_PREFIX = "/repos/owner/repo/commits/"
+
+
+def commit_route(path, query, headers):
+    """Réponse GitHub simulée pour `GET /commits/{sha}`; les SHA "missing*" n'existent pas."""
+    sha = path[len(COMMITS_PREFIX):]
+    if sha.startswith("missing"):
+        return 404, {}, {"message": "Not Found"}
+    return 200, {}, {
+        "sha": sha,
+        "commit": {"author": {"name": "Dev", "date": "2024-01-01T00:00:00Z"}, "message": f"msg {sha}"},
+        "files": [{"filename": f"src/{sha}.py"}],
+    }
+
+
+@pytest.fixture
+def slow_stub():
+    """Serveur local avec une latence artificielle de 50 ms par requête."""
+    with StubServer(latency=0.05) as server:
+        server.prefix_route(COMMITS_PREFIX, commit_route)
+        yield server
+
+
+def make_integration(stub: StubServer) -> GitHubIntegration:
+    return GitHubIntegration(token="t", repo_owner="owner", repo_name="repo", api_url=stub.url)
+
+
+def test_aget_commit_details(slow_stub):
+    """Teste la variante asynchrone d'un appel unitaire."""
+    details = asyncio.run(make_integration(slow_stub).aget_commit_details("abc"))
+
+    assert details["sha"] == "abc"
+    assert details["changed_files"] == ["src/abc.py"]
+    assert slow_stub.requests[0][1]["authorization"] == "token t"
+
+
+def test_aget_many_preserves_order_and_bounds_concurrency(slow_stub):
+    """Teste l'ordre des résultats, la borne de concurrence et le gain de débit."""
+    shas = [f"sha{i:03d}" for i in range(40)]
+    shas[7] = "missing-7"
+
+    start = time.perf_counter()
+    results = asyncio.run(make_integration(slow_stub).aget_many(shas, concurrency=8))
+    elapsed = time.perf_counter() - start
+
+    assert [r["sha"] if r else None for r in results] == [s if s != "missing-7" else None for s in shas]
+    assert slow_stub.max_concurrency <= 8
+    # 40 requêtes de 50 ms en séquentiel prendraient 2 s
+    assert elapsed < 1.0
+
+
+def test_astream_yields_every_commit(slow_stub):
+    """Teste que le flux renvoie chaque commit une fois, via un client partagé."""
+
+    async def collect():
+        async with AsyncHttpClient(per_host_limit=4) as client:
+            integration = make_integration(slow_stub)
+            return [item async for item in integration.astream_commit_details(
+                [f"s{i}" for i in range(12)], concurrency=6, client=client
+            )]
+
+    items = asyncio.run(collect())
+
+    assert sorted(sha for sha, _ in items) == sorted(f"s{i}" for i in range(12))
+    assert all(details["sha"] == sha for sha, details in items)
+    # La limite par hôte du client partagé s'applique en plus de la concurrence demandée
+    assert slow_stub.max_concurrency <= 4
+
+
+def test_astream_early_exit_cancels_pending_requests(slow_stub):
+    """Teste qu'un arrêt anticipé du consommateur n'épuise pas la liste de SHA."""
+
+    async def first_two():
+        integration = make_integration(slow_stub)
+        stream = integration.astream_commit_details([f"s{i}" for i in range(100)], concurrency=4)
+        items = []
+        async for item in stream:
+            items.append(item)
+            if len(items) == 2:
+                break
+        await stream.aclose()
+        return items
+
+    assert len(asyncio.run(first_two())) == 2
+    assert len(slow_stub.requests) < 20
+
+
+def test_async_client_retries_on_server_error():
+    """Teste que le client asynchrone applique la même politique de tentatives."""
+    with StubServer() as stub:
+        stub.sequence_route("/flaky", [(503, {}, {}), (503, {}, {}), (200, {}, {"ok": True})])
+
+        async def fetch():
+            async with AsyncHttpClient(backoff_factor=0.001) as client:
+                return await client.get(f"{stub.url}/flaky")
+
+        response = asyncio.run(fetch())
+
+    assert response.status_code == 200
+    assert len(stub.requests) == 3
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from pts.integrations.cache import ResponseCache
+from pts.integrations.github import GitHubIntegration
+from pts.integrations.http import AsyncHttpClient, HttpClient
+from tests.fixtures.stub_server import StubServer
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+def cache_count(result: str) -> float:
+    """Retourne la valeur du compteur de cache HTTP pour un résultat."""
+    return REGISTRY.get_sample_value("pts_http_cache_requests_total", {"result": result}) or 0.0
+
+
+def etag_route(body, etag='"v1"'):
+    """Route qui honore If-None-Match (304 si l'ETag correspond)."""
+
+    def handler(path, query, headers):
+        if headers.get("if-none-match") == etag:
+            return 304, {"ETag": etag}, None
+        return 200, {"ETag": etag, "Link": '<http://x/?page=2>; rel="next"'}, body
+
+    return handler
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "http_cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_etag_revalidation_counts_304_as_hit(cache):
+    """Teste l'envoi de If-None-Match et le service du corps en cache sur 304."""
+    with StubServer() as stub:
+        stub.route("/repos/o/r/pulls/1/files", etag_route([{"filename": "a.py"}]))
+        client = HttpClient(cache=cache)
+        url = f"{stub.url}/repos/o/r/pulls/1/files"
+        before = cache_count("revalidated")
+
+        first = client.get(url, params={"per_page": 100})
+        second = client.get(url, params={"per_page": 100})
+
+        assert first.json() == second.json() == [{"filename": "a.py"}]
+        assert second.headers["Link"] == first.headers["Link"]
+        assert getattr(second, "from_cache", False)
+        assert "if-none-match" not in stub.requests[0][1]
+        assert stub.requests[1][1]["if-none-match"] == '"v1"'
+        assert cache_count("revalidated") == before + 1
+
+
+def test_commit_by_full_sha_is_served_without_request(cache):
+    """Teste qu'un commit désigné par son SHA complet n'est demandé qu'une fois."""
+    with StubServer() as stub:
+        stub.json_route(f"/repos/o/r/commits/{SHA}", {
+            "sha": SHA,
+            "commit": {"author": {"name": "Dev", "date": "2024-01-01"}, "message": "m"},
+            "files": [],
+        })
+        integration = GitHubIntegration(
+            token="t", repo_owner="o", repo_name="r", api_url=stub.url, client=HttpClient(cache=cache)
+        )
+
+        assert integration.get_commit_details(SHA)["sha"] == SHA
+        assert integration.get_commit_details(SHA)["sha"] == SHA
+        assert len(stub.requests) == 1
+
+        # Le cache est persistant: un nouveau client ne refait pas la requête
+        reopened = ResponseCache(cache.path)
+        HttpClient(cache=reopened).get(f"{stub.url}/repos/o/r/commits/{SHA}", headers=integration.headers)
+        assert len(stub.requests) == 1
+        reopened.close()
+
+
+def test_cached_responses_are_not_shared_across_credentials(cache):
+    """Teste qu'une réponse obtenue avec un jeton n'est pas servie avec un autre jeton, ou sans jeton."""
+    with StubServer() as stub:
+        stub.json_route(f"/repos/o/r/commits/{SHA}", {"sha": SHA})
+        client = HttpClient(cache=cache)
+        url = f"{stub.url}/repos/o/r/commits/{SHA}"
+
+        client.get(url, headers={"Authorization": "token a"})
+        client.get(url, headers={"Authorization": "token a"})
+        assert len(stub.requests) == 1
+        client.get(url, headers={"Authorization": "token b"})
+        client.get(url)
+        client.get(url, auth=("user", "secret"))
+        client.get(url, auth=("user", "other"))
+        assert len(stub.requests) == 5
+
+    stored = cache._conn.execute("SELECT key FROM responses").fetchall()
+    assert not any("token" in key or "secret" in key for (key,) in stored)
+
+
+def test_responses_without_validators_are_not_cached(cache):
+    """Teste qu'une réponse sans ETag ni Last-Modified n'est pas conservée."""
+    with StubServer() as stub:
+        stub.json_route("/repos/o/r/commits/HEAD", {"sha": "x"})
+        client = HttpClient(cache=cache)
+        client.get(f"{stub.url}/repos/o/r/commits/HEAD")
+        client.get(f"{stub.url}/repos/o/r/commits/HEAD")
+
+    assert len(stub.requests) == 2
+    assert len(cache) == 0
+
+
+def test_lru_eviction_keeps_size_bounded(tmp_path):
+    """Teste l'éviction des entrées les moins récemment utilisées."""
+    cache = ResponseCache(str(tmp_path / "small.sqlite"), max_bytes=3000)
+    headers = {"ETag": '"x"'}
+    for name in ("a", "b", "c"):
+        cache.put(cache.key(name), name, headers, b"0" * 1000)
+    cache.get(cache.key("a"))  # "a" devient la plus récemment utilisée
+
+    evicted = cache.put(cache.key("d"), "d", headers, b"0" * 1000)
+
+    assert evicted >= 1
+    assert cache.size_bytes() <= 3000
+    assert cache.get(cache.key("b")) is None
+    assert cache.get(cache.key("a")) is not None
+    assert cache.get(cache.key("d")) is not None
+    cache.close()
+
+
+def test_async_client_uses_cache(cache):
+    """Teste que le client asynchrone partage la même logique de cache."""
+    with StubServer() as stub:
+        stub.route("/data", etag_route({"value": 1}))
+
+        async def fetch_twice():
+            async with AsyncHttpClient(cache=cache) as client:
+                await client.get(f"{stub.url}/data")
+                return await client.get(f"{stub.url}/data")
+
+        response = asyncio.run(fetch_twice())
+
+    assert response.status_code == 200
+    assert response.json() == {"value": 1}
+    assert response.extensions.get("from_cache")
+    assert stub.requests[1][1]["if-none-match"] == '"v1"'
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from pts.integrations.github import GitHubIntegration
+from pts.integrations.http import HttpClient, parse_retry_after, rate_limit_delay
+from tests.fixtures.stub_server import StubServer
+
+
+@pytest.fixture
+def stub():
+    """Démarre un serveur HTTP local pour la durée du test."""
+    with StubServer() as server:
+        yield server
+
+
+def fast_client(**kwargs) -> HttpClient:
+    """Client avec des délais de backoff négligeables pour les tests."""
+    kwargs.setdefault("backoff_factor", 0.001)
+    return HttpClient(**kwargs)
+
+
+def test_connections_are_reused(stub):
+    """Teste que les requêtes successives réutilisent la même connexion keep-alive."""
+    stub.json_route("/ping", {"ok": True})
+    client = fast_client()
+
+    for _ in range(20):
+        assert client.get(f"{stub.url}/ping").json() == {"ok": True}
+
+    assert len(stub.requests) == 20
+    assert stub.connections_opened == 1
+
+
+def test_module_level_requests_open_one_connection_per_call(stub):
+    """Référence: requests.get ouvre une nouvelle connexion à chaque appel."""
+    stub.json_route("/ping", {"ok": True})
+
+    for _ in range(5):
+        requests.get(f"{stub.url}/ping", timeout=5)
+
+    assert stub.connections_opened == 5
+
+
+def test_retry_on_server_error_honors_retry_after(stub):
+    """Teste les nouvelles tentatives sur 503 avec en-tête Retry-After."""
+    stub.sequence_route(
+        "/flaky",
+        [
+            (503, {"Retry-After": "0"}, {"message": "unavailable"}),
+            (502, {}, {"message": "bad gateway"}),
+            (200, {}, {"ok": True}),
+        ],
+    )
+    client = fast_client()
+
+    response = client.get(f"{stub.url}/flaky")
+
+    assert response.status_code == 200
+    assert len(stub.requests) == 3
+
+
+def test_retry_on_exhausted_rate_limit(stub):
+    """Teste l'attente jusqu'à X-RateLimit-Reset lorsque le quota est épuisé."""
+    reset = str(int(time.time()))
+    stub.sequence_route(
+        "/limited",
+        [
+            (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}, {"message": "rate limited"}),
+            (200, {}, {"ok": True}),
+        ],
+    )
+    client = fast_client()
+
+    assert client.get(f"{stub.url}/limited").status_code == 200
+    assert len(stub.requests) == 2
+
+
+def test_rate_limit_wait_above_maximum_is_not_retried(stub):
+    """Teste qu'une limite de débit trop lointaine renvoie la réponse sans attendre."""
+    stub.json_route("/limited", {"message": "slow down"}, status=429, headers={"Retry-After": "3600"})
+    client = fast_client(max_retry_wait=1.0)
+
+    assert client.get(f"{stub.url}/limited").status_code == 429
+    assert len(stub.requests) == 1
+
+
+def test_no_retry_on_client_error(stub):
+    """Teste qu'une erreur 404 n'est pas retentée."""
+    client = fast_client()
+
+    assert client.get(f"{stub.url}/missing").status_code == 404
+    assert len(stub.requests) == 1
+
+
+def test_per_host_concurrency_limit():
+    """Teste que le nombre de requêtes simultanées par hôte est borné."""
+    with StubServer(latency=0.05) as stub:
+        stub.json_route("/slow", {"ok": True})
+        client = fast_client(per_host_limit=2, pool_maxsize=8)
+
+        threads = [threading.Thread(target=client.get, args=(f"{stub.url}/slow",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(stub.requests) == 8
+    assert stub.max_concurrency <= 2
+    assert stub.connections_opened <= 2
+
+
+def test_github_integration_uses_pooled_client(stub):
+    """Teste l'intégration GitHub de bout en bout contre le serveur local."""
+    stub.json_route(
+        "/repos/owner/repo/commits/abc1234",
+        {
+            "sha": "abc1234",
+            "commit": {"author": {"name": "Test User", "date": "2023-01-01T00:00:00Z"}, "message": "feat: x"},
+            "files": [{"filename": "file1.py"}],
+        },
+    )
+    integration = GitHubIntegration(
+        token="fake_token", repo_owner="owner", repo_name="repo", api_url=stub.url, client=fast_client()
+    )
+
+    for _ in range(3):
+        assert integration.get_commit_details("abc1234")["changed_files"] == ["file1.py"]
+
+    assert stub.connections_opened == 1
+    assert stub.requests[0][1]["authorization"] == "token fake_token"
+
+
+def test_retry_delay_parsing():
+    """Teste l'interprétation des en-têtes Retry-After et X-RateLimit-Reset."""
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == pytest.approx(10.0)
+    assert parse_retry_after(None) is None
+    assert rate_limit_delay({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "110"}, now=100.0) == 10.0
+    assert rate_limit_delay({"X-RateLimit-Remaining": "42", "X-RateLimit-Reset": "110"}, now=100.0) is None
@@ -0,0 +1,154 @@
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pts.api.ingestion import get_ingestion_queue
+from pts.api.server import app
+from pts.data.events import EventProcessor, IngestionWorker
+from pts.data.queue import DurableQueue
+from pts.data.store import DataStore
+from pts.integrations.http import HttpClient
+from pts.integrations.jenkins import JenkinsIntegration
+from tests.fixtures.stub_server import StubServer
+
+PUSH_PAYLOAD = {
+    "repository": {"full_name": "owner/repo"},
+    "project": {"path_with_namespace": "group/repo"},
+    "commits": [
+        {"id": "abc123", "message": "fix: bug", "timestamp": "2024-01-01T00:00:00Z",
+         "author": {"name": "Dev"}, "added": ["src/new.py"], "modified": ["src/a.py"], "removed": []},
+    ],
+}
+
+
+@pytest.fixture
+def ingestion(tmp_path, monkeypatch):
+    """File et stockage temporaires injectés dans l'API, secrets des webhooks définis."""
+    monkeypatch.setenv("PTS_GITHUB_WEBHOOK_SECRET", "s3cret")
+    monkeypatch.setenv("PTS_GITLAB_WEBHOOK_TOKEN", "tok")
+    monkeypatch.setenv("PTS_JENKINS_WEBHOOK_TOKEN", "jtok")
+    queue = DurableQueue(str(tmp_path / "queue.sqlite"))
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    app.dependency_overrides[get_ingestion_queue] = lambda: queue
+    yield queue, store
+    app.dependency_overrides.clear()
+
+
+client = TestClient(app)
+
+
+JENKINS_HEADERS = {"X-PTS-Token": "jtok"}
+
+
+def hmac_sig(body: bytes, secret: bytes = b"s3cret") -> str:
+    return "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+def post_github(body: bytes, event: str = "push", signature: str = None, sign: bool = True):
+    headers = {"X-GitHub-Event": event, "Content-Type": "application/json"}
+    if signature is None and sign:
+        signature = hmac_sig(body)
+    if signature:
+        headers["X-Hub-Signature-256"] = signature
+    return client.post("/api/v1/webhooks/github", content=body, headers=headers)
+
+
+def test_github_push_is_acknowledged_then_processed(ingestion):
+    """Teste l'acquittement immédiat (202) puis le traitement en arrière-plan."""
+    queue, store = ingestion
+
+    response = post_github(json.dumps(PUSH_PAYLOAD).encode())
+
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert store.get_commit("abc123") is None  # pas encore traité
+
+    worker = IngestionWorker(queue, EventProcessor(store), poll_interval=0.05)
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while store.get_commit("abc123") is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+
+    commit = store.get_commit("abc123")
+    assert commit["repository"] == "owner/repo"
+    assert commit["changed_files"] == ["src/a.py", "src/new.py"]
+    assert len(queue) == 0
+
+
+def test_github_signature_is_verified(ingestion):
+    """Teste la vérification de X-Hub-Signature-256."""
+    body = json.dumps(PUSH_PAYLOAD).encode()
+
+    assert post_github(body, signature="sha256=bad").status_code == 401
+    assert post_github(body, sign=False).status_code == 401
+    assert post_github(body).status_code == 202
+    assert post_github(b"{}", event="ping").status_code == 200
+
+
+def test_webhooks_without_secret_reject_requests(ingestion, monkeypatch):
+    """Teste qu'un webhook sans secret configuré refuse toute écriture (fail closed)."""
+    queue, _ = ingestion
+    for variable in ("PTS_GITHUB_WEBHOOK_SECRET", "PTS_GITLAB_WEBHOOK_TOKEN", "PTS_JENKINS_WEBHOOK_TOKEN"):
+        monkeypatch.delenv(variable)
+
+    assert post_github(json.dumps(PUSH_PAYLOAD).encode(), sign=False).status_code == 503
+    assert client.post("/api/v1/webhooks/gitlab", json=PUSH_PAYLOAD,
+                       headers={"X-Gitlab-Event": "Push Hook"}).status_code == 503
+    payload = {"name": "build-job", "build": {"number": 1, "phase": "FINALIZED"}}
+    assert client.post("/api/v1/webhooks/jenkins", json=payload).status_code == 503
+    assert len(queue) == 0
+
+
+def test_gitlab_push_and_ignored_events(ingestion):
+    """Teste le jeton GitLab et l'acquittement des événements non pertinents."""
+    queue, store = ingestion
+    url = "/api/v1/webhooks/gitlab"
+
+    assert client.post(url, json=PUSH_PAYLOAD, headers={"X-Gitlab-Event": "Push Hook"}).status_code == 401
+    ignored = client.post(url, json={}, headers={"X-Gitlab-Event": "Issue Hook", "X-Gitlab-Token": "tok"})
+    assert ignored.json()["status"] == "ignored"
+    queued = client.post(url, json=PUSH_PAYLOAD, headers={"X-Gitlab-Event": "Push Hook", "X-Gitlab-Token": "tok"})
+    assert queued.status_code == 202
+
+    IngestionWorker(queue, EventProcessor(store)).run_once()
+    assert store.get_commit("abc123")["repository"] == "group/repo"
+
+
+def test_jenkins_build_updates_failure_stats(ingestion):
+    """Teste la récolte du rapport d'une construction notifiée et la mise à jour des agrégats."""
+    queue, store = ingestion
+    report = {"suites": [{"cases": [
+        {"className": "pkg.T", "name": "test_ok", "status": "PASSED", "duration": 0.1},
+        {"className": "pkg.T", "name": "test_ko", "status": "FAILED", "duration": 0.1},
+    ]}]}
+    payload = {"name": "build-job", "build": {"number": 12, "phase": "FINALIZED", "scm": {"commit": "abc123"}}}
+
+    with StubServer() as jenkins:
+        jenkins.json_route("/job/build-job/12/testReport/api/json", report)
+        processor = EventProcessor(
+            store, jenkins=JenkinsIntegration(jenkins.url, "u", "t", client=HttpClient(max_retries=0))
+        )
+        started = dict(payload, build=dict(payload["build"], phase="STARTED"))
+        url = "/api/v1/webhooks/jenkins"
+        assert client.post(url, json=payload).status_code == 401
+        assert client.post(url, json=started, headers=JENKINS_HEADERS).json()["status"] == "ignored"
+        assert client.post(url, json=payload, headers=JENKINS_HEADERS).status_code == 202
+        assert client.post(url, json=payload, headers=JENKINS_HEADERS).status_code == 202  # notification rejouée
+        IngestionWorker(queue, processor).run_once()
+
+    stats = store.failure_stats().set_index("test_id")
+    assert stats.loc["pkg.T.test_ko", "failures"] == 1
+    assert stats.loc["pkg.T.test_ko", "runs"] == 1  # la notification rejouée est idempotente
+    assert client.get("/api/v1/ingestion/status").json()["pending"] == 0
+
+
+def test_invalid_payload_is_rejected(ingestion):
+    """Teste le rejet d'un corps JSON invalide."""
+    assert post_github(b"not json").status_code == 400
@@ -9,8 +9,8 @@ from pts.integrations.jenkins import JenkinsIntegration
 
 @pytest.fixture
 def mock_requests_get():
-    """Mock la fonction requests.get pour simuler les réponses d'API."""
-    with patch("requests.get") as mock_get:
+    """Mock les requêtes de la session HTTP partagée pour simuler les réponses d'API."""
+    with patch("requests.Session.request") as mock_get:
         yield mock_get
 
 
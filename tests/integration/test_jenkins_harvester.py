@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+from pts.integrations.http import HttpClient
+from pts.integrations.jenkins import TEST_REPORT_TREE, JenkinsHarvester, JenkinsIntegration
+from tests.fixtures.stub_server import StubServer
+
+JOB = "/job/build-job/"
+
+
+def make_route(failing_builds=(), no_report=(3,), no_revision=(4,), last_build=6, truncated=()):
+    """Job Jenkins simulé: révision `sha{n}`, 3 cas de test par construction."""
+
+    def handler(path, query, headers):
+        if path == f"{JOB}api/json":
+            return 200, {}, {"lastCompletedBuild": {"number": last_build}}
+        build = int(path[len(JOB):].split("/")[0])
+        if build in failing_builds:
+            return 500, {}, {}
+        if path.endswith("/testReport/api/json"):
+            assert query["tree"] == [TEST_REPORT_TREE]
+            if build in no_report:
+                return 404, {}, None
+            if build in truncated:
+                return 200, {"Content-Type": "application/json"}, b'{"suites": [{"cases": [{"className": "pkg'
+            return 200, {}, {"suites": [{"cases": [
+                {"className": "pkg.TestA", "name": "test_ok", "status": "PASSED", "duration": 0.1},
+                {"className": "pkg.TestA", "name": "test_ko", "status": "REGRESSION" if build % 2 else "FIXED", "duration": 0.2},
+                {"className": "pkg.TestB", "name": "test_skip", "status": "SKIPPED", "duration": 0.0},
+            ]}]}
+        actions = [{}, {"lastBuiltRevision": {"SHA1": f"sha{build}"}}] if build not in no_revision else [{}]
+        return 200, {}, {"actions": actions}
+
+    return handler
+
+
+@pytest.fixture
+def jenkins():
+    with StubServer() as stub:
+        yield stub
+
+
+def make_harvester(stub, checkpoint_path=None):
+    integration = JenkinsIntegration(
+        base_url=stub.url, username="u", api_token="t", client=HttpClient(max_retries=0)
+    )
+    return JenkinsHarvester(integration, "build-job", checkpoint_path=checkpoint_path, max_workers=3)
+
+
+def test_harvest_emits_collector_schema(jenkins):
+    """Teste le format des lignes et le traitement des constructions particulières."""
+    jenkins.prefix_route(JOB, make_route())
+
+    df = make_harvester(jenkins).harvest(start=1)
+
+    assert list(df.columns) == ["test_id", "commit_hash", "test_failed"]
+    # Constructions 1, 2, 5, 6 (3: pas de rapport, 4: pas de révision); SKIPPED exclu
+    assert sorted(df["commit_hash"].unique()) == ["sha1", "sha2", "sha5", "sha6"]
+    assert len(df) == 8
+    failed = df[df["test_failed"] == 1]
+    assert set(failed["test_id"]) == {"pkg.TestA.test_ko"}
+    assert set(failed["commit_hash"]) == {"sha1", "sha5"}
+
+
+def test_checkpoint_resumes_after_last_harvested_build(jenkins, tmp_path):
+    """Teste la reprise à partir de la dernière construction récoltée."""
+    checkpoint = str(tmp_path / "jenkins_checkpoint.json")
+    jenkins.prefix_route(JOB, make_route(last_build=4))
+    harvester = make_harvester(jenkins, checkpoint)
+
+    assert [n for n, _ in harvester.iter_builds()] == [1, 2, 3, 4]
+    with open(checkpoint) as f:
+        assert json.load(f) == {"build-job": 4}
+
+    jenkins.prefix_route(JOB, make_route(last_build=6))
+    assert [n for n, _ in harvester.iter_builds()] == [5, 6]
+    assert harvester.load_checkpoint() == 6
+
+
+def test_failed_build_stops_checkpoint(jenkins, tmp_path):
+    """Teste qu'une construction en échec n'est pas sautée par le point de reprise."""
+    checkpoint = str(tmp_path / "jenkins_checkpoint.json")
+    jenkins.prefix_route(JOB, make_route(failing_builds=(3,)))
+    harvester = make_harvester(jenkins, checkpoint)
+
+    assert [n for n, _ in harvester.iter_builds()] == [1, 2]
+    assert harvester.load_checkpoint() == 2
+
+
+def test_harvest_with_response_cache_reads_streamed_reports(jenkins, tmp_path):
+    """Teste que le cache de réponses ne consomme pas les rapports lus en flux."""
+    from pts.integrations.cache import ResponseCache
+
+    jenkins.prefix_route(JOB, make_route())
+    cache = ResponseCache(str(tmp_path / "http_cache.sqlite"))
+    integration = JenkinsIntegration(
+        base_url=jenkins.url, username="u", api_token="t", client=HttpClient(max_retries=0, cache=cache)
+    )
+
+    df = JenkinsHarvester(integration, "build-job", max_workers=3).harvest(start=1)
+
+    assert len(df) == 8
+
+
+def test_checkpoint_waits_for_consumer(jenkins, tmp_path):
+    """Teste qu'une construction émise mais non traitée (arrêt du consommateur) n'avance pas le point de reprise."""
+    checkpoint = str(tmp_path / "jenkins_checkpoint.json")
+    jenkins.prefix_route(JOB, make_route())
+    harvester = make_harvester(jenkins, checkpoint)
+
+    for build_number, _ in harvester.iter_builds():
+        if build_number == 3:
+            break
+    assert harvester.load_checkpoint() == 2
+    assert [n for n, _ in harvester.iter_builds()] == [3, 4, 5, 6]
+
+
+def test_truncated_report_stops_checkpoint(jenkins, tmp_path):
+    """Teste qu'un rapport tronqué arrête la récolte sans exception ni saut du point de reprise."""
+    checkpoint = str(tmp_path / "jenkins_checkpoint.json")
+    jenkins.prefix_route(JOB, make_route(truncated=(5,)))
+    harvester = make_harvester(jenkins, checkpoint)
+
+    persisted = []
+    df = harvester.harvest(sink=lambda build_number, rows: persisted.append(build_number))
+    assert sorted(df["commit_hash"].unique()) == ["sha1", "sha2"]
+    assert persisted == [1, 2, 3, 4]
+    assert harvester.load_checkpoint() == 4
+
+
+def test_harvest_advances_checkpoint_only_through_sink(jenkins, tmp_path):
+    """Teste que le point de reprise ne dépasse jamais les constructions persistées par le sink."""
+    checkpoint = str(tmp_path / "jenkins_checkpoint.json")
+    jenkins.prefix_route(JOB, make_route())
+    harvester = make_harvester(jenkins, checkpoint)
+
+    # Sans sink, les lignes ne sont qu'en mémoire: aucune reprise enregistrée
+    assert len(harvester.harvest()) == 8
+    assert harvester.load_checkpoint() == 0
+
+    persisted = []
+
+    def sink(build_number, rows):
+        if build_number == 5:
+            raise OSError("disque plein")
+        persisted.append(build_number)
+
+    with pytest.raises(OSError):
+        harvester.harvest(sink=sink)
+    assert persisted == [1, 2, 3, 4]
+    assert harvester.load_checkpoint() == 4
@@ -0,0 +1,105 @@
+import pytest
+
+from pts.integrations.github import GitHubIntegration
+from pts.integrations.gitlab import GitLabIntegration
+from pts.integrations.http import HttpClient, next_page, parse_link_header, total_pages
+from tests.fixtures.stub_server import StubServer
+
+PR_FILES = "/repos/owner/repo/pulls/7/files"
+MR_DIFFS = "/projects/42/merge_requests/3/diffs"
+
+
+def paged_route(stub, path, items, key, link=True, total=True):
+    """Collection paginée simulée (en-têtes GitHub `Link` ou GitLab `X-*-Page`)."""
+
+    def handler(_path, query, headers):
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["30"])[0])
+        pages = max(1, -(-len(items) // per_page))
+        chunk = items[(page - 1) * per_page: page * per_page]
+        extra = {}
+        if link:
+            links = []
+            if page < pages:
+                links.append(f'<{stub.url}{path}?per_page={per_page}&page={page + 1}>; rel="next"')
+            if total:
+                links.append(f'<{stub.url}{path}?per_page={per_page}&page={pages}>; rel="last"')
+            extra["Link"] = ", ".join(links)
+        else:
+            extra["X-Next-Page"] = str(page + 1) if page < pages else ""
+            if total:
+                extra["X-Total-Pages"] = str(pages)
+        return 200, extra, [{key: item} for item in chunk]
+
+    stub.route(path, handler)
+
+
+def test_parse_link_header():
+    """Teste l'analyse d'un en-tête Link GitHub."""
+    links = parse_link_header(
+        '<https://api.github.com/x?page=2>; rel="next", <https://api.github.com/x?page=5>; rel="last"'
+    )
+    assert links == {"next": "https://api.github.com/x?page=2", "last": "https://api.github.com/x?page=5"}
+    assert total_pages({"Link": '<https://h/x?per_page=100&page=5>; rel="last"'}) == 5
+    assert total_pages({"X-Total-Pages": "3"}) == 3
+    assert total_pages({}) is None
+    assert next_page({"X-Next-Page": "4"}, {"per_page": 100}) == (None, {"per_page": 100, "page": 4})
+    assert next_page({"X-Next-Page": ""}, {}) is None
+
+
+def test_github_pull_request_files_are_not_truncated():
+    """Teste qu'une PR de 250 fichiers est lue entièrement, pages en parallèle."""
+    files = [f"src/file_{i:04d}.py" for i in range(250)]
+    with StubServer(latency=0.05) as stub:
+        paged_route(stub, PR_FILES, files, "filename")
+        integration = GitHubIntegration(
+            token="t", repo_owner="owner", repo_name="repo", api_url=stub.url, client=HttpClient()
+        )
+
+        assert integration.get_pull_request_files(7) == files
+        assert all("per_page=100" in path for path, _ in stub.requests)
+        assert len(stub.requests) == 3
+        assert stub.max_concurrency == 2
+
+
+def test_github_follows_next_links_without_last():
+    """Teste le suivi séquentiel des liens `next` lorsque le total est inconnu."""
+    files = [f"f{i}" for i in range(230)]
+    with StubServer() as stub:
+        paged_route(stub, PR_FILES, files, "filename", total=False)
+        integration = GitHubIntegration(
+            token="t", repo_owner="owner", repo_name="repo", api_url=stub.url, client=HttpClient()
+        )
+
+        assert list(integration.iter_pull_request_files(7)) == files
+        assert len(stub.requests) == 3
+
+
+@pytest.mark.parametrize("total", [True, False])
+def test_gitlab_merge_request_files_use_paginated_diffs(total):
+    """Teste la lecture paginée de `/diffs` via X-Total-Pages ou X-Next-Page."""
+    paths = [f"lib/module_{i}.rb" for i in range(420)]
+    with StubServer() as stub:
+        paged_route(stub, MR_DIFFS, paths, "new_path", link=False, total=total)
+        integration = GitLabIntegration(
+            private_token="t", project_id=42, base_url=stub.url, client=HttpClient()
+        )
+
+        assert integration.get_merge_request_changes(3) == paths
+        assert len(stub.requests) == 5
+
+
+def test_failed_page_returns_empty_list():
+    """Teste qu'une page en erreur ne renvoie pas une liste silencieusement tronquée."""
+    with StubServer() as stub:
+        def handler(_path, query, headers):
+            if query.get("page") == ["2"]:
+                return 404, {}, {"message": "Not Found"}
+            return 200, {"Link": f'<{stub.url}{PR_FILES}?page=2>; rel="next"'}, [{"filename": "a.py"}]
+
+        stub.route(PR_FILES, handler)
+        integration = GitHubIntegration(
+            token="t", repo_owner="owner", repo_name="repo", api_url=stub.url, client=HttpClient()
+        )
+
+        assert integration.get_pull_request_files(7) == []
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+from sklearn.base import BaseEstimator
+
+from pts.data.synthetic import generate_history
+from pts.pipeline import Pipeline, Stage, default_pipeline
+
+
+@pytest.fixture
+def pipeline_config(tmp_path):
+    """Configuration du pipeline sur un historique synthétique écrit en CSV."""
+    history = generate_history(100, 50, 200, seed=0)
+    history.commits.to_csv(tmp_path / "commits.csv", index=False)
+    history.test_results.to_csv(tmp_path / "test_results.csv", index=False)
+    return {
+        "pipeline": {
+            "commit_history": str(tmp_path / "commits.csv"),
+            "test_results": str(tmp_path / "test_results.csv"),
+            "cache_dir": str(tmp_path / "cache"),
+        },
+        "model_params": {"n_estimators": 10},
+        "k_best": 5,
+    }
+
+
+def test_pipeline_reuses_cache_and_reruns_only_downstream_stages(pipeline_config):
+    first = default_pipeline(pipeline_config).run()
+    assert set(first.status.values()) == {"run"}
+    assert isinstance(first.outputs["model"], BaseEstimator)
+
+    second = default_pipeline(pipeline_config).run()
+    assert set(second.status.values()) == {"cached"}
+    assert second.fingerprints == first.fingerprints
+
+    # La section de configuration de la sélection n'invalide que la sélection et l'entraînement
+    pipeline_config["k_best"] = 4
+    third = default_pipeline(pipeline_config).run()
+    assert [name for name, status in third.status.items() if status == "run"] == ["selected", "model"]
+
+    forced = default_pipeline(pipeline_config).run(targets=["processed"], force=["processed"])
+    assert forced.status == {"commits": "cached", "test_results": "cached", "processed": "run"}
+    assert isinstance(forced.outputs["processed"], pd.DataFrame)
+
+
+def test_pipeline_validates_types_and_runs_independent_stages_in_parallel(tmp_path):
+    config = {"pipeline": {"cache_dir": str(tmp_path), "max_workers": 2}}
+
+    def count(config: dict) -> int:
+        return 1
+
+    def text(config: dict, count: str) -> str:
+        return str(count)
+
+    with pytest.raises(TypeError, match="attend str"):
+        Pipeline([Stage("count", count), Stage("text", text)], config)
+    with pytest.raises(ValueError, match="entrée inconnue"):
+        Pipeline([Stage("text", text)], config)
+
+    # Les deux branches ne franchissent la barrière que si elles s'exécutent simultanément
+    barrier = threading.Barrier(2, timeout=5)
+
+    def left(config: dict) -> int:
+        barrier.wait()
+        return 1
+
+    def right(config: dict) -> int:
+        barrier.wait()
+        return 2
+
+    def total(config: dict, left: int, right: int) -> int:
+        return left + right
+
+    start = time.perf_counter()
+    result = Pipeline([Stage("left", left), Stage("right", right), Stage("total", total)], config).run()
+    assert result.outputs == {"total": 3}
+    assert time.perf_counter() - start < 5
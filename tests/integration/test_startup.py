@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Définir le chemin de base du projet
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+# Modules lourds qui ne doivent pas être chargés par un simple import
+HEAVY_MODULES = ["pandas", "xgboost", "sklearn", "prometheus_client", "fastapi"]
+
+# Budget de démarrage (secondes d'import cumulées) par point d'entrée. Les temps
+# absolus dépendent de la machine: vérification activée par PTS_STARTUP_BUDGETS=1
+# (machine dédiée), ignorée sinon (runners CI partagés).
+STARTUP_BUDGETS_ENABLED = os.getenv("PTS_STARTUP_BUDGETS", "0") != "0"
+STARTUP_BUDGETS = {
+    "pts": 0.5,
+    "scripts.deploy": 1.0,
+    "scripts.train_model": 6.0,
+    "scripts.predict": 6.0,
+    "scripts.evaluate": 6.0,
+    "pts.api.server": 8.0,
+}
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    """Exécute du code Python dans un interpréteur neuf, depuis la racine du projet."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(PROJECT_ROOT, "src"), PROJECT_ROOT, env.get("PYTHONPATH", "")]
+    )
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        env=env,
+        check=True,
+    )
+
+
+def import_time_seconds(module: str) -> float:
+    """Mesure le temps d'import cumulé d'un module via `-X importtime`."""
+    result = run_python(f"import {module}", "-X", "importtime")
+
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Seuls les imports de premier niveau sont additionnés
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1e6
+
+
+@pytest.mark.parametrize("module", ["pts", "pts.core", "pts.data", "pts.utils", "scripts.deploy"])
+def test_import_does_not_load_heavy_modules(module):
+    """Teste que les imports légers ne chargent pas les dépendances lourdes."""
+    code = (
+        f"import json, sys, {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    loaded = json.loads(run_python(code).stdout)
+
+    assert loaded == []
+
+
+def test_lazy_attribute_access():
+    """Teste que les attributs des packages restent accessibles à la demande."""
+    code = (
+        "import pts; "
+        "from pts.core import PredictiveTestSelector; "
+        "from pts.utils import setup_logging; "
+        "assert pts.core.PredictiveTestSelector is PredictiveTestSelector; "
+        "assert 'ModelTrainer' in dir(pts.core); "
+        "print('ok')"
+    )
+    assert run_python(code).stdout.strip() == "ok"
+
+
+@pytest.mark.skipif(not STARTUP_BUDGETS_ENABLED, reason="budgets de démarrage: PTS_STARTUP_BUDGETS=1")
+@pytest.mark.parametrize("module,budget", sorted(STARTUP_BUDGETS.items()))
+def test_startup_budget(module, budget):
+    """Teste que le temps d'import des points d'entrée reste sous le budget."""
+    elapsed = import_time_seconds(module)
+
+    assert elapsed < budget, f"Import de {module}: {elapsed:.2f}s (budget: {budget:.2f}s)"
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import numpy as np
 import pytest
@@ -6,6 +7,14 @@ from unittest.mock import patch
 from pts.core.predictor import PredictiveTestSelector
 from pts.core.trainer import ModelTrainer
 from pts.core.evaluator import ModelEvaluator
+from pts.core.tuning import HyperparameterSearch, TrialStore, partition_cores
+from pts.core.backtest import Backtester, time_windows
+from pts.core.bootstrap import bootstrap_metrics
+from pts.core.commit_metrics import commit_metrics, group_by_commit, summarize_commit_metrics
+from pts.core import external_memory
+from pts.core.external_memory import parquet_files
+from pts.core.replay import ReplaySimulator, replay_kernels
+from pts.core.sampling import correct_probabilities, downsample_negatives
 
 
 @pytest.fixture
@@ -111,3 +120,399 @@ def test_evaluator_pts_metrics():
     # False positives: t2 (sélectionné mais n'a pas échoué) -> 1
     # FPR = 1 / 3 = 0.333...
     assert metrics["false_positive_rate"] == pytest.approx(0.333, abs=1e-3)
+
+
+def test_partition_cores_avoids_oversubscription():
+    """Teste la répartition des cœurs entre essais parallèles et threads XGBoost."""
+    assert partition_cores(27, n_cores=8) == (8, 1)
+    assert partition_cores(3, n_cores=8) == (3, 2)
+    assert partition_cores(1, n_cores=8) == (1, 8)
+    assert partition_cores(4, n_cores=1) == (1, 1)
+
+
+def test_trainer_search_successive_halving(sample_training_df, tmp_path):
+    """Teste la recherche: paliers, essais journalisés et meilleur modèle sauvegardé."""
+    trials_path = str(tmp_path / "trials.sqlite")
+    trainer = ModelTrainer(config={
+        "model_params": {"random_state": 42, "max_depth": 99},
+        "search": {"n_trials": 6, "min_resource": 5, "max_resource": 20, "reduction_factor": 3,
+                   "trials_path": trials_path, "n_cores": 2},
+    })
+    assert HyperparameterSearch(trainer.config["search"]).rungs() == [5, 15, 20]
+
+    result = trainer.search(sample_training_df)
+
+    # 6 essais au palier 0, 2 au palier 1, 1 au palier 2
+    assert [sum(t.rung == r for t in result.trials) for r in range(3)] == [6, 2, 1]
+    assert result.best_params["random_state"] == 42
+    assert result.best_params["max_depth"] != 99  # paramètre recherché, pas celui de model_params
+    assert result.best_params["n_estimators"] == 20
+    assert len(TrialStore(trials_path).load(result.run_id)) == 9
+
+    model_path = str(tmp_path / "model.json")
+    trainer.save_model(model_path)
+    selector = PredictiveTestSelector(threshold=0.5, model_path=model_path)
+    features = sample_training_df.drop(columns=["test_failed"])
+    np.testing.assert_allclose(
+        selector.predict(features)["failure_probability"],
+        result.best_model.predict_proba(features.drop(columns=["test_id"]))[:, 1],
+        rtol=1e-5,
+    )
+
+
+
+@pytest.fixture
+def dated_training_df():
+    """Fournit 60 jours de résultats de tests datés."""
+    rng = np.random.default_rng(0)
+    n = 600
+    df = pd.DataFrame({
+        "test_id": [f"test_{i % 20}" for i in range(n)],
+        "committed_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(n) / 10, unit="D"),
+        "feature_churn": rng.random(n),
+        "feature_history": rng.random(n),
+    })
+    df["test_failed"] = (df["feature_churn"] > 0.8).astype(int)
+    return df
+
+
+def test_trainer_time_split_validates_on_latest_commits(dated_training_df):
+    """Teste la séparation temporelle: la validation ne contient que des commits postérieurs."""
+    shuffled = dated_training_df.sample(frac=1.0, random_state=0)
+    trainer = ModelTrainer(config={"split": {"strategy": "time", "test_size": 0.25}})
+    X_train, X_val, _, _ = trainer._split(shuffled)
+
+    assert len(X_val) == 150
+    assert "committed_date" not in X_train.columns
+    dates = shuffled["committed_date"]
+    assert dates.loc[X_train.index].max() <= dates.loc[X_val.index].min()
+
+
+def test_trainer_time_split_keeps_each_commit_on_one_side(dated_training_df):
+    """Teste que la coupure temporelle ne sépare pas les lignes d'un même commit."""
+    df = dated_training_df.iloc[:100].copy()
+    # 10 commits de 10 tests: la coupure à 25 % tombe au milieu du 8e commit
+    df["committed_date"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(100) // 10, unit="D")
+    trainer = ModelTrainer(config={"split": {"strategy": "time", "test_size": 0.25}})
+    X_train, X_val, _, _ = trainer._split(df.sample(frac=1.0, random_state=0))
+
+    assert len(X_val) == 30
+    assert set(df.loc[X_train.index, "committed_date"]).isdisjoint(df.loc[X_val.index, "committed_date"])
+
+
+def test_trainer_without_holdout_fits_every_row(dated_training_df):
+    """Teste l'entraînement sans validation: les commits les plus récents sont appris eux aussi."""
+    from xgboost import XGBClassifier
+
+    trainer = ModelTrainer(config={"model_params": {"n_estimators": 5}, "split": {"strategy": "time"}})
+    with patch.object(XGBClassifier, "fit", autospec=True, side_effect=XGBClassifier.fit) as fit:
+        trainer.train(dated_training_df, holdout=False)
+    X_fit = fit.call_args.args[1]
+    assert len(X_fit) == len(dated_training_df)
+    assert list(X_fit.columns) == ["feature_churn", "feature_history"]
+
+
+def test_time_windows_rolling_and_expanding():
+    """Teste le découpage en fenêtres glissantes et croissantes."""
+    start, end = pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31")
+    rolling = time_windows(start, end, "14D", "7D")
+    assert [w.test_start.day for w in rolling] == [15, 22, 29]
+    assert all(w.test_start - w.train_start == pd.Timedelta("14D") for w in rolling)
+
+    expanding = time_windows(start, end, "14D", "7D", expanding=True)
+    assert all(w.train_start == start for w in expanding)
+
+
+def test_backtester_reports_metrics_per_window_and_reuses_partitions(dated_training_df, tmp_path):
+    """Teste le backtest: métriques PTS par fenêtre et partitions réutilisées."""
+    config = {
+        "model_params": {"n_estimators": 10, "max_depth": 2},
+        "selection_threshold": 0.5,
+        "backtest": {"train_period": "28D", "test_period": "14D", "step": "7D",
+                     "cache_dir": str(tmp_path), "n_cores": 1},
+    }
+    results = Backtester(config).run(dated_training_df)
+
+    # Tests commençant aux jours 28, 35, 42, 49, 56 (le dernier commit est au jour 59.9)
+    assert list(results["window"]) == [0, 1, 2, 3, 4]
+    assert (results["n_train"] == 280).all()
+    assert results["test_reduction_rate"].between(0, 1).all()
+    assert results["defect_detection_rate"].mean() > 0.9
+
+    partitions = list(tmp_path.glob("*/X-*.npy"))
+    assert len(partitions) == 9
+    mtimes = {p: p.stat().st_mtime_ns for p in partitions}
+    pd.testing.assert_frame_equal(Backtester(config).run(dated_training_df), results)
+    assert {p: p.stat().st_mtime_ns for p in partitions} == mtimes
+
+    with pytest.raises(ValueError):
+        Backtester({"backtest": {"train_period": "10D", "step": "7D"}})
+
+
+@pytest.mark.parametrize("mode", ["external", "quantile"])
+def test_trainer_external_memory_and_warm_start(mode, tmp_path, monkeypatch):
+    """Teste l'entraînement par lots Parquet puis la poursuite sur la dernière partition."""
+    pytest.importorskip("pyarrow")
+    rng = np.random.default_rng(0)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for week in range(3):
+        df = pd.DataFrame({"test_id": [f"test_{i}" for i in range(500)],
+                           "feature_churn": rng.random(500), "feature_history": rng.random(500)})
+        df["test_failed"] = (df["feature_churn"] > 0.8).astype(int)
+        df.to_parquet(data_dir / f"week={week}.parquet")
+
+    removed = []
+    rmtree = external_memory.shutil.rmtree
+    monkeypatch.setattr(external_memory.shutil, "rmtree",
+                        lambda path, **kwargs: (removed.append(path), rmtree(path, **kwargs)))
+
+    trainer = ModelTrainer(config={
+        "model_params": {"n_estimators": 10, "max_depth": 3},
+        "external_memory": {"mode": mode, "batch_size": 200, "cache_dir": str(tmp_path / "cache"),
+                            "update_rounds": 5},
+    })
+    booster = trainer.train_external(parquet_files(str(data_dir))[:-1])
+    assert booster.num_boosted_rounds() == 10
+    assert booster.feature_names == ["feature_churn", "feature_history"]
+
+    model_path = str(tmp_path / "model.json")
+    trainer.save_model(model_path)
+    booster = trainer.train_external(parquet_files(str(data_dir), newest=1), init_model=model_path)
+    assert booster.num_boosted_rounds() == 15
+    # Pages dans un répertoire propre à chaque exécution, supprimé après l'entraînement
+    assert len(removed) == (2 if mode == "external" else 0)
+    assert len(set(removed)) == len(removed)
+    assert all(os.path.dirname(path) == str(tmp_path / "cache") for path in removed)
+    assert not list((tmp_path / "cache").glob("run-*"))
+
+    trainer.save_model(model_path)
+    selector = PredictiveTestSelector(threshold=0.5, model_path=model_path)
+    predictions = selector.predict(df.drop(columns=["test_failed"]))
+    assert predictions["failure_probability"][df["test_failed"] == 1].min() > 0.5
+
+
+def test_downsample_negatives_per_group():
+    """Teste le sous-échantillonnage: échecs conservés, quota de négatifs par groupe."""
+    y = pd.Series([1] * 5 + [0] * 95 + [0] * 3)
+    groups = pd.Series(["a"] * 100 + ["b"] * 3)
+    kept = downsample_negatives(y, 0.1, groups=groups, seed=0)
+
+    assert set(range(5)) <= set(kept)
+    assert (groups.iloc[kept] == "a").sum() == 5 + 10  # ceil(0.1 * 95)
+    assert (groups.iloc[kept] == "b").sum() == 1  # au moins un négatif par groupe
+    assert len(downsample_negatives(y, 1.0)) == len(y)
+    with pytest.raises(ValueError):
+        downsample_negatives(y, 0.0)
+
+
+def test_correct_probabilities_inverts_downsampling_odds():
+    """Teste la correction: les cotes sont multipliées par le taux de négatifs conservés."""
+    q = np.array([0.0, 0.5, 0.9, 1.0])
+    p = correct_probabilities(q, 0.1)
+    np.testing.assert_allclose(p, [0.0, 0.05 / 0.55, 0.09 / 0.19, 1.0])
+    assert correct_probabilities(q, 1.0) is q
+
+
+def test_trainer_records_negative_rate_and_predictor_corrects(sample_training_df, tmp_path):
+    """Teste la chaîne complète: taux enregistré dans le modèle, probabilités corrigées au chargement."""
+    trainer = ModelTrainer(config={
+        "model_params": {"n_estimators": 10, "max_depth": 2},
+        "sampling": {"negative_rate": 0.5, "group_by": "test_id"},
+    })
+    model = trainer.train(sample_training_df)
+    model_path = str(tmp_path / "model.json")
+    trainer.save_model(model_path)
+
+    selector = PredictiveTestSelector(threshold=0.5, model_path=model_path)
+    assert selector.negative_rate == 0.5
+    features = sample_training_df.drop(columns=["test_failed"])
+    raw = model.predict_proba(features.drop(columns=["test_id"]))[:, 1]
+    np.testing.assert_allclose(
+        selector.predict(features)["failure_probability"], correct_probabilities(raw, 0.5), rtol=1e-5
+    )
+
+
+def test_sweep_thresholds_matches_single_threshold_metrics():
+    """Teste le balayage: chaque point de la courbe égale calculate_pts_metrics au même seuil."""
+    rng = np.random.default_rng(0)
+    ids = [f"t{i}" for i in range(500)]
+    # Probabilités arrondies: nombreux ex aequo
+    predictions = pd.DataFrame({"test_id": ids, "failure_probability": np.round(rng.random(500), 2)})
+    actual = pd.DataFrame({"test_id": ids, "test_failed": (rng.random(500) < 0.1).astype(int)})
+    evaluator = ModelEvaluator()
+
+    curve = evaluator.sweep_thresholds(predictions, actual)
+    assert curve["threshold"].is_monotonic_decreasing
+    assert curve["total_selected"].iloc[-1] == 500
+    for _, point in curve.sample(10, random_state=0).iterrows():
+        expected = evaluator.calculate_pts_metrics(predictions, actual, selection_threshold=point["threshold"])
+        for metric in ("test_reduction_rate", "defect_detection_rate", "false_positive_rate"):
+            assert point[metric] == pytest.approx(expected[metric])
+
+    recommended = evaluator.recommend_threshold(curve, target_ddr=0.9)
+    assert recommended["defect_detection_rate"] >= 0.9
+    higher = curve[curve["threshold"] > recommended["threshold"]]
+    assert (higher["defect_detection_rate"] < 0.9).all()
+
+
+def test_commit_metrics_apfd_and_caught_any():
+    """Teste les métriques par commit sur un exemple calculé à la main."""
+    predictions = pd.DataFrame({
+        "test_id": ["t1", "t2", "t3", "t4", "t1", "t2", "t1"],
+        "commit_hash": ["A", "A", "A", "A", "B", "B", "C"],
+        "failure_probability": [0.9, 0.1, 0.5, 0.3, 0.8, 0.2, 0.2],
+    })
+    actual = predictions[["test_id", "commit_hash"]].assign(test_failed=[0, 1, 0, 0, 1, 1, 0])
+    per_commit, summary = ModelEvaluator().calculate_commit_metrics(
+        predictions, actual, selection_threshold=0.4
+    )
+    per_commit = per_commit.set_index("commit")
+
+    # A: seul test en échec exécuté en 4e position -> APFD = 1 - 4/4 + 1/8
+    assert per_commit.loc["A", "apfd"] == pytest.approx(0.125)
+    assert per_commit.loc["A", "first_failure_rank"] == 4
+    assert per_commit.loc["A", "caught_any"] == 0
+    # B: échecs aux rangs 1 et 2 -> APFD = 1 - 3/4 + 1/4
+    assert per_commit.loc["B", "apfd"] == pytest.approx(0.5)
+    assert per_commit.loc["B", "defect_detection_rate"] == pytest.approx(0.5)
+    assert np.isnan(per_commit.loc["C", "apfd"])
+    assert per_commit.loc["C", "test_reduction_rate"] == 1.0
+
+    assert summary["broken_commits"] == 2
+    assert summary["caught_any_rate"] == 0.5
+    assert summary["apfd_p50"] == pytest.approx(0.3125)
+
+
+def test_group_by_commit_matches_pandas_groupby():
+    """Teste les noyaux groupés contre un groupby pandas sur des données aléatoires."""
+    rng = np.random.default_rng(0)
+    commit_ids = rng.integers(0, 50, 5000)
+    failed = rng.random(5000) < 0.05
+    probabilities = rng.random(5000)
+    per_commit = commit_metrics(group_by_commit(commit_ids, probabilities, failed), threshold=0.7)
+
+    df = pd.DataFrame({"commit": commit_ids, "failed": failed, "selected": probabilities >= 0.7})
+    expected = df.groupby("commit").agg(n_tests=("failed", "size"), n_failed=("failed", "sum"),
+                                        n_selected=("selected", "sum"))
+    actual = per_commit.set_index("commit").loc[expected.index]
+    for column in expected.columns:
+        np.testing.assert_array_equal(actual[column], expected[column])
+    assert summarize_commit_metrics(per_commit)["commits"] == 50
+
+
+def test_bootstrap_intervals_are_deterministic_and_match_point_estimates():
+    """Teste le bootstrap: estimations égales à sklearn, graines indépendantes du nombre de processus."""
+    from sklearn.metrics import recall_score, roc_auc_score
+
+    rng = np.random.default_rng(0)
+    n = 3000
+    commit_ids = rng.integers(0, 100, n)
+    failed = rng.random(n) < 0.05
+    probabilities = np.round(np.clip(0.4 * failed + 0.6 * rng.random(n), 0, 1), 2)
+
+    single = bootstrap_metrics(commit_ids, probabilities, failed, threshold=0.5, n_resamples=120,
+                               seed=7, n_workers=1)
+    multi = bootstrap_metrics(commit_ids, probabilities, failed, threshold=0.5, n_resamples=120,
+                              seed=7, n_workers=2)
+    pd.testing.assert_frame_equal(single, multi)
+
+    assert single.loc["roc_auc", "estimate"] == pytest.approx(roc_auc_score(failed, probabilities))
+    assert single.loc["recall", "estimate"] == pytest.approx(recall_score(failed, probabilities >= 0.5))
+    assert (single["lower"] <= single["estimate"]).all() and (single["estimate"] <= single["upper"]).all()
+    assert (single["upper"] - single["lower"] > 0).all()
+
+
+def test_evaluate_single_pass_matches_sklearn_and_streams_chunks(sample_training_df):
+    """Teste l'évaluation en une passe: mêmes valeurs que sklearn, résultats identiques par morceaux."""
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"test_id": [f"t{i}" for i in range(2000)],
+                       "feature_churn": rng.random(2000), "feature_history": np.round(rng.random(2000), 1)})
+    df["test_failed"] = (df["feature_churn"] + 0.5 * rng.random(2000) > 1.1).astype(int)
+    model = ModelTrainer(config={"model_params": {"n_estimators": 10, "max_depth": 2}}).train(df)
+
+    evaluator = ModelEvaluator()
+    metrics = evaluator.evaluate(model, df)
+    X = df.drop(columns=["test_id", "test_failed"])
+    y_pred, y_proba = model.predict(X), model.predict_proba(X)[:, 1]
+    expected = {
+        "accuracy": accuracy_score(df["test_failed"], y_pred),
+        "precision": precision_score(df["test_failed"], y_pred),
+        "recall": recall_score(df["test_failed"], y_pred),
+        "f1_score": f1_score(df["test_failed"], y_pred),
+        "roc_auc": roc_auc_score(df["test_failed"], y_proba),
+    }
+    assert metrics == pytest.approx(expected)
+
+    chunked = evaluator.evaluate(model, (df[i:i + 300] for i in range(0, len(df), 300)))
+    assert chunked == pytest.approx(metrics)
+    assert evaluator.evaluate(model, df.drop(columns=["test_failed"])) == {}
+
+
+def test_evaluate_corrects_downsampled_probabilities_and_ignores_commit_columns(dated_training_df):
+    """Teste l'évaluation d'un modèle sous-échantillonné sur des données datées: mêmes probabilités qu'à l'inférence."""
+    from sklearn.metrics import roc_auc_score
+
+    df = dated_training_df.assign(commit_hash=[f"c{i // 5}" for i in range(len(dated_training_df))])
+    trainer = ModelTrainer(config={
+        "model_params": {"n_estimators": 10, "max_depth": 2},
+        "sampling": {"negative_rate": 0.3},
+    })
+    model = trainer.train(df.drop(columns=["commit_hash"]))
+
+    metrics = ModelEvaluator().evaluate(model, df)
+    X = df[["feature_churn", "feature_history"]]
+    probabilities = correct_probabilities(model.predict_proba(X)[:, 1], 0.3)
+    assert metrics["roc_auc"] == pytest.approx(roc_auc_score(df["test_failed"], probabilities))
+    assert metrics["recall"] == pytest.approx(df.loc[probabilities >= 0.5, "test_failed"].sum()
+                                              / df["test_failed"].sum())
+
+
+def test_replay_kernels_minutes_saved_and_time_to_first_failure():
+    """Teste les noyaux du rejeu: minutes économisées, échecs manqués et time-to-first-failure."""
+    per_commit = replay_kernels(
+        commit_ids=np.array(["a", "a", "a", "b", "b"]),
+        probabilities=np.array([0.2, 0.9, 0.7, 0.1, 0.3]),
+        failed=np.array([1, 0, 1, 1, 0]),
+        durations=np.array([60.0, 120.0, 180.0, 60.0, 60.0]),
+        threshold=0.5,
+    ).set_index("commit_hash")
+
+    # a: tests 2 et 3 exécutés par priorité (2 min puis 3 min), le test 1 (1 min) est manqué
+    assert per_commit.loc["a", "minutes_saved"] == pytest.approx(1.0)
+    assert per_commit.loc["a", "missed_failures"] == 1
+    assert per_commit.loc["a", "ttff_minutes"] == pytest.approx(5.0)
+    assert per_commit.loc["a", "baseline_ttff_minutes"] == pytest.approx(1.0)
+    # b: rien n'est sélectionné, l'échec est manqué
+    assert per_commit.loc["b", "minutes_saved"] == pytest.approx(2.0)
+    assert np.isnan(per_commit.loc["b", "ttff_minutes"])
+    assert per_commit.loc["b", "baseline_ttff_minutes"] == pytest.approx(1.0)
+
+
+@patch("pts.core.replay.increment_cost_savings")
+@patch("pts.core.replay.update_test_reduction_rate")
+def test_replay_simulator_retrains_per_period_and_publishes(mock_trr, mock_savings, dated_training_df):
+    """Teste le rejeu chronologique: un modèle par période, résumé publié dans les métriques."""
+    history = dated_training_df.assign(
+        commit_hash=[f"c{i // 5}" for i in range(len(dated_training_df))],
+        duration=30.0,
+    )
+    simulator = ReplaySimulator({
+        "model_params": {"n_estimators": 10, "max_depth": 2},
+        "replay": {"train_period": "28D", "retrain_every": "14D", "threshold": 0.5,
+                   "cost_per_minute": 0.01, "n_cores": 1},
+    })
+    result = simulator.run(history.sample(frac=1.0, random_state=0))
+
+    # Périodes rejouées à partir du jour 28: jours 28-42, 42-56, 56-60
+    assert sorted(result.per_commit["window"].unique()) == [0, 1, 2]
+    assert result.summary["tests"] == (history["committed_date"] >= "2024-01-29").sum()
+    assert 0 < result.summary["saved_fraction"] < 1
+    assert result.summary["missed_failures"] <= 0.1 * result.summary["failures"]
+    assert result.summary["cost_saved_usd"] == pytest.approx(result.summary["minutes_saved"] * 0.01)
+
+    simulator.publish(result.summary)
+    mock_trr.assert_called_once_with(int(result.summary["tests"]), int(result.summary["tests_selected"]))
+    mock_savings.assert_called_once_with(result.summary["cost_saved_usd"])
@@ -5,6 +5,9 @@ from unittest.mock import patch
 
 from pts.data.collector import DataCollector
 from pts.data.processor import DataProcessor
+from pts.data.queue import DurableQueue
+from pts.data.store import DataStore
+from pts.data.synthetic import SyntheticGenerator, generate_history, write_git_repo, write_history
 from pts.data.validator import DataValidator
 
 
@@ -115,3 +118,96 @@ def test_data_validator_missing_values():
     })
     
     assert validator.validate(invalid_data) is False
+
+
+def test_durable_queue_lease_and_dead_letter(tmp_path):
+    """Teste la reprise d'une tâche au bail expiré et le passage en échec définitif."""
+    queue = DurableQueue(str(tmp_path / "queue.sqlite"), lease_seconds=0.0, max_attempts=2)
+    job_id = queue.put("github_push", {"commits": []})
+
+    first = queue.claim()
+    assert [job.id for job in first] == [job_id]
+    # Bail expiré (worker mort): la tâche est de nouveau disponible
+    second = queue.claim()
+    assert second[0].attempts == 2
+
+    queue.nack(second[0], "erreur", delay=0.0)
+    assert queue.counts()["dead"] == 1
+    assert queue.claim() == []
+
+    # Persistance: une nouvelle instance voit la même file
+    other = DurableQueue(str(tmp_path / "queue.sqlite"))
+    ack_id = other.put("gitlab_push", {})
+    assert len(queue) == 1
+    queue.ack(ack_id)
+    assert len(other) == 0
+
+
+def test_durable_queue_expired_leases_count_as_attempts(tmp_path):
+    """Teste qu'une tâche dont le worker plante à chaque bail finit en échec définitif."""
+    queue = DurableQueue(str(tmp_path / "queue.sqlite"), lease_seconds=0.0, max_attempts=2)
+    queue.put("github_push", {"commits": []})
+
+    assert len(queue.claim()) == 1
+    assert len(queue.claim()) == 1  # Deuxième et dernière tentative
+    assert queue.claim() == []
+    assert queue.counts() == {"pending": 0, "processing": 0, "dead": 1}
+
+
+def test_data_store_incremental_failure_stats(tmp_path):
+    """Teste la mise à jour incrémentale et idempotente des agrégats d'échecs."""
+    store = DataStore(str(tmp_path / "store.sqlite"), recent_weight=0.5)
+    rows = [
+        {"test_id": "test_a", "commit_hash": "c1", "test_failed": 1},
+        {"test_id": "test_a", "commit_hash": "c2", "test_failed": 0},
+        {"test_id": "test_b", "commit_hash": "c1", "test_failed": 0},
+    ]
+
+    assert store.record_test_results(rows) == 3
+    assert store.record_test_results(rows[:1]) == 0  # doublon ignoré
+
+    stats = store.failure_stats().set_index("test_id")
+    assert stats.loc["test_a", "runs"] == 2
+    assert stats.loc["test_a", "failure_rate"] == pytest.approx(0.5)
+    assert stats.loc["test_a", "recent_failure_rate"] == pytest.approx(0.5)
+    assert stats.loc["test_b", "failures"] == 0
+    assert list(store.test_results().columns) == ["test_id", "commit_hash", "test_failed"]
+
+
+
+def test_synthetic_history_is_deterministic_and_minable(tmp_path):
+    """Teste le générateur synthétique: même graine, même historique; dépôt Git lisible par le GitMiner."""
+    from scripts.miner import GitMiner
+
+    history = generate_history(n_commits=30, n_tests=10, n_files=50, seed=1)
+    pd.testing.assert_frame_equal(history.test_results, generate_history(30, 10, 50, seed=1).test_results)
+    assert len(history.test_results) == 300
+    assert (history.changes.groupby("commit_hash").size()[history.commits["commit_hash"]].to_numpy()
+            == history.commits["files_changed"].to_numpy()).all()
+
+    write_git_repo(history, str(tmp_path / "repo"))
+    mined = GitMiner(repo_path=str(tmp_path / "repo")).mine_history(max_commits=100)
+    assert len(mined) == 30
+    assert set(mined["author_name"]) <= set(history.commits["author_name"])
+
+
+def test_synthetic_generator_writes_blocks_to_storage_formats(tmp_path, monkeypatch):
+    """Teste l'écriture par blocs: CSV et SQLite identiques à la génération en mémoire."""
+    monkeypatch.setattr("pts.data.synthetic.BLOCK_ROWS", 100)
+    generator = SyntheticGenerator(n_commits=50, n_tests=40, n_files=100, tests_per_commit=10,
+                                   flaky_rate=0.5, seed=3)
+    assert generator.n_blocks == 5
+    history = generator.generate()
+    pd.testing.assert_frame_equal(generator.block(2).test_results,
+                                  history.test_results.iloc[200:300].reset_index(drop=True))
+    assert (history.test_results.groupby("commit_hash")["test_id"].nunique() == 10).all()
+
+    counts = write_history(generator, str(tmp_path), formats=("csv", "sqlite"))
+    assert counts == {"commits": 50, "test_results": 500}
+    written = pd.read_csv(tmp_path / "test_results.csv")
+    pd.testing.assert_frame_equal(written[["test_id", "commit_hash", "test_failed"]],
+                                  history.test_results[["test_id", "commit_hash", "test_failed"]])
+    store = DataStore(str(tmp_path / "store.sqlite"))
+    assert store.failure_stats()["runs"].sum() == 500
+    assert len(store.get_commit(history.commits["commit_hash"].iloc[0])["changed_files"]) >= 1
+    store.close()
@@ -0,0 +1,204 @@
+import os
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from pts.utils import metrics, profiling
+from pts.utils.logger import AsyncSink, LogSampler
+from pts.utils.metrics import (
+    record_tests_scored,
+    set_instrumentation_enabled,
+    time_stage,
+    timed_stage,
+)
+
+
+def stage_count(stage: str) -> float:
+    """Retourne le nombre d'observations enregistrées pour une étape."""
+    value = REGISTRY.get_sample_value("pts_stage_latency_seconds_count", {"stage": stage})
+    return value or 0.0
+
+
+@pytest.fixture
+def instrumentation_enabled():
+    """Garantit que l'instrumentation est active puis restaure l'état initial."""
+    previous = metrics.INSTRUMENTATION_ENABLED
+    set_instrumentation_enabled(True)
+    yield
+    set_instrumentation_enabled(previous)
+
+
+def test_time_stage_records_observation(instrumentation_enabled):
+    """Teste que le context manager enregistre une observation par bloc."""
+    before = stage_count("unit_ctx")
+
+    with time_stage("unit_ctx"):
+        pass
+    with time_stage("unit_ctx"):
+        pass
+
+    assert stage_count("unit_ctx") == before + 2
+
+
+def test_timed_stage_decorator(instrumentation_enabled):
+    """Teste que le décorateur mesure la fonction et préserve son résultat."""
+
+    @timed_stage("unit_decorator")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    before = stage_count("unit_decorator")
+
+    assert add(1, 2) == 3
+    assert add.__name__ == "add"
+    assert stage_count("unit_decorator") == before + 1
+
+
+def test_instrumentation_disabled(instrumentation_enabled):
+    """Teste qu'aucune mesure n'est enregistrée lorsque l'instrumentation est coupée."""
+    set_instrumentation_enabled(False)
+    before_stage = stage_count("unit_disabled")
+    before_scored = REGISTRY.get_sample_value("pts_tests_scored_total")
+
+    with time_stage("unit_disabled"):
+        pass
+    record_tests_scored(10)
+
+    assert stage_count("unit_disabled") == before_stage
+    assert REGISTRY.get_sample_value("pts_tests_scored_total") == before_scored
+
+
+def test_async_sink_writes_in_background():
+    """Teste que le sink asynchrone écrit tous les messages à l'arrêt."""
+    written = []
+    sink = AsyncSink(written.append, queue_size=100)
+
+    for i in range(10):
+        sink.write(f"message {i}\n")
+    sink.stop()
+
+    assert written == [f"message {i}\n" for i in range(10)]
+    assert sink.dropped == 0
+
+
+@pytest.mark.parametrize("policy,expected_last", [("drop_new", "m2"), ("drop_oldest", "m4")])
+def test_async_sink_drop_policy(policy, expected_last):
+    """Teste la politique d'abandon lorsque la file bornée est pleine."""
+    release = threading.Event()
+    written = []
+
+    def slow_write(message: str) -> None:
+        release.wait()
+        written.append(message)
+
+    sink = AsyncSink(slow_write, queue_size=2, drop_policy=policy)
+    sink.write("m0")  # Consommé par le writer, bloqué dans slow_write
+    while sink._queue.qsize():
+        pass
+    for message in ("m1", "m2", "m3", "m4"):
+        sink.write(message)
+    release.set()
+    sink.stop()
+
+    assert sink.dropped == 2
+    assert written[-1] == expected_last
+
+
+def test_log_sampler_rate():
+    """Teste que l'échantillonneur retient la proportion demandée des appels."""
+    for rate, expected in [(0.1, 100), (1.0, 1000), (0.0, 0)]:
+        sampler = LogSampler(rate)
+        assert sum(sampler() for _ in range(1000)) == expected
+
+    # Trois points par requête: chacun journalise une requête sur dix, la même
+    sampler = LogSampler(0.1)
+    logged = [[sampler(site) for site in ("api", "predict", "select")] for _ in range(100)]
+    assert sum(map(all, logged)) == 10
+    assert sum(map(any, logged)) == 10
+
+
+@pytest.fixture
+def profiling_config(tmp_path):
+    """Active le profilage dans un répertoire temporaire puis restaure la configuration."""
+    previous = (profiling.PROFILE_MODE, profiling.STAGE_REPORT_ENABLED, profiling.PROFILE_DIR,
+                profiling.PROFILE_COUNT, profiling.PROFILE_QUERY_ENABLED)
+    profiling.reset_stage_report()
+    yield tmp_path
+    profiling.configure_profiling(*previous)
+    profiling.reset_stage_report()
+
+
+def test_profiled_stage_reports_and_profiles_first_call(profiling_config):
+    """Teste le rapport d'étapes (durée, pic mémoire) et le profil du premier appel uniquement."""
+
+    @profiling.profiled_stage("unit_stage")
+    def build(n: int) -> int:
+        return len(list(range(n)))
+
+    profiling.configure_profiling(stage_report=False, mode="")
+    assert build(10) == 10
+    assert profiling.stage_report() == []
+
+    profiling.configure_profiling(mode="cprofile", stage_report=True, directory=str(profiling_config), count=1)
+    assert build(100_000) == 100_000
+    assert build(10) == 10
+
+    first, second = profiling.stage_report()
+    assert first["stage"] == "unit_stage" and first["peak_memory_mb"] > 0.5
+    assert second["profile_dir"] is None
+    assert sorted(os.listdir(first["profile_dir"])) == ["profile.prof", "profile.txt", "report.json"]
+    assert "build" in open(os.path.join(first["profile_dir"], "profile.txt")).read()
+
+
+def test_profiled_stages_from_parallel_threads_run_one_at_a_time(profiling_config):
+    """Teste que des étapes profilées lancées en parallèle ne se chevauchent pas (tracemalloc, cProfile)."""
+    import time
+
+    running, overlaps = [], []
+
+    @profiling.profiled_stage("parallel_stage")
+    def work() -> None:
+        running.append(1)
+        overlaps.append(len(running) > 1)
+        time.sleep(0.02)
+        running.pop()
+
+    profiling.configure_profiling(mode="cprofile", stage_report=True, directory=str(profiling_config), count=4)
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = profiling.stage_report()
+    assert len(report) == 4 and not any(overlaps)
+    assert all(record["profile_dir"] and record["peak_memory_mb"] is not None for record in report)
+
+
+def test_load_config_validates_memoizes_and_applies_env_overrides(tmp_path):
+    """Teste la validation, la mémoïsation par date de modification et les surcharges d'environnement."""
+    from pts.utils.config import ConfigError, load_config
+
+    path = tmp_path / "config.yaml"
+    path.write_text("selection_threshold: 0.5\nreplay:\n  train_period: 14D\n")
+
+    config = load_config(str(path), environ={})
+    assert config.selection_threshold == 0.5 and config.replay.train_period == "14D"
+    assert config.split.test_size == 0.2  # Valeur par défaut des classes
+    assert load_config(str(path), environ={}) is config
+
+    overridden = load_config(str(path), environ={"PTS_CONFIG__REPLAY__THRESHOLD": "0.3"})
+    assert overridden.replay.threshold == 0.3
+    assert overridden.to_dict()["replay"]["threshold"] == 0.3
+    assert "threshold" not in config.to_dict()["replay"]
+
+    path.write_text("selection_threshold: 0.45\n")
+    assert load_config(str(path), environ={}).selection_threshold == 0.45
+
+    path.write_text("selection_threshold: 2\nsplit:\n  strategy: chronological\nk_bets: 5\n")
+    with pytest.raises(ConfigError) as error:
+        load_config(str(path), environ={})
+    assert all(key in str(error.value) for key in ("selection_threshold", "split.strategy", "k_bets"))
+    with pytest.raises(ConfigError, match="non trouvé"):
+        load_config(str(tmp_path / "missing.yaml"))